@@ -0,0 +1,49 @@
+"""Add object growth forecasts
+
+Revision ID: 0b6d4e8a2f95
+Revises: f3a9d6c1e874
+Create Date: 2026-10-19 19:02:41.530917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6d4e8a2f95'
+down_revision: Union[str, None] = 'f3a9d6c1e874'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('object_growth',
+    sa.Column('database_id', sa.Integer(), nullable=False),
+    sa.Column('object_type', sa.String(), nullable=False),
+    sa.Column('schema_name', sa.String(), nullable=False),
+    sa.Column('object_name', sa.String(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('first_sample_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('last_sample_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('samples', sa.Integer(), nullable=False),
+    sa.Column('current_size_bytes', sa.BigInteger(), nullable=False),
+    sa.Column('bytes_per_day', sa.Float(), nullable=False),
+    sa.Column('r_squared', sa.Float(), nullable=True),
+    sa.Column('projected_size_30d', sa.BigInteger(), nullable=False),
+    sa.Column('projected_size_90d', sa.BigInteger(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['database_id'], ['monitored_databases.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_object_growth_id'), 'object_growth', ['id'], unique=False)
+    op.create_index('ix_object_growth_object', 'object_growth', ['database_id', 'object_type', 'schema_name', 'object_name'], unique=True)
+    op.create_index('ix_object_growth_rate', 'object_growth', ['database_id', 'bytes_per_day'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_object_growth_rate', table_name='object_growth')
+    op.drop_index('ix_object_growth_object', table_name='object_growth')
+    op.drop_index(op.f('ix_object_growth_id'), table_name='object_growth')
+    op.drop_table('object_growth')
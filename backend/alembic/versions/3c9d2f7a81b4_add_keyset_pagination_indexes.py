@@ -0,0 +1,33 @@
+"""Add composite indexes for keyset pagination of snapshot detail endpoints
+
+Revision ID: 3c9d2f7a81b4
+Revises: 20250505_rename_password_column, abcd
+Create Date: 2026-10-19 09:12:40.118230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9d2f7a81b4'
+# Also merges the two password-rename heads into a single history
+down_revision: Union[str, None] = ('20250505_rename_password_column', 'abcd')
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_db_objects_snapshot_size', 'db_objects', ['snapshot_id', sa.text('total_size_bytes DESC NULLS LAST'), 'id'], unique=False)
+    op.create_index('ix_db_objects_snapshot_name', 'db_objects', ['snapshot_id', 'schema_name', 'object_name', 'id'], unique=False)
+    op.create_index('ix_session_activity_snapshot_pid', 'session_activity', ['snapshot_id', 'pid', 'id'], unique=False)
+    op.create_index('ix_locks_snapshot_pid', 'locks', ['snapshot_id', 'pid', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_locks_snapshot_pid', table_name='locks')
+    op.drop_index('ix_session_activity_snapshot_pid', table_name='session_activity')
+    op.drop_index('ix_db_objects_snapshot_name', table_name='db_objects')
+    op.drop_index('ix_db_objects_snapshot_size', table_name='db_objects')
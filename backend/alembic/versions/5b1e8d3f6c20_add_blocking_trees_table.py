@@ -0,0 +1,40 @@
+"""Add blocking_trees table
+
+Revision ID: 5b1e8d3f6c20
+Revises: a7e4b9c2d5f1
+Create Date: 2026-10-19 13:41:08.204417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e8d3f6c20'
+down_revision: Union[str, None] = 'a7e4b9c2d5f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('blocking_trees',
+    sa.Column('snapshot_id', sa.Integer(), nullable=False),
+    sa.Column('blocked_sessions', sa.Integer(), nullable=False),
+    sa.Column('root_count', sa.Integer(), nullable=False),
+    sa.Column('max_depth', sa.Integer(), nullable=False),
+    sa.Column('has_cycle', sa.Boolean(), nullable=False),
+    sa.Column('tree', sa.JSON(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['snapshot_id'], ['snapshots.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_blocking_trees_id'), 'blocking_trees', ['id'], unique=False)
+    op.create_index(op.f('ix_blocking_trees_snapshot_id'), 'blocking_trees', ['snapshot_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_blocking_trees_snapshot_id'), table_name='blocking_trees')
+    op.drop_index(op.f('ix_blocking_trees_id'), table_name='blocking_trees')
+    op.drop_table('blocking_trees')
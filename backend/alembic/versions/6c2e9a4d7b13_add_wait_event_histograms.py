@@ -0,0 +1,43 @@
+"""Add wait event histograms and snapshots (database_id, snapshot_time) index
+
+Revision ID: 6c2e9a4d7b13
+Revises: 0b6d4e8a2f95
+Create Date: 2026-10-19 20:11:37.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c2e9a4d7b13'
+down_revision: Union[str, None] = '0b6d4e8a2f95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_snapshots_database_time', 'snapshots', ['database_id', 'snapshot_time'], unique=False)
+    op.create_table('wait_event_histograms',
+    sa.Column('database_id', sa.Integer(), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('wait_event_type', sa.String(), nullable=False),
+    sa.Column('wait_event', sa.String(), nullable=False),
+    sa.Column('session_samples', sa.BigInteger(), nullable=False),
+    sa.Column('max_sessions', sa.Integer(), nullable=False),
+    sa.Column('snapshots', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['database_id'], ['monitored_databases.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_wait_event_histograms_id'), 'wait_event_histograms', ['id'], unique=False)
+    op.create_index('ix_wait_event_histograms_bucket', 'wait_event_histograms', ['database_id', 'bucket_start', 'wait_event_type', 'wait_event'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_wait_event_histograms_bucket', table_name='wait_event_histograms')
+    op.drop_index(op.f('ix_wait_event_histograms_id'), table_name='wait_event_histograms')
+    op.drop_table('wait_event_histograms')
+    op.drop_index('ix_snapshots_database_time', table_name='snapshots')
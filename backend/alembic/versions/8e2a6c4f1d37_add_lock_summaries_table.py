@@ -0,0 +1,40 @@
+"""Add lock_summaries table
+
+Revision ID: 8e2a6c4f1d37
+Revises: 5b1e8d3f6c20
+Create Date: 2026-10-19 14:22:51.630912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e2a6c4f1d37'
+down_revision: Union[str, None] = '5b1e8d3f6c20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('lock_summaries',
+    sa.Column('snapshot_id', sa.Integer(), nullable=False),
+    sa.Column('locktype', sa.String(), nullable=True),
+    sa.Column('mode', sa.String(), nullable=True),
+    sa.Column('granted', sa.Boolean(), nullable=True),
+    sa.Column('lock_count', sa.Integer(), nullable=False),
+    sa.Column('fastpath_count', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['snapshot_id'], ['snapshots.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_lock_summaries_id'), 'lock_summaries', ['id'], unique=False)
+    op.create_index(op.f('ix_lock_summaries_snapshot_id'), 'lock_summaries', ['snapshot_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_lock_summaries_snapshot_id'), table_name='lock_summaries')
+    op.drop_index(op.f('ix_lock_summaries_id'), table_name='lock_summaries')
+    op.drop_table('lock_summaries')
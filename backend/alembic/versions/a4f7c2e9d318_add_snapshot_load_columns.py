@@ -0,0 +1,31 @@
+"""Add target load and skipped collectors to snapshots
+
+Revision ID: a4f7c2e9d318
+Revises: 6c2e9a4d7b13
+Create Date: 2026-10-20 09:42:18.530174
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4f7c2e9d318'
+down_revision: Union[str, None] = '6c2e9a4d7b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('snapshots', sa.Column('load_state', sa.String(), nullable=True))
+    op.add_column('snapshots', sa.Column('skipped_collectors', postgresql.ARRAY(sa.String()), nullable=True))
+    op.add_column('snapshots', sa.Column('load_metrics', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('snapshots', 'load_metrics')
+    op.drop_column('snapshots', 'skipped_collectors')
+    op.drop_column('snapshots', 'load_state')
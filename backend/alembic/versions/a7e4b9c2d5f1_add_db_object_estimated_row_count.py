@@ -0,0 +1,26 @@
+"""Add estimated_row_count to db_objects
+
+Revision ID: a7e4b9c2d5f1
+Revises: 3c9d2f7a81b4
+Create Date: 2026-10-19 11:03:27.551902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7e4b9c2d5f1'
+down_revision: Union[str, None] = '3c9d2f7a81b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('db_objects', sa.Column('estimated_row_count', sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('db_objects', 'estimated_row_count')
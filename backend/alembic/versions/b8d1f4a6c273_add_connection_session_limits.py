@@ -0,0 +1,30 @@
+"""Add per-target collector session limits to monitored databases
+
+Revision ID: b8d1f4a6c273
+Revises: a4f7c2e9d318
+Create Date: 2026-10-21 10:17:05.284613
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d1f4a6c273'
+down_revision: Union[str, None] = 'a4f7c2e9d318'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('monitored_databases', sa.Column('statement_timeout_ms', sa.Integer(), nullable=True))
+    op.add_column('monitored_databases', sa.Column('lock_timeout_ms', sa.Integer(), nullable=True))
+    op.add_column('monitored_databases', sa.Column('idle_in_transaction_timeout_ms', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('monitored_databases', 'idle_in_transaction_timeout_ms')
+    op.drop_column('monitored_databases', 'lock_timeout_ms')
+    op.drop_column('monitored_databases', 'statement_timeout_ms')
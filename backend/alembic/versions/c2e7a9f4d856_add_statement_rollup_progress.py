@@ -0,0 +1,40 @@
+"""Track statement rollup progress per database
+
+Revision ID: c2e7a9f4d856
+Revises: b8d1f4a6c273
+Create Date: 2026-10-22 14:06:41.902377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e7a9f4d856'
+down_revision: Union[str, None] = 'b8d1f4a6c273'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('statement_rollup_progress',
+    sa.Column('database_id', sa.Integer(), nullable=False),
+    sa.Column('rolled_until', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['database_id'], ['monitored_databases.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('database_id')
+    )
+    op.create_index(op.f('ix_statement_rollup_progress_id'), 'statement_rollup_progress', ['id'], unique=False)
+    # Progress so far is the newest hour with rollup rows
+    op.execute(
+        "INSERT INTO statement_rollup_progress (database_id, rolled_until) "
+        "SELECT database_id, max(bucket_start) FROM statement_stats_hourly GROUP BY database_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_statement_rollup_progress_id'), table_name='statement_rollup_progress')
+    op.drop_table('statement_rollup_progress')
@@ -0,0 +1,32 @@
+"""Add resolved OID name columns to locks and statement_stats
+
+Revision ID: c4f7a1e9b208
+Revises: 8e2a6c4f1d37
+Create Date: 2026-10-19 15:03:17.482106
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f7a1e9b208'
+down_revision: Union[str, None] = '8e2a6c4f1d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('locks', sa.Column('relation_name', sa.String(), nullable=True))
+    op.add_column('locks', sa.Column('database_name', sa.String(), nullable=True))
+    op.add_column('statement_stats', sa.Column('username', sa.String(), nullable=True))
+    op.add_column('statement_stats', sa.Column('database_name', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('statement_stats', 'database_name')
+    op.drop_column('statement_stats', 'username')
+    op.drop_column('locks', 'database_name')
+    op.drop_column('locks', 'relation_name')
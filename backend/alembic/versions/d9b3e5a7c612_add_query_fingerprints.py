@@ -0,0 +1,32 @@
+"""Add query fingerprints to session_activity and statement_stats
+
+Revision ID: d9b3e5a7c612
+Revises: c4f7a1e9b208
+Create Date: 2026-10-19 15:47:29.915033
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9b3e5a7c612'
+down_revision: Union[str, None] = 'c4f7a1e9b208'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('session_activity', sa.Column('query_fingerprint', sa.BigInteger(), nullable=True))
+    op.add_column('statement_stats', sa.Column('query_fingerprint', sa.BigInteger(), nullable=True))
+    op.create_index('ix_session_activity_snapshot_fingerprint', 'session_activity', ['snapshot_id', 'query_fingerprint'], unique=False)
+    op.create_index('ix_statement_stats_snapshot_fingerprint', 'statement_stats', ['snapshot_id', 'query_fingerprint'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_statement_stats_snapshot_fingerprint', table_name='statement_stats')
+    op.drop_index('ix_session_activity_snapshot_fingerprint', table_name='session_activity')
+    op.drop_column('statement_stats', 'query_fingerprint')
+    op.drop_column('session_activity', 'query_fingerprint')
@@ -0,0 +1,52 @@
+"""Add statement_regressions table
+
+Revision ID: e1c8f2b6a493
+Revises: d9b3e5a7c612
+Create Date: 2026-10-19 16:31:44.057218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1c8f2b6a493'
+down_revision: Union[str, None] = 'd9b3e5a7c612'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('statement_regressions',
+    sa.Column('snapshot_id', sa.Integer(), nullable=False),
+    sa.Column('database_id', sa.Integer(), nullable=False),
+    sa.Column('detected_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('queryid', sa.BigInteger(), nullable=True),
+    sa.Column('userid', sa.BigInteger(), nullable=True),
+    sa.Column('dbid', sa.BigInteger(), nullable=True),
+    sa.Column('query_fingerprint', sa.BigInteger(), nullable=True),
+    sa.Column('query', sa.Text(), nullable=True),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('observed_value', sa.Float(), nullable=True),
+    sa.Column('baseline_value', sa.Float(), nullable=True),
+    sa.Column('ratio', sa.Float(), nullable=True),
+    sa.Column('calls_delta', sa.BigInteger(), nullable=True),
+    sa.Column('time_delta', sa.Float(), nullable=True),
+    sa.Column('rank', sa.Integer(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['database_id'], ['monitored_databases.id'], ),
+    sa.ForeignKeyConstraint(['snapshot_id'], ['snapshots.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_statement_regressions_id'), 'statement_regressions', ['id'], unique=False)
+    op.create_index(op.f('ix_statement_regressions_snapshot_id'), 'statement_regressions', ['snapshot_id'], unique=False)
+    op.create_index('ix_statement_regressions_database_detected', 'statement_regressions', ['database_id', 'detected_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_statement_regressions_database_detected', table_name='statement_regressions')
+    op.drop_index(op.f('ix_statement_regressions_snapshot_id'), table_name='statement_regressions')
+    op.drop_index(op.f('ix_statement_regressions_id'), table_name='statement_regressions')
+    op.drop_table('statement_regressions')
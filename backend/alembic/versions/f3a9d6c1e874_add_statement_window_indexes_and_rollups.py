@@ -0,0 +1,51 @@
+"""Add statement (snapshot_id, queryid) index and hourly statement rollups
+
+Revision ID: f3a9d6c1e874
+Revises: e1c8f2b6a493
+Create Date: 2026-10-19 17:20:05.118342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a9d6c1e874'
+down_revision: Union[str, None] = 'e1c8f2b6a493'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_statement_stats_snapshot_queryid', 'statement_stats', ['snapshot_id', 'queryid'], unique=False)
+    op.create_table('statement_stats_hourly',
+    sa.Column('database_id', sa.Integer(), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('userid', sa.BigInteger(), nullable=True),
+    sa.Column('dbid', sa.BigInteger(), nullable=True),
+    sa.Column('queryid', sa.BigInteger(), nullable=True),
+    sa.Column('query', sa.Text(), nullable=True),
+    sa.Column('calls', sa.BigInteger(), nullable=True),
+    sa.Column('total_time', sa.Float(), nullable=True),
+    sa.Column('rows', sa.BigInteger(), nullable=True),
+    sa.Column('shared_blks_hit', sa.BigInteger(), nullable=True),
+    sa.Column('shared_blks_read', sa.BigInteger(), nullable=True),
+    sa.Column('temp_blks_written', sa.BigInteger(), nullable=True),
+    sa.Column('samples', sa.Integer(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['database_id'], ['monitored_databases.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_statement_stats_hourly_id'), 'statement_stats_hourly', ['id'], unique=False)
+    op.create_index(op.f('ix_statement_stats_hourly_queryid'), 'statement_stats_hourly', ['queryid'], unique=False)
+    op.create_index('ix_statement_stats_hourly_bucket', 'statement_stats_hourly', ['database_id', 'bucket_start', 'userid', 'dbid', 'queryid'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_statement_stats_hourly_bucket', table_name='statement_stats_hourly')
+    op.drop_index(op.f('ix_statement_stats_hourly_queryid'), table_name='statement_stats_hourly')
+    op.drop_index(op.f('ix_statement_stats_hourly_id'), table_name='statement_stats_hourly')
+    op.drop_table('statement_stats_hourly')
+    op.drop_index('ix_statement_stats_snapshot_queryid', table_name='statement_stats')
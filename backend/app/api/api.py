@@ -5,7 +5,7 @@ from fastapi import APIRouter
 # from fastapi.middleware.cors import CORSMiddleware
 
 # Keep endpoint imports
-from app.api.v1.endpoints import connections, monitoring
+from app.api.v1.endpoints import analytics, connections, monitoring
 # Health check might be separate or included here depending on desired structure
 from app.api.endpoints import health
 
@@ -25,9 +25,9 @@ api_router = APIRouter()
 # The prefix here defines the path relative to where api_router is included in main.py
 api_router.include_router(connections.router, prefix="/connections", tags=["connections"])
 api_router.include_router(monitoring.router, prefix="/monitoring", tags=["monitoring"])
+api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
 
-# Optionally include the health router here too, or keep it separate in main.py
-# If included here, adjust prefix in main.py accordingly
-# api_router.include_router(health.router, prefix="/health", tags=["health"]) # Example if moved here
+# Liveness and readiness probes for load balancers / orchestrators
+api_router.include_router(health.router, prefix="/health", tags=["health"])
 
 # The api_router object is now defined and will be imported by main.py
\ No newline at end of file
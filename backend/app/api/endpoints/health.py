@@ -1,27 +1,132 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict
 
-from app.api.deps import get_db
+from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func, select, text
+
+from app import models, schemas, startup
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services import target_pools
 
 router = APIRouter()
 
+_started = time.monotonic()
+
 
-@router.get("/health")
-def health_check(db: Session = Depends(get_db)):
+@router.get("/live", response_model=schemas.LivenessStatus)
+async def liveness() -> Any:
     """
-    Health check endpoint.
-    Checks if the application is running and database connection is working.
+    Liveness probe: answers as long as the process and its event loop are responsive.
+    Touches no dependencies, so a database outage does not get the instance restarted.
     """
+    return {"status": "alive", "uptime_seconds": time.monotonic() - _started}
+
+
+def _check_monitoring_database() -> Dict[str, Any]:
+    """Monitoring database round trip, last snapshot per target and pending snapshot jobs (blocking)."""
+    result: Dict[str, Any] = {"connected": False, "latency_ms": None, "targets": [], "pending_jobs": 0, "error": None}
     try:
-        # Try to execute a simple query to check database connection
-        db.execute("SELECT 1")
-        return {
-            "status": "healthy",
-            "database": "connected"
-        }
+        with SessionLocal() as db:
+            started = time.perf_counter()
+            db.execute(text("SELECT 1"))
+            result["latency_ms"] = (time.perf_counter() - started) * 1000.0
+            result["connected"] = True
+
+            # One index probe per target on snapshots (database_id, snapshot_time)
+            last_snapshot = (
+                select(func.max(models.Snapshot.snapshot_time))
+                .where(models.Snapshot.database_id == models.Connection.id)
+                .scalar_subquery()
+            )
+            result["targets"] = db.execute(
+                select(models.Connection.id, models.Connection.alias, last_snapshot.label("last_snapshot_time"))
+                .order_by(models.Connection.id)
+            ).all()
     except Exception as e:
-        return {
-            "status": "unhealthy",
-            "database": "disconnected",
-            "error": str(e)
-        }
\ No newline at end of file
+        result["error"] = str(e)
+
+    scheduler = startup.running_scheduler()
+    if scheduler is not None:
+        try:
+            result["pending_jobs"] = sum(1 for job in scheduler.get_jobs() if job.id.startswith("snapshot_db_"))
+        except Exception as e:
+            result["error"] = result["error"] or str(e)
+    return result
+
+
+@router.get("/ready", response_model=schemas.ReadinessStatus, responses={503: {"model": schemas.ReadinessStatus}})
+async def readiness() -> Any:
+    """
+    Readiness probe: 200 while the instance can take work, 503 when a threshold is
+    exceeded (monitoring database unreachable or slow, scheduler stopped, collector
+    backlog or target pools saturated) so a load balancer can shed it. Stale targets
+    only degrade the status; they do not make the instance unready.
+    """
+    checks = await asyncio.to_thread(_check_monitoring_database)
+    now = datetime.now(timezone.utc)
+    max_lag = settings.HEALTH_SNAPSHOT_LAG_INTERVALS * settings.SNAPSHOT_INTERVAL_MINUTES * 60
+
+    targets = []
+    for db_id, alias, last_snapshot_time in checks["targets"]:
+        lag = (now - last_snapshot_time).total_seconds() if last_snapshot_time is not None else None
+        targets.append({
+            "db_id": db_id,
+            "alias": alias,
+            "last_snapshot_time": last_snapshot_time,
+            "lag_seconds": lag,
+            "stale": lag is None or lag > max_lag,
+        })
+
+    pools = [{"db_id": db_id, **usage} for db_id, usage in sorted(target_pools.pool_usage().items())]
+    capacity = sum(pool["max_size"] for pool in pools)
+    pool_saturation = sum(pool["in_use"] for pool in pools) / capacity if capacity else 0.0
+    # Imported here: snapshot_service pulls in every collector, which main does not need to bind
+    from app.services.snapshot_service import snapshots_in_flight
+
+    running = snapshots_in_flight()
+    queue_depth = checks["pending_jobs"] + running
+    scheduler_running = startup.running_scheduler() is not None
+
+    reasons = []
+    if not checks["connected"]:
+        reasons.append(f"Monitoring database unreachable: {checks['error']}")
+    elif checks["latency_ms"] > settings.HEALTH_DB_LATENCY_MAX_MS:
+        reasons.append(f"Monitoring database round trip {checks['latency_ms']:.0f} ms exceeds {settings.HEALTH_DB_LATENCY_MAX_MS:.0f} ms")
+    if not scheduler_running:
+        reasons.append("Scheduler is not running" if startup.complete else "Starting up")
+    if queue_depth > settings.HEALTH_MAX_COLLECTOR_QUEUE:
+        reasons.append(f"Collector queue depth {queue_depth} exceeds {settings.HEALTH_MAX_COLLECTOR_QUEUE}")
+    if pool_saturation >= settings.HEALTH_MAX_POOL_SATURATION:
+        reasons.append(f"Target pools {pool_saturation:.0%} in use (limit {settings.HEALTH_MAX_POOL_SATURATION:.0%})")
+    ready = not reasons
+
+    stale = [target["alias"] for target in targets if target["stale"]]
+    if ready and stale:
+        reasons.append(f"No recent snapshot for: {', '.join(stale)}")
+
+    payload = {
+        "status": ("degraded" if stale else "ready") if ready else "not_ready",
+        "ready": ready,
+        "reasons": reasons,
+        "database_connected": checks["connected"],
+        "database_latency_ms": checks["latency_ms"],
+        "scheduler_running": scheduler_running,
+        "collector_queue_depth": queue_depth,
+        "snapshots_running": running,
+        "pool_saturation": pool_saturation,
+        "pools": pools,
+        "targets": targets,
+        "startup_complete": startup.complete,
+        "startup_phases": startup.phases,
+        "thresholds": {
+            "db_latency_max_ms": settings.HEALTH_DB_LATENCY_MAX_MS,
+            "max_collector_queue": settings.HEALTH_MAX_COLLECTOR_QUEUE,
+            "max_pool_saturation": settings.HEALTH_MAX_POOL_SATURATION,
+            "snapshot_max_lag_seconds": max_lag,
+        },
+    }
+    return ORJSONResponse(content=payload, status_code=200 if ready else 503)
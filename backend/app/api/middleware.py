@@ -0,0 +1,244 @@
+import asyncio
+import functools
+import hmac
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.profiling import SamplingProfiler
+
+
+class RequestMetricsMiddleware:
+    """
+    Records API request latency per route template (e.g. /api/v1/monitoring/locks/{db_id}/latest)
+    in HTTP_REQUEST_SECONDS. Plain ASGI rather than BaseHTTPMiddleware, so responses are
+    not buffered; requests that match no route share the route label "unmatched".
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            metrics.HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status
+            )
+
+
+class RequestTiming:
+    """
+    Phase timings of one request. `db` is time spent in cursor executes on the
+    application database engine; `serialize` is response_model validation plus
+    JSON encoding (from the endpoint returning to the response starting, plus
+    list_response encoding); `app` is the rest of the time until the response starts.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_seconds = 0.0
+        self.db_queries = 0
+        self.serialize_seconds = 0.0
+        self.endpoint_returned: Optional[float] = None
+        self.total_seconds: Optional[float] = None
+
+    def response_started(self) -> None:
+        now = time.perf_counter()
+        if self.endpoint_returned is not None:
+            self.serialize_seconds += now - self.endpoint_returned
+            self.endpoint_returned = None
+        self.total_seconds = now - self.started
+
+    def phases(self) -> Dict[str, float]:
+        total = self.total_seconds if self.total_seconds is not None else time.perf_counter() - self.started
+        return {
+            "db": self.db_seconds,
+            "serialize": self.serialize_seconds,
+            "app": max(total - self.db_seconds - self.serialize_seconds, 0.0),
+            "total": total,
+        }
+
+    def header(self) -> str:
+        phases = self.phases()
+        parts = [f'db;dur={phases["db"] * 1000:.1f};desc="{self.db_queries} queries"']
+        parts.extend(f"{phase};dur={phases[phase] * 1000:.1f}" for phase in ("serialize", "app", "total"))
+        return ", ".join(parts)
+
+
+# Set for the duration of each HTTP request by ServerTimingMiddleware. Starlette's threadpool
+# copies the context, so sync endpoints and dependencies update the same RequestTiming.
+_request_timing: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+
+@contextmanager
+def serialization_timer():
+    """Counts the enclosed block as serialization time of the current request, if any."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing = _request_timing.get()
+        if timing is not None:
+            timing.serialize_seconds += time.perf_counter() - started
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Adds cursor execute time on `engine` to the current request's `db` phase."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _query_started(conn, cursor, statement, parameters, context, executemany):
+        if _request_timing.get() is not None:
+            context._request_query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _query_finished(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_request_query_started", None)
+        timing = _request_timing.get()
+        if started is not None and timing is not None:
+            timing.db_seconds += time.perf_counter() - started
+            timing.db_queries += 1
+
+
+def _note_return(call):
+    """Wraps an endpoint function to record when it returned, keeping it sync or async."""
+
+    def returned() -> None:
+        timing = _request_timing.get()
+        if timing is not None:
+            timing.endpoint_returned = time.perf_counter()
+
+    if asyncio.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def endpoint(*args, **kwargs):
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                returned()
+    else:
+        @functools.wraps(call)
+        def endpoint(*args, **kwargs):
+            try:
+                return call(*args, **kwargs)
+            finally:
+                returned()
+    return endpoint
+
+
+def instrument_routes(app: FastAPI) -> None:
+    """
+    Marks when each API endpoint returns, so the time FastAPI then spends on
+    response_model validation and encoding shows up as `serialize`. Replaces the
+    call of each route's dependant, which the request handler looks up per request;
+    run it after all routers are included.
+    """
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            route.dependant.call = _note_return(route.dependant.call)
+
+
+class ServerTimingMiddleware:
+    """
+    Adds a Server-Timing header (db, serialize, app, total in ms) to every HTTP
+    response and records the phases per route template in HTTP_REQUEST_PHASE_SECONDS.
+    Phases end when the response starts, so streaming the body is not included.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        token = _request_timing.set(timing)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                timing.response_started()
+                MutableHeaders(scope=message).append("Server-Timing", timing.header())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timing.reset(token)
+            route = scope.get("route")
+            if route is not None:
+                for phase, seconds in timing.phases().items():
+                    if phase != "total":
+                        metrics.HTTP_REQUEST_PHASE_SECONDS.observe(seconds, getattr(route, "path", "unmatched"), phase)
+
+
+class ProfilingMiddleware:
+    """
+    Profiles single requests on demand: when PROFILING_TOKEN is set and a request
+    carries it (X-Profile header or ?profile= query parameter), the request runs
+    under a SamplingProfiler and is answered with the collapsed stacks (text/plain,
+    ready for flamegraph.pl or speedscope) instead of its response. The original
+    status is returned in X-Profile-Status.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    @staticmethod
+    def _requested(scope: Scope) -> bool:
+        token = Headers(scope=scope).get("x-profile") or QueryParams(scope["query_string"]).get("profile")
+        return token is not None and hmac.compare_digest(token.encode(), settings.PROFILING_TOKEN.encode())
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.PROFILING_TOKEN or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def discard_response(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        profiler = SamplingProfiler(settings.PROFILING_INTERVAL_MS / 1000)
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, discard_response)
+        finally:
+            profiler.stop()
+        response = PlainTextResponse(profiler.collapsed(), headers={
+            "X-Profile-Status": str(status),
+            "X-Profile-Samples": str(profiler.samples),
+            "X-Profile-Seconds": f"{time.perf_counter() - started:.6f}",
+        })
+        await response(scope, receive, send)
@@ -0,0 +1,39 @@
+import base64
+from typing import Any, Iterable, List, Optional, Sequence
+
+import orjson
+from fastapi import HTTPException
+
+
+def encode_cursor(key: Optional[Sequence[Any]]) -> Optional[str]:
+    """Encodes a keyset position (the sort key of the last row) as an opaque cursor."""
+    if key is None:
+        return None
+    return base64.urlsafe_b64encode(orjson.dumps(list(key))).decode("ascii")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[List[Any]]:
+    """Decodes a cursor produced by `encode_cursor`. Raises a 400 if it is malformed."""
+    if not cursor:
+        return None
+    try:
+        key = orjson.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor.")
+    if not isinstance(key, list):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor.")
+    return key
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[List[str]]:
+    """
+    Parses a comma separated `fields=` projection.
+    Returns None when no projection was requested. Raises a 400 for unknown fields.
+    """
+    if not fields:
+        return None
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = sorted(set(requested) - set(allowed))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields requested: {', '.join(unknown)}")
+    return requested
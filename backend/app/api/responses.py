@@ -0,0 +1,26 @@
+from typing import Any, Dict
+
+from fastapi.responses import ORJSONResponse
+
+from app.api.middleware import serialization_timer
+from app.core.utils import format_bytes_to_pretty_str
+
+
+def list_response(payload: Dict[str, Any]) -> ORJSONResponse:
+    """
+    Encodes a list endpoint payload with orjson.
+
+    The payload is built from plain row dicts (see the `*_rows_by_snapshot` CRUD
+    functions), so no ORM objects are loaded and no pydantic validation runs.
+    Returning a Response instance makes FastAPI skip `response_model` validation;
+    the declared response models still document the shape in OpenAPI.
+    """
+    with serialization_timer():
+        return ORJSONResponse(content=payload)
+
+
+def add_size_pretty(rows: list) -> list:
+    """Adds `size_pretty` to DbObject row dicts in place (cached formatting)."""
+    for row in rows:
+        row["size_pretty"] = format_bytes_to_pretty_str(row.get("total_size_bytes"))
+    return rows
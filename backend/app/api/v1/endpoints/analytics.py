@@ -0,0 +1,194 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app import schemas
+from app.api import deps
+from app.api.responses import list_response
+
+# numpy and history_analytics are imported inside the endpoints: importing them here
+# would put NumPy on the import path of the whole application
+
+router = APIRouter()
+
+DEFAULT_WINDOW = timedelta(hours=24)
+
+
+def _time_range(start_time: Optional[datetime], end_time: Optional[datetime]) -> Tuple[datetime, datetime]:
+    """Defaults to the last 24 hours; analytics are meant for long windows."""
+    if end_time is None:
+        end_time = datetime.now(timezone.utc)
+    if start_time is None:
+        start_time = end_time - DEFAULT_WINDOW
+    if start_time >= end_time:
+        raise HTTPException(status_code=400, detail="start_time must be before end_time.")
+    return start_time, end_time
+
+
+def _parse_quantiles(quantiles: str) -> List[float]:
+    try:
+        values = [float(q) for q in quantiles.split(",") if q.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="quantiles must be comma separated numbers.")
+    if not values or any(not 0.0 <= q <= 1.0 for q in values):
+        raise HTTPException(status_code=400, detail="quantiles must be between 0 and 1.")
+    return values
+
+
+def _timestamps(epochs) -> List[datetime]:
+    """Epoch seconds (a NumPy array) as UTC datetimes."""
+    return [datetime.fromtimestamp(ts, tz=timezone.utc) for ts in epochs.tolist()]
+
+
+@router.get("/{db_id}/statements/{queryid}/rates", response_model=schemas.StatementRateSeries)
+def get_statement_rate_series(
+    *,
+    db: Session = Depends(deps.get_db),
+    db_id: int,
+    queryid: int,
+    start_time: Optional[datetime] = Query(None, description="Start of the window (default: 24 hours before end_time)"),
+    end_time: Optional[datetime] = Query(None, description="End of the window (default: now)"),
+    window: int = Query(5, description="Intervals in the rolling mean of ms_per_call", ge=1, le=1000)
+) -> Any:
+    """
+    Get a statement's per-interval call rate, latency and row rate between consecutive
+    snapshots (summed over users), with a rolling mean of the latency.
+    """
+    from app.services import history_analytics
+
+    start_time, end_time = _time_range(start_time, end_time)
+    history = history_analytics.load_statement_history(db, db_id, start_time, end_time, queryid=queryid)
+    intervals = history_analytics.statement_intervals(history)
+    rolling = history_analytics.rolling_mean(intervals["ms_per_call"], window)
+
+    points = [
+        {
+            "timestamp": ts,
+            "calls_per_sec": calls_per_sec,
+            "ms_per_call": ms_per_call,
+            "rows_per_sec": rows_per_sec,
+            "ms_per_call_rolling": ms_rolling,
+        }
+        for ts, calls_per_sec, ms_per_call, rows_per_sec, ms_rolling in zip(
+            _timestamps(intervals["ts"]),
+            intervals["calls_per_sec"].tolist(),
+            intervals["ms_per_call"].tolist(),
+            intervals["rows_per_sec"].tolist(),
+            rolling.tolist(),
+        )
+    ]
+    return list_response({
+        "db_id": db_id,
+        "queryid": queryid,
+        "start_time": start_time,
+        "end_time": end_time,
+        "window": window,
+        "points": points,
+    })
+
+
+@router.get("/{db_id}/statements/percentiles", response_model=schemas.StatementLatencyPercentileList)
+def get_statement_latency_percentiles(
+    *,
+    db: Session = Depends(deps.get_db),
+    db_id: int,
+    start_time: Optional[datetime] = Query(None, description="Start of the window (default: 24 hours before end_time)"),
+    end_time: Optional[datetime] = Query(None, description="End of the window (default: now)"),
+    quantiles: str = Query("0.5,0.95,0.99", description="Comma separated quantiles between 0 and 1"),
+    limit: int = Query(50, description="Statements to return, highest last quantile first", ge=1, le=5000)
+) -> Any:
+    """
+    Get percentiles of each statement's per-interval mean latency (ms per call)
+    across all snapshot intervals of the window.
+    """
+    import numpy as np
+
+    from app.services import history_analytics
+
+    start_time, end_time = _time_range(start_time, end_time)
+    qs = _parse_quantiles(quantiles)
+    history = history_analytics.load_statement_history(db, db_id, start_time, end_time)
+    intervals = history_analytics.statement_intervals(history)
+    stats = history_analytics.grouped_quantiles(intervals["queryid"], intervals["ms_per_call"], qs)
+
+    top = np.argsort(-stats[qs[-1]], kind="stable")[:limit]
+    labels = [f"p{q * 100:g}" for q in qs]
+    columns = [stats[q][top].tolist() for q in qs]
+    statements = [
+        {
+            "queryid": queryid,
+            "intervals": count,
+            "mean_ms_per_call": mean,
+            "max_ms_per_call": maximum,
+            "percentiles": dict(zip(labels, values)),
+        }
+        for queryid, count, mean, maximum, *values in zip(
+            stats["keys"][top].tolist(),
+            stats["count"][top].tolist(),
+            stats["mean"][top].tolist(),
+            stats["max"][top].tolist(),
+            *columns,
+        )
+    ]
+    return list_response({
+        "db_id": db_id,
+        "start_time": start_time,
+        "end_time": end_time,
+        "statements": statements,
+    })
+
+
+@router.get("/{db_id}/activity/correlation", response_model=schemas.ActivityLoadCorrelation)
+def get_activity_load_correlation(
+    *,
+    db: Session = Depends(deps.get_db),
+    db_id: int,
+    start_time: Optional[datetime] = Query(None, description="Start of the window (default: 24 hours before end_time)"),
+    end_time: Optional[datetime] = Query(None, description="End of the window (default: now)"),
+    window: int = Query(5, description="Snapshots in the rolling means", ge=1, le=1000)
+) -> Any:
+    """
+    Correlate active (and waiting) sessions with total statement load per snapshot:
+    calls per second and execution milliseconds per second from pg_stat_statements deltas.
+    """
+    from app.services import history_analytics
+
+    start_time, end_time = _time_range(start_time, end_time)
+    activity = history_analytics.load_activity_history(db, db_id, start_time, end_time)
+    intervals = history_analytics.statement_intervals(
+        history_analytics.load_statement_history(db, db_id, start_time, end_time)
+    )
+    result = history_analytics.activity_statement_correlation(activity, intervals, window=window)
+
+    points = [
+        {
+            "timestamp": ts,
+            "active": active,
+            "waiting": waiting,
+            "calls_per_sec": calls_per_sec,
+            "exec_ms_per_sec": exec_ms_per_sec,
+            "active_rolling": active_rolling,
+            "exec_ms_per_sec_rolling": exec_rolling,
+        }
+        for ts, active, waiting, calls_per_sec, exec_ms_per_sec, active_rolling, exec_rolling in zip(
+            _timestamps(result["ts"]),
+            result["active"].tolist(),
+            result["waiting"].tolist(),
+            result["calls_per_sec"].tolist(),
+            result["exec_ms_per_sec"].tolist(),
+            result["active_rolling"].tolist(),
+            result["exec_ms_per_sec_rolling"].tolist(),
+        )
+    ]
+    return list_response({
+        "db_id": db_id,
+        "start_time": start_time,
+        "end_time": end_time,
+        "window": window,
+        "active_vs_calls": result["active_vs_calls"],
+        "active_vs_exec_time": result["active_vs_exec_time"],
+        "waiting_vs_exec_time": result["waiting_vs_exec_time"],
+        "points": points,
+    })
@@ -8,6 +8,12 @@ from app import schemas # Assuming schemas package is in app
 # from app import crud    # Old import
 from app.crud import crud_connection # Import the specific CRUD module
 from app.api import deps # Assuming a dependency file for DB session
+from app.services.collection_throttle import collection_throttle
+from app.services.object_details_cache import object_details_cache
+from app.services.oid_name_cache import oid_name_cache
+from app.services import target_pools
+from app.services.statement_regressions import statement_regression_detector
+from app.services.target_health import target_circuit_breaker
 
 # Assume crud functions are organized like crud.connection.create_connection
 # If crud functions are directly in crud module, adjust imports/calls
@@ -50,6 +56,19 @@ def read_connections_endpoint(
     # Ensure returned data conforms to Connection schema (without password)
     return connections
 
+@router.get("/health", response_model=List[schemas.ConnectionHealth])
+def read_connections_health_endpoint(
+    db: Session = Depends(deps.get_db),
+    skip: int = 0,
+    limit: int = 100,
+):
+    """
+    Collection health of the monitored database connections: whether each one is
+    being collected or skipped in backoff after repeated connection failures.
+    """
+    connections = crud_connection.get_connections(db=db, skip=skip, limit=limit)
+    return target_circuit_breaker.statuses([connection.id for connection in connections])
+
 @router.get("/{connection_id}", response_model=schemas.Connection)
 def read_connection_endpoint(
     *,
@@ -69,8 +88,42 @@ def read_connection_endpoint(
     # Ensure returned data conforms to Connection schema (without password)
     return connection
 
+@router.get("/{connection_id}/health", response_model=schemas.ConnectionHealth)
+def read_connection_health_endpoint(
+    *,
+    db: Session = Depends(deps.get_db),
+    connection_id: int,
+):
+    """
+    Collection health of one connection (circuit breaker state, last error, next retry).
+    """
+    if not crud_connection.get_connection(db=db, connection_id=connection_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Connection not found.",
+        )
+    return target_circuit_breaker.status(connection_id)
+
+@router.post("/{connection_id}/health/reset", response_model=schemas.ConnectionHealth)
+def reset_connection_health_endpoint(
+    *,
+    db: Session = Depends(deps.get_db),
+    connection_id: int,
+):
+    """
+    Ends a connection's backoff so the next collection cycle tries it again
+    (e.g. after a firewall or credentials fix).
+    """
+    if not crud_connection.get_connection(db=db, connection_id=connection_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Connection not found.",
+        )
+    target_circuit_breaker.forget_target(connection_id)
+    return target_circuit_breaker.status(connection_id)
+
 @router.put("/{connection_id}", response_model=schemas.Connection)
-def update_connection_endpoint(
+async def update_connection_endpoint(
     *,
     db: Session = Depends(deps.get_db),
     connection_id: int,
@@ -102,12 +155,21 @@ def update_connection_endpoint(
     updated_connection = crud_connection.update_connection(
         db=db, connection_id=connection_id, connection_update=connection_in
     )
+    # The connection may now point at a different database
+    object_details_cache.invalidate_target(connection_id)
+    oid_name_cache.invalidate_target(connection_id)
+    statement_regression_detector.forget_target(connection_id)
+    target_circuit_breaker.forget_target(connection_id)
+    collection_throttle.forget_target(connection_id)
+    # Reconnect with the new details; a pool for the old host and credentials would otherwise
+    # only be replaced on the next collection
+    await target_pools.close_pool(connection_id)
     # Ensure returned data conforms to Connection schema (without password)
     return updated_connection
 
 
 @router.delete("/{connection_id}", response_model=schemas.Connection)
-def delete_connection_endpoint(
+async def delete_connection_endpoint(
     *,
     db: Session = Depends(deps.get_db),
     connection_id: int,
@@ -124,5 +186,12 @@ def delete_connection_endpoint(
         )
     # deleted_connection = crud.connection.delete_connection(db=db, connection_id=connection_id)
     deleted_connection = crud_connection.delete_connection(db=db, connection_id=connection_id)
+    object_details_cache.invalidate_target(connection_id)
+    oid_name_cache.invalidate_target(connection_id)
+    statement_regression_detector.forget_target(connection_id)
+    target_circuit_breaker.forget_target(connection_id)
+    collection_throttle.forget_target(connection_id)
+    # Nothing collects from a deleted connection, so its pool would stay open until shutdown
+    await target_pools.close_pool(connection_id)
     # Return the details of the deleted connection (without password)
     return deleted_connection 
\ No newline at end of file
@@ -1,17 +1,27 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List, Any, Optional
+from typing import Dict, List, Any, Optional
 from datetime import datetime
 
 from app.api import deps
-from app import schemas
+from app.core.config import settings
+from app.api.responses import list_response, add_size_pretty
+from app.api.pagination import encode_cursor, decode_cursor, parse_fields
+from app import models, schemas
 from app import crud
-from app.services import object_details_service
+from app.services import object_details_service, target_pools
+from app.services.object_details_cache import object_details_cache
+from app.services.oid_name_cache import oid_name_cache
+from app.services.row_count_jobs import row_count_jobs
+from app.services.statement_regressions import StatementRegressionKind
 import asyncpg
-from app.core.security import decrypt
 
 router = APIRouter()
 
+# Name column -> (OID kind, OID column), filled from the OID name cache for rows stored without names
+STATEMENT_NAME_COLUMNS = {"username": ("role", "userid"), "database_name": ("database", "dbid")}
+LOCK_NAME_COLUMNS = {"relation_name": ("relation", "relation"), "database_name": ("database", "database")}
+
 
 @router.get("/")
 async def read_monitoring_root():
@@ -52,9 +62,15 @@ async def get_latest_session_details(
     *,
     db: Session = Depends(deps.get_db),
     db_id: int,
+    state: Optional[str] = Query(None, description="Only sessions in this state (e.g. 'active')"),
+    usename: Optional[str] = Query(None, description="Only sessions of this role"),
+    fields: Optional[str] = Query(None, description="Comma separated list of session fields to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    limit: Optional[int] = Query(None, description="Page size; all sessions are returned if omitted", ge=1, le=1000)
 ) -> Any:
     """
     Get detailed session information from the latest snapshot for a specific database.
+    Supports keyset pagination ordered by pid, server-side filters and field projection.
     """
     latest_snapshot = crud.monitoring.get_latest_snapshot(db=db, db_id=db_id)
 
@@ -64,18 +80,58 @@ async def get_latest_session_details(
             detail=f"No snapshot found for database ID {db_id}"
         )
 
-    session_details = crud.monitoring.get_session_details_by_snapshot(
-        db=db,
-        snapshot_id=latest_snapshot.id
-    )
+    try:
+        session_rows, next_key = crud.monitoring.get_session_rows_by_snapshot(
+            db=db,
+            snapshot_id=latest_snapshot.id,
+            state=state,
+            usename=usename,
+            fields=parse_fields(fields, crud.monitoring.SESSION_FIELDS),
+            after=decode_cursor(cursor),
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    return schemas.SessionDetailList(
-        db_id=db_id,
-        snapshot_id=latest_snapshot.id,
-        snapshot_time=latest_snapshot.snapshot_time,
-        sessions=session_details
+    return list_response({
+        "db_id": db_id,
+        "snapshot_id": latest_snapshot.id,
+        "snapshot_time": latest_snapshot.snapshot_time,
+        "sessions": session_rows,
+        "next_cursor": encode_cursor(next_key),
+    })
+
+
+@router.get("/sessions/{db_id}/by-fingerprint", response_model=schemas.SessionQueryGroupList)
+async def get_latest_sessions_by_fingerprint(
+    *,
+    db: Session = Depends(deps.get_db),
+    db_id: int,
+    limit: Optional[int] = Query(100, description="Maximum number of query shapes", ge=1, le=5000)
+) -> Any:
+    """
+    Group the latest snapshot's sessions by query shape (literals stripped),
+    most sessions first, with the pg_stat_statements totals of the same shape.
+    """
+    latest_snapshot = crud.monitoring.get_latest_snapshot(db=db, db_id=db_id)
+
+    if not latest_snapshot:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No snapshot found for database ID {db_id}"
+        )
+
+    groups = crud.monitoring.get_session_groups_by_fingerprint(
+        db=db, snapshot_id=latest_snapshot.id, limit=limit
     )
 
+    return list_response({
+        "db_id": db_id,
+        "snapshot_id": latest_snapshot.id,
+        "snapshot_time": latest_snapshot.snapshot_time,
+        "groups": groups,
+    })
+
 
 @router.get("/statements/{db_id}/latest", response_model=schemas.StatementStatList)
 async def get_latest_statement_stats(
@@ -90,9 +146,10 @@ async def get_latest_statement_stats(
 ) -> Any:
     """
     Get statement statistics from the latest snapshot for a specific database,
-    with options for sorting and limiting results.
+    with options for sorting and limiting results. Snapshots taken while the
+    target was under load without collecting statements are passed over.
     """
-    latest_snapshot = crud.monitoring.get_latest_snapshot(db=db, db_id=db_id)
+    latest_snapshot = crud.monitoring.get_latest_snapshot(db=db, db_id=db_id, collector="statements")
 
     if not latest_snapshot:
         raise HTTPException(
@@ -100,19 +157,83 @@ async def get_latest_statement_stats(
             detail=f"No snapshot found for database ID {db_id}"
         )
 
-    statement_stats = crud.monitoring.get_statement_stats_by_snapshot(
+    statement_rows = crud.monitoring.get_statement_rows_by_snapshot(
         db=db,
         snapshot_id=latest_snapshot.id,
         sort_by=sort_by,
         limit=limit
     )
 
-    return schemas.StatementStatList(
+    return list_response({
+        "db_id": db_id,
+        "snapshot_id": latest_snapshot.id,
+        "snapshot_time": latest_snapshot.snapshot_time,
+        "statements": oid_name_cache.annotate(db_id, statement_rows, STATEMENT_NAME_COLUMNS),
+    })
+
+
+@router.get("/statements/{db_id}/top", response_model=schemas.StatementWindowTopList)
+async def get_top_statements_in_window(
+    *,
+    db: Session = Depends(deps.get_db),
+    db_id: int,
+    start_time: datetime = Query(..., alias="start", description="Start of the window (ISO 8601)"),
+    end_time: datetime = Query(..., alias="end", description="End of the window (ISO 8601)"),
+    sort_by: crud.monitoring.StatementWindowSortBy = Query(
+        crud.monitoring.StatementWindowSortBy.total_time, description="Metric to rank statements by"
+    ),
+    limit: int = Query(20, description="Number of statements", ge=1, le=1000)
+) -> Any:
+    """
+    Get the statements that consumed the most between two points in time, from the
+    increase of their pg_stat_statements counters across the snapshots in the window
+    (counter resets handled). Long windows use the hourly rollups for full hours.
+    """
+    if start_time >= end_time:
+        raise HTTPException(status_code=400, detail="start must be before end.")
+
+    statements, source = crud.monitoring.get_top_statements_in_window(
+        db=db,
         db_id=db_id,
-        snapshot_id=latest_snapshot.id,
-        snapshot_time=latest_snapshot.snapshot_time,
-        statements=statement_stats
+        start_time=start_time,
+        end_time=end_time,
+        sort_by=sort_by,
+        limit=limit
     )
+    return list_response({
+        "db_id": db_id,
+        "start_time": start_time,
+        "end_time": end_time,
+        "sort_by": sort_by.value,
+        "source": source,
+        "statements": statements,
+    })
+
+
+@router.get("/statements/{db_id}/regressions", response_model=schemas.StatementRegressionList)
+async def get_statement_regressions(
+    *,
+    db: Session = Depends(deps.get_db),
+    db_id: int,
+    start_time: Optional[datetime] = Query(None, description="Only regressions detected at or after this time"),
+    end_time: Optional[datetime] = Query(None, description="Only regressions detected at or before this time"),
+    kind: Optional[StatementRegressionKind] = Query(None, description="Only regressions of this kind"),
+    limit: int = Query(100, description="Maximum number of regressions", ge=1, le=5000)
+) -> Any:
+    """
+    Get statement regressions flagged at ingest time, newest first: interval latency
+    or call rate jumps against each statement's rolling baseline, and statements
+    that newly entered the top consumers by execution time.
+    """
+    regressions = crud.monitoring.get_statement_regressions(
+        db=db,
+        db_id=db_id,
+        start_time=start_time,
+        end_time=end_time,
+        kind=kind.value if kind else None,
+        limit=limit
+    )
+    return schemas.StatementRegressionList(db_id=db_id, regressions=regressions)
 
 
 @router.get("/objects/{db_id}/latest", response_model=schemas.DbObjectList)
@@ -121,13 +242,19 @@ async def get_latest_db_objects(
     db: Session = Depends(deps.get_db),
     db_id: int,
     sort_by_size: bool = Query(True, description="Sort results by total size descending"),
-    limit: Optional[int] = Query(100, description="Maximum number of objects to return", ge=1, le=1000)
+    schema_name: Optional[str] = Query(None, description="Only objects in this schema"),
+    object_type: Optional[str] = Query(None, description="Only objects of this type (e.g. 'table', 'index')"),
+    min_size_bytes: Optional[int] = Query(None, description="Only objects with at least this total size", ge=0),
+    fields: Optional[str] = Query(None, description="Comma separated list of object fields to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    limit: Optional[int] = Query(100, description="Maximum number of objects to return per page", ge=1, le=1000)
 ) -> Any:
     """
     Get database object metadata and size from the latest snapshot for a specific database.
-    Allows sorting by size and limiting results.
+    Allows sorting by size, filtering, field projection and keyset pagination via `cursor`.
+    Snapshots taken while the target was under load without collecting sizes are passed over.
     """
-    latest_snapshot = crud.monitoring.get_latest_snapshot(db=db, db_id=db_id)
+    latest_snapshot = crud.monitoring.get_latest_snapshot(db=db, db_id=db_id, collector="objects")
 
     if not latest_snapshot:
         raise HTTPException(
@@ -135,19 +262,68 @@ async def get_latest_db_objects(
             detail=f"No snapshot found for database ID {db_id}"
         )
 
-    db_objects = crud.monitoring.get_db_objects_by_snapshot(
-        db=db,
-        snapshot_id=latest_snapshot.id,
-        sort_by_size=sort_by_size,
-        limit=limit
-    )
+    requested_fields = parse_fields(fields, crud.monitoring.DB_OBJECT_FIELDS | {"size_pretty"})
+    column_fields = None
+    if requested_fields:
+        # size_pretty is derived from total_size_bytes
+        column_fields = ["total_size_bytes" if f == "size_pretty" else f for f in requested_fields]
+
+    try:
+        object_rows, next_key = crud.monitoring.get_db_object_rows_by_snapshot(
+            db=db,
+            snapshot_id=latest_snapshot.id,
+            sort_by_size=sort_by_size,
+            schema_name=schema_name,
+            object_type=object_type,
+            min_size_bytes=min_size_bytes,
+            fields=column_fields,
+            after=decode_cursor(cursor),
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    return schemas.DbObjectList(
+    if not requested_fields or "size_pretty" in requested_fields:
+        add_size_pretty(object_rows)
+
+    return list_response({
+        "db_id": db_id,
+        "snapshot_id": latest_snapshot.id,
+        "snapshot_time": latest_snapshot.snapshot_time,
+        "objects": object_rows,
+        "next_cursor": encode_cursor(next_key),
+    })
+
+
+@router.get("/objects/{db_id}/growth", response_model=schemas.ObjectGrowthList)
+async def get_object_growth(
+    *,
+    db: Session = Depends(deps.get_db),
+    db_id: int,
+    sort_by: crud.monitoring.ObjectGrowthSortBy = Query(
+        crud.monitoring.ObjectGrowthSortBy.bytes_per_day, description="Field to rank objects by"
+    ),
+    object_type: Optional[str] = Query(None, description="Only objects of this type (table, index, ...)"),
+    limit: int = Query(20, description="Maximum number of objects to return", ge=1, le=1000)
+) -> Any:
+    """
+    Get the fastest-growing objects of a database: growth rates fitted by least squares
+    over the snapshot size history, with projected sizes in 30 and 90 days.
+    Forecasts are refreshed by a scheduled job.
+    """
+    objects, computed_at = crud.monitoring.get_object_growth(
+        db=db,
         db_id=db_id,
-        snapshot_id=latest_snapshot.id,
-        snapshot_time=latest_snapshot.snapshot_time,
-        objects=db_objects
+        sort_by=sort_by,
+        object_type=object_type,
+        limit=limit
     )
+    return list_response({
+        "db_id": db_id,
+        "computed_at": computed_at,
+        "sort_by": sort_by.value,
+        "objects": objects,
+    })
 
 
 @router.get("/locks/{db_id}/latest", response_model=schemas.LockList)
@@ -155,12 +331,17 @@ async def get_latest_locks(
     *,
     db: Session = Depends(deps.get_db),
     db_id: int,
-    # Add Query parameters for filtering/sorting if needed later
-    # e.g., granted_only: bool = Query(False, description="Only show granted locks"),
-    # e.g., sort_by: Optional[str] = Query(None, description="Field to sort locks by")
+    granted: Optional[bool] = Query(None, description="Only held (true) or awaited (false) locks"),
+    pid: Optional[int] = Query(None, description="Only locks of this backend pid"),
+    fields: Optional[str] = Query(None, description="Comma separated list of lock fields to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    limit: Optional[int] = Query(None, description="Page size; all locks are returned if omitted", ge=1, le=5000)
 ) -> Any:
     """
     Get lock information from the latest snapshot for a specific database.
+    Supports keyset pagination ordered by pid, filters and field projection.
+    In adaptive collection mode, rows are only stored while sessions wait on locks;
+    see /locks/{db_id}/summary for the per-mode counts of every snapshot.
     """
     latest_snapshot = crud.monitoring.get_latest_snapshot(db=db, db_id=db_id)
 
@@ -170,21 +351,187 @@ async def get_latest_locks(
             detail=f"No snapshot found for database ID {db_id}"
         )
 
-    # Placeholder for the actual CRUD function call
-    # This function needs to be implemented in crud/crud_monitoring.py
-    lock_details = crud.monitoring.get_locks_by_snapshot(
-        db=db,
-        snapshot_id=latest_snapshot.id,
-        # Pass any filter/sort parameters here
-    )
+    try:
+        lock_rows, next_key = crud.monitoring.get_lock_rows_by_snapshot(
+            db=db,
+            snapshot_id=latest_snapshot.id,
+            granted=granted,
+            pid=pid,
+            fields=parse_fields(fields, crud.monitoring.LOCK_FIELDS),
+            after=decode_cursor(cursor),
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return list_response({
+        "db_id": db_id,
+        "snapshot_id": latest_snapshot.id,
+        "snapshot_time": latest_snapshot.snapshot_time,
+        "locks": oid_name_cache.annotate(db_id, lock_rows, LOCK_NAME_COLUMNS),
+        "next_cursor": encode_cursor(next_key),
+    })
+
+@router.get("/locks/{db_id}/summary", response_model=schemas.LockSummaryList)
+async def get_latest_lock_summary(
+    *,
+    db: Session = Depends(deps.get_db),
+    db_id: int,
+) -> Any:
+    """
+    Get lock counts by locktype, mode and granted from the latest snapshot.
+    Collected every snapshot, including those without stored lock rows.
+    """
+    latest_snapshot = crud.monitoring.get_latest_snapshot(db=db, db_id=db_id)
+
+    if not latest_snapshot:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No snapshot found for database ID {db_id}"
+        )
+
+    summary_rows = crud.monitoring.get_lock_summary_by_snapshot(db=db, snapshot_id=latest_snapshot.id)
+
+    return list_response({
+        "db_id": db_id,
+        "snapshot_id": latest_snapshot.id,
+        "snapshot_time": latest_snapshot.snapshot_time,
+        "total_locks": sum(row["lock_count"] for row in summary_rows),
+        "waiting_locks": sum(row["lock_count"] for row in summary_rows if row["granted"] is False),
+        "summary": summary_rows,
+    })
+
+@router.get("/locks/{db_id}/tree", response_model=schemas.LockTree)
+async def get_latest_lock_tree(
+    *,
+    db: Session = Depends(deps.get_db),
+    db_id: int,
+) -> Any:
+    """
+    Get who-blocks-whom from the latest snapshot: blocking roots, chain depth,
+    transitively blocked session counts and wait-for cycles. Computed at collection time.
+    """
+    latest_snapshot = crud.monitoring.get_latest_snapshot(db=db, db_id=db_id)
+
+    if not latest_snapshot:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No snapshot found for database ID {db_id}"
+        )
 
-    # This schema (LockList and LockDetail) needs to be defined in schemas/monitoring.py
-    return schemas.LockList(
+    blocking_tree = crud.monitoring.get_blocking_tree_by_snapshot(db=db, snapshot_id=latest_snapshot.id)
+    tree = blocking_tree.tree if blocking_tree else {}
+
+    return list_response({
+        "db_id": db_id,
+        "snapshot_id": latest_snapshot.id,
+        "snapshot_time": latest_snapshot.snapshot_time,
+        "blocked_sessions": tree.get("blocked_sessions", 0),
+        "max_depth": tree.get("max_depth", 0),
+        "roots": tree.get("roots", []),
+        "nodes": tree.get("nodes", []),
+        "cycles": tree.get("cycles", []),
+    })
+
+@router.get("/waits/{db_id}/heatmap", response_model=schemas.WaitEventHeatmap)
+async def get_wait_event_heatmap(
+    *,
+    db: Session = Depends(deps.get_db),
+    db_id: int,
+    start_time: datetime = Query(..., alias="start", description="Start of the range (ISO 8601)"),
+    end_time: datetime = Query(..., alias="end", description="End of the range (ISO 8601)"),
+    bucket_minutes: Optional[int] = Query(
+        None, description="Bucket width in minutes, a multiple of the stored bucket width (default: stored width)", ge=1
+    ),
+    wait_event_type: Optional[str] = Query(None, description="Only wait events of this type (e.g. Lock, IO, CPU)"),
+    limit: int = Query(20, description="Number of wait events, busiest first", ge=1, le=500)
+) -> Any:
+    """
+    Get a time x wait event matrix of session counts for non-idle sessions. Read from
+    histograms folded in at ingest, so a long range is a small indexed read.
+    """
+    stored_minutes = settings.WAIT_HISTOGRAM_BUCKET_MINUTES
+    bucket_minutes = bucket_minutes or stored_minutes
+    if bucket_minutes % stored_minutes:
+        raise HTTPException(status_code=400, detail=f"bucket_minutes must be a multiple of {stored_minutes}.")
+    if start_time >= end_time:
+        raise HTTPException(status_code=400, detail="start must be before end.")
+    if (end_time - start_time).total_seconds() / (bucket_minutes * 60) > settings.WAIT_HEATMAP_MAX_BUCKETS:
+        raise HTTPException(status_code=400, detail=f"Range spans more than {settings.WAIT_HEATMAP_MAX_BUCKETS} buckets; use a larger bucket_minutes.")
+
+    heatmap = crud.monitoring.get_wait_event_heatmap(
+        db=db,
         db_id=db_id,
-        snapshot_id=latest_snapshot.id,
-        snapshot_time=latest_snapshot.snapshot_time,
-        locks=lock_details # Assuming crud function returns a list compatible with LockDetail
+        start_time=start_time,
+        end_time=end_time,
+        bucket_minutes=bucket_minutes,
+        wait_event_type=wait_event_type,
+        limit=limit
     )
+    return list_response({"db_id": db_id, "bucket_minutes": bucket_minutes, **heatmap})
+
+
+def _snapshot_ref(snapshot: models.Snapshot) -> Dict[str, Any]:
+    return {
+        "id": snapshot.id,
+        "snapshot_time": snapshot.snapshot_time,
+        "load_state": snapshot.load_state,
+        "skipped_collectors": snapshot.skipped_collectors or [],
+    }
+
+@router.get("/{db_id}/diff", response_model=schemas.SnapshotDiff)
+async def get_snapshot_diff(
+    *,
+    db: Session = Depends(deps.get_db),
+    db_id: int,
+    from_time: datetime = Query(..., alias="from", description="Earlier point in time (ISO 8601); the last snapshot at or before it is used"),
+    to_time: datetime = Query(..., alias="to", description="Later point in time (ISO 8601); the last snapshot at or before it is used"),
+    limit: int = Query(100, description="Maximum rows per section, largest changes first", ge=1, le=5000)
+) -> Any:
+    """
+    Compare two snapshots: object size growth and added/dropped objects, sessions
+    that started or ended, lock changes, and statement counter deltas. The diff is
+    computed in the database, so only changed entities are returned.
+    """
+    if from_time >= to_time:
+        raise HTTPException(status_code=400, detail="from must be before to.")
+
+    from_snapshot = crud.monitoring.get_snapshot_at(db=db, db_id=db_id, moment=from_time)
+    to_snapshot = crud.monitoring.get_snapshot_at(db=db, db_id=db_id, moment=to_time)
+    if not from_snapshot or not to_snapshot:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No snapshot found for database ID {db_id} at or before {from_time if not from_snapshot else to_time}"
+        )
+
+    snapshot_ids = dict(from_snapshot_id=from_snapshot.id, to_snapshot_id=to_snapshot.id)
+    # A collector skipped under load in either snapshot has nothing to compare; its sections stay empty
+    skipped = set(from_snapshot.skipped_collectors or ()) | set(to_snapshot.skipped_collectors or ())
+    object_changes, objects, total_size_delta = {}, [], None
+    if "objects" not in skipped:
+        object_changes, objects, total_size_delta = crud.monitoring.diff_db_objects(db=db, limit=limit, **snapshot_ids)
+    session_changes, sessions = crud.monitoring.diff_sessions(db=db, limit=limit, **snapshot_ids)
+    lock_changes, locks = crud.monitoring.diff_locks(db=db, limit=limit, **snapshot_ids)
+    statement_changes, statements = {}, []
+    if "statements" not in skipped:
+        statement_changes, statements = crud.monitoring.diff_statements(db=db, limit=limit, **snapshot_ids)
+
+    return list_response({
+        "db_id": db_id,
+        "from_snapshot": _snapshot_ref(from_snapshot),
+        "to_snapshot": _snapshot_ref(to_snapshot),
+        "elapsed_seconds": (to_snapshot.snapshot_time - from_snapshot.snapshot_time).total_seconds(),
+        "object_changes": object_changes,
+        "objects": objects,
+        "total_size_delta": total_size_delta,
+        "session_changes": session_changes,
+        "sessions": sessions,
+        "lock_changes": lock_changes,
+        "locks": oid_name_cache.annotate(db_id, locks, LOCK_NAME_COLUMNS),
+        "lock_counts": crud.monitoring.diff_lock_counts(db=db, **snapshot_ids),
+        "statement_changes": statement_changes,
+        "statements": oid_name_cache.annotate(db_id, statements, STATEMENT_NAME_COLUMNS),
+    })
 
 @router.get("/objects/{db_id}/{schema_name}/{object_name}/details", response_model=Optional[schemas.monitoring.ObjectFullDetails])
 async def get_object_full_details_endpoint(
@@ -194,40 +541,27 @@ async def get_object_full_details_endpoint(
     schema_name: str,
     object_name: str,
     object_type: str, # Type of the object (table, view, index, etc.)
-    owner: Optional[str] = None # Owner might be passed from the client if already known
+    owner: Optional[str] = None # Accepted for compatibility; the catalog owner is returned
 ) -> Any:
     """
     Get comprehensive details for a specific database object (table, view, index, etc.).
+    Details are cached per monitored database and revalidated against catalog change markers.
     """
     db_conn_details_model = crud.connection.get_connection(db=app_db, connection_id=db_id)
     if not db_conn_details_model:
         raise HTTPException(status_code=404, detail=f"Monitored database with ID {db_id} not found.")
 
-    # Convert SQLAlchemy model to dict for asyncpg
-    db_conn_params = {
-        "host": db_conn_details_model.hostname,
-        "port": db_conn_details_model.port,
-        "user": db_conn_details_model.username,
-        "password": decrypt(db_conn_details_model.encrypted_password),
-        "database": db_conn_details_model.db_name,
-        "timeout": 10 # Connection timeout
-    }
-
-    conn = None
     try:
-        conn = await asyncpg.connect(**db_conn_params)
-        details = await object_details_service.get_object_full_details(
-            conn=conn, 
-            schema_name=schema_name, 
-            object_name=object_name, 
-            object_type=object_type,
-            owner=owner # Pass owner if provided by client (e.g. from the existing table row)
-        )
-        if not details:
-            # This case might mean the object wasn't found by the service function, 
-            # or an error occurred during detail fetching that was logged but returned None.
-            raise HTTPException(status_code=404, detail=f"{object_type.capitalize()} '{schema_name}.{object_name}' not found or details could not be fetched.")
-        return details
+        pool = await target_pools.get_pool_for_connection(db_conn_details_model)
+        async with pool.acquire() as conn:
+            # Served from cache unless the relation's catalog entries changed (DDL)
+            details = await object_details_cache.get_object_full_details(
+                db_id=db_id,
+                conn=conn, 
+                schema_name=schema_name, 
+                object_name=object_name, 
+                object_type=object_type
+            )
     except asyncpg.PostgresError as e:
         # Handle specific database connection or query errors
         raise HTTPException(status_code=503, detail=f"Database error when connecting to or querying monitored DB: {e}")
@@ -235,9 +569,18 @@ async def get_object_full_details_endpoint(
         # Handle other unexpected errors
         # Log the error for debugging: logger.error(f"Error fetching object details: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {e}")
-    finally:
-        if conn:
-            await conn.close()
+
+    if not details:
+        # The object no longer exists in the monitored database
+        raise HTTPException(status_code=404, detail=f"{object_type.capitalize()} '{schema_name}.{object_name}' not found.")
+    return details
+
+@router.get("/cache/object-details/stats", response_model=schemas.monitoring.ObjectDetailsCacheStats)
+async def get_object_details_cache_stats() -> Any:
+    """
+    Hit/miss/invalidation/eviction counters of the object details cache.
+    """
+    return object_details_cache.stats()
 
 # New endpoint for fetching row count specifically
 @router.get("/objects/{db_id}/{schema_name}/{object_name}/rowcount", response_model=Optional[schemas.monitoring.ObjectRowCount]) # Define ObjectRowCount in schemas
@@ -247,43 +590,101 @@ async def get_object_row_count_endpoint(
     db_id: int,
     schema_name: str,
     object_name: str,
+    precision: object_details_service.RowCountPrecision = Query(
+        object_details_service.RowCountPrecision.estimate,
+        description="'estimate' reads planner statistics instantly; 'exact' runs COUNT(*) under statement_timeout"
+    ),
     # No object_type needed as this is specifically for tables/views that support row counts
 ) -> Any:
     """
     Get the row count for a specific database object (table, materialized view).
+    Defaults to a statistics-based estimate; `precision=exact` scans the table.
     """
     db_conn_details_model = crud.connection.get_connection(db=app_db, connection_id=db_id)
     if not db_conn_details_model:
         raise HTTPException(status_code=404, detail=f"Monitored database with ID {db_id} not found.")
 
-    db_conn_params = {
-        "host": db_conn_details_model.hostname,
-        "port": db_conn_details_model.port,
-        "user": db_conn_details_model.username,
-        "password": decrypt(db_conn_details_model.encrypted_password),
-        "database": db_conn_details_model.db_name,
-        "timeout": 10
-    }
-
-    conn = None
     try:
-        conn = await asyncpg.connect(**db_conn_params)
-        # Assuming object_details_service.get_row_count handles tables/views correctly
-        row_count = await object_details_service.get_row_count(
-            conn=conn, 
-            schema_name=schema_name, 
-            table_name=object_name # Parameter name in get_row_count is table_name
+        pool = await target_pools.get_pool_for_connection(db_conn_details_model)
+        async with pool.acquire() as conn:
+            if precision == object_details_service.RowCountPrecision.estimate:
+                estimate = await object_details_service.get_row_count_estimate(
+                    conn=conn,
+                    schema_name=schema_name,
+                    table_name=object_name
+                )
+                if estimate is None:
+                    raise HTTPException(status_code=404, detail=f"Object '{schema_name}.{object_name}' not found.")
+                return estimate
+
+            row_count = await object_details_service.get_row_count(
+                conn=conn, 
+                schema_name=schema_name, 
+                table_name=object_name, # Parameter name in get_row_count is table_name
+                timeout_ms=settings.ROW_COUNT_EXACT_TIMEOUT_MS
+            )
+        return schemas.monitoring.ObjectRowCount(row_count=row_count, precision=precision, source="count")
+    except HTTPException:
+        raise
+    except asyncpg.QueryCanceledError:
+        raise HTTPException(
+            status_code=504,
+            detail=f"Exact row count exceeded {settings.ROW_COUNT_EXACT_TIMEOUT_MS} ms; use precision=estimate."
         )
-        # The schema ObjectRowCount will simply be { "row_count": Optional[int] }
-        return schemas.monitoring.ObjectRowCount(row_count=row_count)
     except asyncpg.PostgresError as e:
         # Log specific pg error: logger.error(f"DB error fetching row count for {schema_name}.{object_name}: {e}", exc_info=True)
         raise HTTPException(status_code=503, detail=f"Database error when fetching row count: {e}")
     except Exception as e:
         # Log general error: logger.error(f"Error fetching row count for {schema_name}.{object_name}: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred while fetching row count: {e}")
-    finally:
-        if conn:
-            await conn.close()
+
+@router.post("/objects/{db_id}/{schema_name}/{object_name}/rowcount/jobs", response_model=schemas.monitoring.RowCountJob, status_code=202)
+async def submit_row_count_job(
+    *,
+    app_db: Session = Depends(deps.get_db),
+    db_id: int,
+    schema_name: str,
+    object_name: str,
+    max_age_seconds: Optional[int] = Query(None, description="Reuse a cached exact count not older than this", ge=0)
+) -> Any:
+    """
+    Start a background exact row count. Concurrent requests for the same table join the running job.
+    Poll `/rowcount/jobs/{job_id}` for the result.
+    """
+    db_conn_details_model = crud.connection.get_connection(db=app_db, connection_id=db_id)
+    if not db_conn_details_model:
+        raise HTTPException(status_code=404, detail=f"Monitored database with ID {db_id} not found.")
+
+    pool = await target_pools.get_pool_for_connection(db_conn_details_model)
+    job = row_count_jobs.submit(
+        pool=pool,
+        db_id=db_id,
+        schema_name=schema_name,
+        object_name=object_name,
+        max_age_seconds=max_age_seconds
+    )
+    return job.to_schema()
+
+
+@router.get("/rowcount/jobs/{job_id}", response_model=schemas.monitoring.RowCountJob)
+async def get_row_count_job(job_id: str) -> Any:
+    """
+    Get the status (and, once finished, the result) of a background row count job.
+    """
+    job = row_count_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Row count job {job_id} not found.")
+    return job.to_schema()
+
+
+@router.delete("/rowcount/jobs/{job_id}", response_model=schemas.monitoring.RowCountJob)
+async def cancel_row_count_job(job_id: str) -> Any:
+    """
+    Cancel a pending or running row count job (running scans are cancelled on the server).
+    """
+    job = await row_count_jobs.cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Row count job {job_id} not found.")
+    return job.to_schema()
 
 # Add other monitoring-related endpoints here as needed... 
\ No newline at end of file
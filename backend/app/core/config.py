@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 from pydantic_settings import BaseSettings
 from pydantic import PostgresDsn
 
@@ -12,9 +12,94 @@ class Settings(BaseSettings):
     # CORS settings
     CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:80"]
     
+    # Response settings
+    GZIP_MINIMUM_SIZE: int = 1024 # Bytes; smaller responses are sent uncompressed
+
+    # Per-request profiling: a request carrying this token (X-Profile header or ?profile=)
+    # is sampled and answered with its collapsed stacks instead of the response. None disables it
+    PROFILING_TOKEN: Optional[str] = None
+    PROFILING_INTERVAL_MS: float = 2.0 # Sampling interval of the per-request profiler
+
     # Scheduler settings
     SNAPSHOT_INTERVAL_MINUTES: int = 5 # Default interval in minutes
+
+    # Background startup (app/startup.py), after the server is already accepting requests
+    STARTUP_INITIAL_SNAPSHOT: bool = True # Collect from every target as soon as the scheduler is up
+    STARTUP_WARM_TARGET_POOLS: bool = True # Open one connection per target pool
+    STARTUP_WARM_CONCURRENCY: int = 16 # Target pools connected at a time while warming
     
+    # Readiness thresholds (/api/v1/health/ready): past these the instance reports not ready
+    HEALTH_DB_LATENCY_MAX_MS: float = 500.0 # Monitoring database SELECT 1 round trip
+    HEALTH_MAX_COLLECTOR_QUEUE: int = 100 # Snapshots pending in the scheduler plus running
+    HEALTH_MAX_POOL_SATURATION: float = 0.9 # In-use share of all target pool connections
+    HEALTH_SNAPSHOT_LAG_INTERVALS: float = 3.0 # A target is stale after this many snapshot intervals without one
+
+    # Circuit breaker for unreachable targets (app/services/target_health.py)
+    TARGET_BREAKER_FAILURE_THRESHOLD: int = 3 # Consecutive failed connects before a target is skipped
+    TARGET_BREAKER_BACKOFF_BASE_SECONDS: float = 300.0 # First backoff; doubles each time the target fails its probe
+    TARGET_BREAKER_BACKOFF_MAX_SECONDS: float = 3600.0
+
+    # Load-adaptive collection (app/services/collection_throttle.py): under pressure the heavy
+    # collectors (pg_stat_statements, object sizes) are skipped or run less often
+    THROTTLE_ENABLED: bool = True
+    THROTTLE_BACKENDS_RATIO: float = 0.9 # Client backends / max_connections counted as pressure
+    THROTTLE_ACTIVE_RATIO: float = 0.5 # Active backends / max_connections counted as pressure
+    THROTTLE_LATENCY_FACTOR: float = 3.0 # Pressure probe latency vs its baseline counted as pressure
+    THROTTLE_MIN_LATENCY_MS: float = 50.0 # ... but only when the probe takes at least this long
+    THROTTLE_HEAVY_EVERY: int = 4 # Under pressure, heavy collectors run every Nth snapshot (0 = never)
+
+    # Monitored database (target) connection pools
+    TARGET_POOL_MAX_SIZE: int = 4 # Connections per monitored database
+    TARGET_POOL_MAX_IDLE_SECONDS: float = 300.0 # Close pooled connections idle for longer
+    TARGET_APPLICATION_NAME: str = "pg_monitor" # application_name of our sessions on the targets
+
+    # Server-side limits on collector queries; a target's connection can override each of them
+    COLLECTOR_STATEMENT_TIMEOUT_MS: int = 5000 # statement_timeout of collectors not listed below
+    COLLECTOR_STATEMENT_TIMEOUTS_MS: Dict[str, int] = {"statements": 15000, "objects": 30000} # Per collector
+    COLLECTOR_LOCK_TIMEOUT_MS: int = 1000 # lock_timeout; catalog locks held by DDL fail fast instead of queueing
+    COLLECTOR_IDLE_IN_TRANSACTION_TIMEOUT_MS: int = 60000 # idle_in_transaction_session_timeout of pooled sessions
+
+    # Object details cache (entries per monitored database)
+    OBJECT_DETAILS_CACHE_SIZE: int = 512
+
+    # Exact row counts (precision=exact) are cancelled server-side after this long
+    ROW_COUNT_EXACT_TIMEOUT_MS: int = 30000
+
+    # Background exact row count jobs
+    ROW_COUNT_JOBS_PER_TARGET: int = 1 # Concurrent COUNT(*) scans per monitored database
+    ROW_COUNT_JOB_TIMEOUT_MS: int = 3600000 # statement_timeout for a background count
+    ROW_COUNT_JOB_RETENTION_SECONDS: int = 3600 # Keep finished jobs pollable this long
+
+    # Lock collection: "adaptive" stores per-mode counts every snapshot and lock rows only
+    # while sessions are waiting (restricted to the waits); "full" stores every pg_locks row
+    LOCK_COLLECTION_MODE: Literal["adaptive", "full"] = "adaptive"
+
+    # OID -> name cache (relations, roles, databases) per monitored database
+    OID_NAME_CACHE_TTL_SECONDS: int = 600 # Names are re-read after this long (renames, OID reuse)
+
+    # Statement regression detection at ingest (EWMA baselines per statement)
+    REGRESSION_EWMA_ALPHA: float = 0.3 # Weight of the newest interval in the baselines
+    REGRESSION_LATENCY_FACTOR: float = 3.0 # Flag when interval mean latency reaches this multiple of its baseline
+    REGRESSION_RATE_FACTOR: float = 3.0 # Flag when calls/sec reaches this multiple of its baseline
+    REGRESSION_MIN_SAMPLES: int = 3 # Intervals needed before a statement's baseline is trusted
+    REGRESSION_MIN_CALLS: int = 5 # Ignore intervals with fewer calls (too noisy)
+    REGRESSION_TOP_N: int = 5 # "New top consumer" = entered the top N by interval execution time
+
+    # Hourly statement rollups (statement_stats_hourly) and the time window top-N endpoint
+    STATEMENT_ROLLUP_INTERVAL_MINUTES: int = 15 # How often completed hours are rolled up
+    STATEMENT_ROLLUP_LOOKBACK_MINUTES: int = 120 # How far back to look for the sample preceding an hour
+    STATEMENT_ROLLUP_MAX_HOURS_PER_RUN: int = 48 # Catch-up limit per database and run
+    STATEMENT_TOP_ROLLUP_MIN_HOURS: int = 6 # Windows at least this long read full hours from the rollups
+
+    # Object growth forecasts (object_growth)
+    GROWTH_FORECAST_INTERVAL_MINUTES: int = 60 # How often growth rates are refitted
+    GROWTH_FORECAST_WINDOW_DAYS: int = 14 # Size history used for the fit
+    GROWTH_FORECAST_MIN_SAMPLES: int = 3 # Objects with fewer snapshots in the window are not forecast
+
+    # Wait-event histograms (wait_event_histograms), folded in at ingest
+    WAIT_HISTOGRAM_BUCKET_MINUTES: int = 15 # Width of a stored bucket; heatmaps can only be coarser
+    WAIT_HEATMAP_MAX_BUCKETS: int = 2000 # Largest heatmap (columns) one request may ask for
+
     # Database settings
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
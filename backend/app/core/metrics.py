@@ -0,0 +1,181 @@
+# backend/app/core/metrics.py
+"""
+In-process metrics registry rendered in the Prometheus text exposition format
+(served at /metrics).
+
+Recording is a dict lookup on the label values plus a bisect into fixed bucket
+bounds under an uncontended lock, so it is cheap enough for every collector
+query and API request. Label values are positional, in the order of the
+metric's `labelnames`.
+"""
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+# Latency buckets in seconds: sub-millisecond catalog reads up to minute-long snapshots
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000, 1000000)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labelvalues: Sequence[object]) -> Tuple[str, ...]:
+        if len(labelvalues) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labelvalues}")
+        return tuple(str(value) for value in labelvalues)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: object, amount: float = 1) -> None:
+        key = self._key(labelvalues)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, *labelvalues: object) -> float:
+        return self._values.get(self._key(labelvalues), 0)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [count per bucket (last one is +Inf, not cumulative), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labelvalues: object) -> None:
+        key = self._key(labelvalues)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, *labelvalues: object) -> int:
+        series = self._series.get(self._key(labelvalues))
+        return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            items = sorted((key, (list(series[0]), series[1])) for key, series in self._series.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# --- Collector ---
+COLLECTOR_QUERY_SECONDS = registry.histogram(
+    "pgmon_collector_query_seconds", "Latency of collector queries against monitored databases.", ("target", "collector"))
+COLLECTOR_ROWS_FETCHED = registry.histogram(
+    "pgmon_collector_rows_fetched", "Rows returned by one collector query.", ("target", "collector"), buckets=ROW_BUCKETS)
+COLLECTOR_FAILURES = registry.counter(
+    "pgmon_collector_failures_total", "Collector failures by stage and exception type.", ("target", "stage", "exception"))
+COLLECTOR_TIMEOUTS = registry.counter(
+    "pgmon_collector_timeouts_total", "Collector queries cancelled by statement_timeout or lock_timeout.", ("target", "collector", "timeout"))
+COLLECTOR_SKIPPED = registry.counter(
+    "pgmon_collector_skipped_total", "Snapshots not attempted, by reason (e.g. backoff).", ("target", "reason"))
+COLLECTOR_THROTTLED = registry.counter(
+    "pgmon_collector_throttled_total", "Heavy collectors skipped because the target was under pressure.", ("target", "collector"))
+POOL_ACQUIRE_SECONDS = registry.histogram(
+    "pgmon_pool_acquire_seconds", "Time spent waiting for a connection from a target pool.", ("target",))
+SNAPSHOT_INGEST_SECONDS = registry.histogram(
+    "pgmon_snapshot_ingest_seconds", "Time to build a snapshot's rows in the application database session.", ("target",))
+SNAPSHOT_COMMIT_SECONDS = registry.histogram(
+    "pgmon_snapshot_commit_seconds", "Time to commit a snapshot to the application database.", ("target",))
+SNAPSHOT_DURATION_SECONDS = registry.histogram(
+    "pgmon_snapshot_duration_seconds", "End-to-end snapshot latency, from pool acquire to commit.", ("target",))
+SNAPSHOT_OVERRUNS = registry.counter(
+    "pgmon_snapshot_overruns_total", "Snapshots that took longer than the snapshot interval.", ("target",))
+
+# --- Scheduler ---
+SCHEDULER_LAG_SECONDS = registry.histogram(
+    "pgmon_scheduler_lag_seconds", "Delay between a job's scheduled run time and its submission.", ("job",))
+SCHEDULER_JOB_OVERRUNS = registry.counter(
+    "pgmon_scheduler_job_overruns_total", "Job runs skipped because earlier runs were still going.", ("job",))
+SCHEDULER_JOB_MISSED = registry.counter(
+    "pgmon_scheduler_job_missed_total", "Job runs missed by more than their grace time.", ("job",))
+SCHEDULER_JOB_FAILURES = registry.counter(
+    "pgmon_scheduler_job_failures_total", "Jobs that raised, by exception type.", ("job", "exception"))
+
+# --- API ---
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "pgmon_http_request_seconds", "API request latency by route template.", ("method", "route", "status"))
+HTTP_REQUEST_PHASE_SECONDS = registry.histogram(
+    "pgmon_http_request_phase_seconds", "Time per request phase (db, serialize, app) by route template.", ("route", "phase"))
@@ -0,0 +1,65 @@
+# backend/app/core/profiling.py
+"""
+Opt-in sampling profiler for single API requests (see ProfilingMiddleware).
+
+A background thread snapshots the stacks of every other thread with
+sys._current_frames() at a fixed interval, so nothing is instrumented and the
+profiled code runs at full speed between samples. Samples are aggregated into
+the collapsed stack format ("thread;outer;...;inner count" per line) read by
+flamegraph.pl, speedscope and inferno. Sync endpoints run in the threadpool,
+so all threads are sampled; idle threads parked in the event loop selector or
+a queue wait are dropped.
+"""
+import os
+import sys
+import threading
+from collections import Counter
+from typing import Dict, Optional
+
+# Innermost frames of threads with nothing to do
+_IDLE_FUNCTIONS = {"select", "poll", "epoll", "wait", "_worker", "get"}
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    def __init__(self, interval_seconds: float = 0.002):
+        self.interval_seconds = interval_seconds
+        self.samples = 0
+        self._stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        own = threading.get_ident()
+        names: Dict[int, str] = {}
+        while not self._stop.wait(self.interval_seconds):
+            frames = sys._current_frames()
+            if len(names) != len(frames):
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in frames.items():
+                if ident == own or frame.f_code.co_name in _IDLE_FUNCTIONS:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self._stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._sample, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def collapsed(self) -> str:
+        """Collapsed stacks, heaviest first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
@@ -0,0 +1,112 @@
+import hashlib
+import re
+from functools import lru_cache
+from typing import Optional
+
+# One pass over the SQL text. Order matters: comments and quoted tokens first so
+# their contents are never mistaken for numbers or keywords.
+_TOKEN_RE = re.compile(
+    r"""
+      (?P<comment>--[^\n]*|/\*.*?\*/)
+    | (?P<dollar>\$(?P<tag>[A-Za-z_][A-Za-z0-9_]*|)\$.*?\$(?P=tag)\$)
+    | (?P<string>[EeBbXxNnUu]?'(?:[^']|'')*')
+    | (?P<ident>"(?:[^"]|"")*")
+    | (?P<param>\$\d+)
+    | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    | (?P<word>[A-Za-z_\u0080-￿][A-Za-z0-9_$\u0080-￿]*)
+    | (?P<space>\s+)
+    | (?P<other>.)
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+
+# Literal lists whose length should not change the query shape
+_IN_LIST_RE = re.compile(r"\bin\(\?(?:,\?)+\)")
+_ARRAY_LIST_RE = re.compile(r"\barray\[\?(?:,\?)+\]")
+_VALUES_LIST_RE = re.compile(r"\bvalues(\(\?(?:,\?)*\))(?:,\(\?(?:,\?)*\))+")
+
+_LITERAL_GROUPS = frozenset(("dollar", "string", "param", "number"))
+
+# Words after which a minus can only be a sign; after any other word (an
+# identifier) it is a subtraction
+_KEYWORDS_BEFORE_SIGN = frozenset((
+    "select", "where", "and", "or", "not", "when", "then", "else", "between",
+    "in", "is", "like", "limit", "offset", "values", "return", "by", "having",
+))
+
+
+def normalize_query(query: str) -> str:
+    """
+    Reduces SQL text to its shape: literals and $n parameters become `?`,
+    comments are dropped, unquoted words are lowercased, whitespace is made
+    canonical, and IN (...), ARRAY[...] and multi-row VALUES lists collapse to
+    one element. Literal SQL from pg_stat_activity and the parameterized text
+    of pg_stat_statements normalize to the same string.
+    """
+    tokens = []
+    kinds = []
+    for match in _TOKEN_RE.finditer(query):
+        kind = match.lastgroup
+        if kind in ("comment", "space"):
+            continue
+        if kind == "number" and tokens and tokens[-1] == "-" and _is_sign(tokens[:-1], kinds[:-1]):
+            # pg_stat_statements replaces a negative constant, sign included, with one $n
+            tokens.pop()
+            kinds.pop()
+        kinds.append(kind)
+        if kind in _LITERAL_GROUPS:
+            tokens.append("?")
+        elif kind == "word":
+            tokens.append(match.group().lower())
+        else:
+            tokens.append(match.group())
+
+    # A space only where two word-like tokens would otherwise run together
+    parts = []
+    previous_wordlike = False
+    for token in tokens:
+        wordlike = token[0].isalnum() or token[0] in '_?"' or ord(token[0]) > 127
+        if wordlike and previous_wordlike:
+            parts.append(" ")
+        parts.append(token)
+        previous_wordlike = wordlike
+    normalized = "".join(parts).rstrip(";")
+
+    normalized = _IN_LIST_RE.sub("in(?)", normalized)
+    normalized = _ARRAY_LIST_RE.sub("array[?]", normalized)
+    return _VALUES_LIST_RE.sub(r"values\1", normalized)
+
+
+def _is_sign(tokens, kinds) -> bool:
+    """Whether a minus following these tokens is unary rather than binary."""
+    if not tokens:
+        return True
+    if kinds[-1] == "other":
+        return tokens[-1] not in (")", "]")
+    return kinds[-1] == "word" and tokens[-1] in _KEYWORDS_BEFORE_SIGN
+
+
+@lru_cache(maxsize=16384)
+def fingerprint_query(query: Optional[str]) -> Optional[int]:
+    """
+    Returns a 64-bit fingerprint (signed, fits a BIGINT column) of the query's
+    normalized shape, or None for an empty query.
+
+    Memoized on the raw text: the same statements show up snapshot after
+    snapshot, so the normalizer runs once per distinct text.
+    """
+    if not query or not query.strip():
+        return None
+    digest = hashlib.blake2b(normalize_query(query).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+if __name__ == '__main__':
+    for sample in (
+        "SELECT * FROM users WHERE id = 42",
+        "select *\n  from USERS where id=$1 -- by id",
+        "SELECT * FROM t WHERE status IN ('a', 'b', 'c') AND note = E'it''s'",
+        "INSERT INTO t (a, b) VALUES (1, 'x'), (2, 'y'), (3, 'z');",
+        "SELECT \"Mixed\".id FROM \"Mixed\" WHERE x = ANY(ARRAY[1,2,3])",
+    ):
+        print(f"{fingerprint_query(sample):>20}  {normalize_query(sample)}")
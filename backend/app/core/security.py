@@ -1,10 +1,7 @@
 import os
 import base64
-from cryptography.fernet import Fernet, InvalidToken
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from functools import lru_cache
+from typing import Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,31 +11,40 @@ logger = logging.getLogger(__name__)
 # Ensure this key is strong and kept secret!
 # Generate one using: Fernet.generate_key()
 SECRET_KEY_ENV_VAR = "ENCRYPTION_KEY"
-ENCRYPTION_KEY = os.getenv(SECRET_KEY_ENV_VAR)
 
-if not ENCRYPTION_KEY:
-    logger.error(f"CRITICAL: Environment variable '{SECRET_KEY_ENV_VAR}' not set. Password encryption/decryption will fail.")
-    # In a real app, you might raise an exception here to prevent startup
-    # For now, we'll let it proceed but log the error.
-    # raise ValueError(f"Environment variable '{SECRET_KEY_ENV_VAR}' is required.")
-    derived_key = None # Set key to None if env var is missing
-else:
+
+@lru_cache(maxsize=1)
+def _derived_key() -> Optional[bytes]:
+    """
+    Reads and validates ENCRYPTION_KEY on first use rather than at import, so
+    importing the app does no key handling (and a missing key is reported when
+    a password is first encrypted or decrypted).
+    """
+    encryption_key = os.getenv(SECRET_KEY_ENV_VAR)
+    if not encryption_key:
+        logger.error(f"CRITICAL: Environment variable '{SECRET_KEY_ENV_VAR}' not set. Password encryption/decryption will fail.")
+        # In a real app, you might raise an exception here to prevent startup
+        # For now, we'll let it proceed but log the error.
+        return None # Key is None if env var is missing
     try:
         # Ensure the key is URL-safe base64 encoded
-        key_bytes = base64.urlsafe_b64decode(ENCRYPTION_KEY)
+        key_bytes = base64.urlsafe_b64decode(encryption_key)
         if len(key_bytes) != 32:
              raise ValueError("ENCRYPTION_KEY must be a 32-byte URL-safe base64 encoded string.")
         # Use the key directly for AESGCM
-        derived_key = key_bytes
         logger.info("Successfully loaded encryption key.")
+        return key_bytes
     except (ValueError, TypeError) as e:
         logger.error(f"CRITICAL: Invalid ENCRYPTION_KEY format: {e}. Must be 32-byte URL-safe base64 encoded.")
-        derived_key = None
+        return None
 
 # --- Encryption/Decryption Functions --- 
 
 def encrypt(plaintext: str) -> str | None:
     """Encrypts plaintext using AES-GCM and returns base64 encoded ciphertext + nonce."""
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+    derived_key = _derived_key()
     logger.debug(f"Attempting encryption. Key available: {derived_key is not None}")
     if derived_key is None:
         logger.error("Encryption cannot proceed: Encryption key is not available.")
@@ -61,6 +67,10 @@ def encrypt(plaintext: str) -> str | None:
 
 def decrypt(encrypted_data: str) -> str | None:
     """Decrypts base64 encoded ciphertext + nonce using AES-GCM."""
+    from cryptography.exceptions import InvalidTag
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+    derived_key = _derived_key()
     if derived_key is None:
         logger.error("Decryption cannot proceed: Encryption key is not available.")
         return None
@@ -77,7 +87,7 @@ def decrypt(encrypted_data: str) -> str | None:
         
         plaintext_bytes = aesgcm.decrypt(nonce, ciphertext_bytes, None) # No associated data
         return plaintext_bytes.decode('utf-8')
-    except InvalidToken:
+    except InvalidTag:
         logger.error("Decryption failed: Invalid token or incorrect key.")
         return None
     except Exception as e:
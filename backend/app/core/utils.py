@@ -1,33 +1,41 @@
-import math
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Optional
 
+_SIZE_NAMES = ("Bytes", "KiB", "MiB", "GiB", "TiB", "PiB", "EiB", "ZiB", "YiB")
+
+
+@lru_cache(maxsize=8192)
 def format_bytes_to_pretty_str(size_bytes: Optional[int]) -> Optional[str]:
     """
     Converts a size in bytes to a human-readable string format (e.g., 1.2 MiB).
     Returns None if the input is None.
     Returns '0 Bytes' if the input is 0.
+
+    Memoized: object lists repeat the same page-aligned sizes over and over,
+    so most calls are a dictionary lookup.
     """
     if size_bytes is None:
         return None
-    if size_bytes == 0:
+    # Prevent log of negative by treating it as 0
+    if size_bytes <= 0:
         return "0 Bytes"
 
-    size_name = ("Bytes", "KiB", "MiB", "GiB", "TiB", "PiB", "EiB", "ZiB", "YiB")
-    # Prevent log(0) or log of negative by returning '0 Bytes' or handling negative as error/abs value
-    if size_bytes < 0: # Or handle as an error, for now, let's treat as 0 or abs.
-        # For simplicity, let's return as if it's 0, or you could raise ValueError
-        return "0 Bytes" # Or format_bytes_to_pretty_str(abs(size_bytes))
-
-    i = int(math.floor(math.log(size_bytes, 1024))) if size_bytes > 0 else 0
+    # Exponent of 1024 from the bit length instead of math.log (exact at unit boundaries)
+    i = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_NAMES) - 1)
 
+    if i == 0: # For Bytes, display as integer without decimal point
+        return f"{int(size_bytes)} {_SIZE_NAMES[i]}" # Display exact bytes for the 'Bytes' unit
+    return f"{round(size_bytes / (1 << (10 * i)), 1)} {_SIZE_NAMES[i]}"
 
-    p = math.pow(1024, i)
-    s = round(size_bytes / p, 1)
+def floor_to_hour(moment: datetime) -> datetime:
+    """Truncates a datetime to the start of its hour (keeps tzinfo)."""
+    return moment.replace(minute=0, second=0, microsecond=0)
 
-    if i == 0: # For Bytes, display as integer without decimal point
-        return f"{int(size_bytes)} {size_name[i]}" # Display exact bytes for the 'Bytes' unit
-    else:
-        return f"{s} {size_name[i]}"
+def floor_to_interval(moment: datetime, seconds: int) -> datetime:
+    """Truncates an aware datetime to a multiple of `seconds` since the Unix epoch."""
+    epoch = moment.timestamp()
+    return datetime.fromtimestamp(epoch - epoch % seconds, tz=moment.tzinfo or timezone.utc)
 
 if __name__ == '__main__':
     # Test cases
@@ -40,6 +40,9 @@ def create_connection(db: Session, connection: ConnectionCreate) -> Connection:
         port=connection.port,
         username=connection.username,
         db_name=connection.db_name,
+        statement_timeout_ms=connection.statement_timeout_ms,
+        lock_timeout_ms=connection.lock_timeout_ms,
+        idle_in_transaction_timeout_ms=connection.idle_in_transaction_timeout_ms,
         # Store the hashed password using the correct model attribute name
         # hashed_password=hashed_password_val
         encrypted_password=encrypted_password_val # Use correct model attribute
@@ -1,10 +1,12 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, select, desc
-from datetime import datetime, timedelta
-from typing import Optional, List
+from sqlalchemy import func, select, desc, and_, or_, tuple_, case, cast, literal, union_all, BigInteger, Float, String
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, List, Sequence, Tuple
 from enum import Enum
 
 from app import models, schemas
+from app.core.config import settings
+from app.core.utils import floor_to_hour, floor_to_interval
 
 def get_activity_timeseries_data(
     db: Session,
@@ -55,25 +57,152 @@ def get_activity_timeseries_data(
     return data_points
 
 
-def get_latest_snapshot(db: Session, db_id: int) -> Optional[models.Snapshot]:
-    """Fetches the most recent snapshot for a given database ID."""
+def _snapshots_with(query, collector: Optional[str]):
+    """Restricts a Snapshot query to snapshots in which `collector` ran (it can be throttled)."""
+    if collector is None:
+        return query
+    return query.filter(or_(
+        models.Snapshot.skipped_collectors.is_(None),
+        ~models.Snapshot.skipped_collectors.any(collector)
+    ))
+
+def get_latest_snapshot(db: Session, db_id: int, collector: Optional[str] = None) -> Optional[models.Snapshot]:
+    """
+    Fetches the most recent snapshot for a given database ID; with `collector`,
+    the most recent one in which that collector ran.
+    """
     return (
-        db.query(models.Snapshot)
+        _snapshots_with(db.query(models.Snapshot), collector)
         .filter(models.Snapshot.database_id == db_id)
         .order_by(models.Snapshot.snapshot_time.desc())
         .first()
     )
 
-def get_session_details_by_snapshot(
-    db: Session,
-    snapshot_id: int
-) -> List[models.SessionActivity]:
-    """Fetches all session activity records for a specific snapshot ID."""
+def get_snapshot_at(db: Session, db_id: int, moment: datetime, collector: Optional[str] = None) -> Optional[models.Snapshot]:
+    """Fetches the last snapshot taken at or before `moment` for a given database ID (see get_latest_snapshot)."""
     return (
-        db.query(models.SessionActivity)
-        .filter(models.SessionActivity.snapshot_id == snapshot_id)
-        .all()
+        _snapshots_with(db.query(models.Snapshot), collector)
+        .filter(models.Snapshot.database_id == db_id, models.Snapshot.snapshot_time <= moment)
+        .order_by(models.Snapshot.snapshot_time.desc())
+        .first()
+    )
+
+def _fetch_rows(db: Session, stmt) -> List[Dict[str, Any]]:
+    """Executes a column select and returns plain dicts built from the row tuples."""
+    result = db.execute(stmt)
+    keys = tuple(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+def _project_columns(columns: Sequence, fields: Optional[Sequence[str]], keyset: Sequence[str]) -> List:
+    """Columns for a `fields=` projection. Keyset columns are always included so a cursor can be built."""
+    if not fields:
+        return list(columns)
+    wanted = set(fields) | set(keyset)
+    return [column for column in columns if column.key in wanted]
+
+def _fetch_page(
+    db: Session,
+    stmt,
+    keyset: Sequence[str],
+    limit: Optional[int]
+) -> Tuple[List[Dict[str, Any]], Optional[Tuple[Any, ...]]]:
+    """Fetches one keyset page.
+
+    Reads one row past `limit` to learn whether another page exists without a COUNT.
+
+    Returns:
+        The rows and the keyset of the last row (None when this was the last page).
+    """
+    if limit is None:
+        return _fetch_rows(db, stmt), None
+    rows = _fetch_rows(db, stmt.limit(limit + 1))
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, tuple(rows[-1][key] for key in keyset)
+
+def _check_cursor(after: Optional[Sequence[Any]], model, keyset: Sequence[str]) -> None:
+    """Rejects a cursor whose values do not fit the keyset columns (a ValueError, answered with a 400)."""
+    if after is None:
+        return
+    if len(after) != len(keyset):
+        raise ValueError("Cursor does not match the requested sort order.")
+    for value, key in zip(after, keyset):
+        column = getattr(model, key).expression
+        if value is None:
+            if column.nullable:
+                continue
+        elif isinstance(value, column.type.python_type) and not isinstance(value, bool):
+            continue
+        raise ValueError(f"Invalid pagination cursor value for {key}.")
+
+
+SESSION_DETAIL_COLUMNS = (
+    models.SessionActivity.id,
+    models.SessionActivity.snapshot_id,
+    models.SessionActivity.datid,
+    models.SessionActivity.datname,
+    models.SessionActivity.pid,
+    models.SessionActivity.usesysid,
+    models.SessionActivity.usename,
+    models.SessionActivity.application_name,
+    models.SessionActivity.client_addr,
+    models.SessionActivity.client_hostname,
+    models.SessionActivity.client_port,
+    models.SessionActivity.backend_start,
+    models.SessionActivity.xact_start,
+    models.SessionActivity.query_start,
+    models.SessionActivity.state_change,
+    models.SessionActivity.wait_event_type,
+    models.SessionActivity.wait_event,
+    models.SessionActivity.state,
+    models.SessionActivity.backend_xid,
+    models.SessionActivity.backend_xmin,
+    models.SessionActivity.query_id,
+    models.SessionActivity.query,
+    models.SessionActivity.query_fingerprint,
+    models.SessionActivity.backend_type,
+)
+
+SESSION_FIELDS = frozenset(column.key for column in SESSION_DETAIL_COLUMNS)
+SESSION_KEYSET = ("pid", "id")
+
+def get_session_rows_by_snapshot(
+    db: Session,
+    snapshot_id: int,
+    state: Optional[str] = None,
+    usename: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+    after: Optional[Sequence[Any]] = None,
+    limit: Optional[int] = None
+) -> Tuple[List[Dict[str, Any]], Optional[Tuple[Any, ...]]]:
+    """Fetches a page of session activity rows for a snapshot, ordered by (pid, id).
+
+    Args:
+        db: Database session.
+        snapshot_id: ID of the snapshot.
+        state: Only sessions in this state (e.g. 'active').
+        usename: Only sessions of this role.
+        fields: Optional column projection.
+        after: Keyset (pid, id) of the last row of the previous page.
+        limit: Page size; None returns every matching row.
+
+    Returns:
+        Rows as plain dicts and the keyset for the next page (None if exhausted).
+    """
+    _check_cursor(after, models.SessionActivity, SESSION_KEYSET)
+    stmt = (
+        select(*_project_columns(SESSION_DETAIL_COLUMNS, fields, SESSION_KEYSET))
+        .where(models.SessionActivity.snapshot_id == snapshot_id)
+        .order_by(models.SessionActivity.pid, models.SessionActivity.id)
     )
+    if state is not None:
+        stmt = stmt.where(models.SessionActivity.state == state)
+    if usename is not None:
+        stmt = stmt.where(models.SessionActivity.usename == usename)
+    if after is not None:
+        stmt = stmt.where(tuple_(models.SessionActivity.pid, models.SessionActivity.id) > tuple_(*after))
+    return _fetch_page(db, stmt, SESSION_KEYSET, limit)
 
 # Enum for sorting statement statistics
 class StatementSortBy(str, Enum):
@@ -84,12 +213,43 @@ class StatementSortBy(str, Enum):
     shared_blks_read = "shared_blks_read"
     shared_blks_hit = "shared_blks_hit"
 
-def get_statement_stats_by_snapshot(
+STATEMENT_DETAIL_COLUMNS = (
+    models.StatementStats.id,
+    models.StatementStats.snapshot_id,
+    models.StatementStats.userid,
+    models.StatementStats.dbid,
+    models.StatementStats.username,
+    models.StatementStats.database_name,
+    models.StatementStats.queryid,
+    models.StatementStats.query,
+    models.StatementStats.query_fingerprint,
+    models.StatementStats.calls,
+    models.StatementStats.total_time,
+    models.StatementStats.min_time,
+    models.StatementStats.max_time,
+    models.StatementStats.mean_time,
+    models.StatementStats.stddev_time,
+    models.StatementStats.rows,
+    models.StatementStats.shared_blks_hit,
+    models.StatementStats.shared_blks_read,
+    models.StatementStats.shared_blks_dirtied,
+    models.StatementStats.shared_blks_written,
+    models.StatementStats.local_blks_hit,
+    models.StatementStats.local_blks_read,
+    models.StatementStats.local_blks_dirtied,
+    models.StatementStats.local_blks_written,
+    models.StatementStats.temp_blks_read,
+    models.StatementStats.temp_blks_written,
+    models.StatementStats.blk_read_time,
+    models.StatementStats.blk_write_time,
+)
+
+def get_statement_rows_by_snapshot(
     db: Session,
     snapshot_id: int,
     sort_by: StatementSortBy = StatementSortBy.total_time,
     limit: Optional[int] = 20 # Default limit
-) -> List[models.StatementStats]:
+) -> List[Dict[str, Any]]:
     """Fetches statement statistics for a specific snapshot ID, with sorting and limit.
 
     Args:
@@ -99,63 +259,829 @@ def get_statement_stats_by_snapshot(
         limit: Maximum number of results to return.
 
     Returns:
-        List of StatementStats models.
+        List of statement stat rows as plain dicts.
     """
     sort_column = getattr(models.StatementStats, sort_by.value, models.StatementStats.total_time)
 
-    query = (
-        db.query(models.StatementStats)
-        .filter(models.StatementStats.snapshot_id == snapshot_id)
+    stmt = (
+        select(*STATEMENT_DETAIL_COLUMNS)
+        .where(models.StatementStats.snapshot_id == snapshot_id)
         .order_by(desc(sort_column))
     )
 
     if limit is not None:
-        query = query.limit(limit)
+        stmt = stmt.limit(limit)
+
+    return _fetch_rows(db, stmt)
+
+def get_session_groups_by_fingerprint(
+    db: Session,
+    snapshot_id: int,
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Groups a snapshot's sessions by query shape, joined to the statements of the same shape.
+
+    Args:
+        db: Database session.
+        snapshot_id: ID of the snapshot.
+        limit: Maximum number of groups (largest first); None returns all.
+
+    Returns:
+        One dict per fingerprint with session counts, a sample query and, when
+        pg_stat_statements had the same shape, its cumulative call and time totals.
+    """
+    sessions = (
+        select(
+            models.SessionActivity.query_fingerprint.label("query_fingerprint"),
+            func.count().label("session_count"),
+            func.count().filter(models.SessionActivity.state == "active").label("active_count"),
+            func.count().filter(models.SessionActivity.wait_event_type.isnot(None)).label("waiting_count"),
+            func.max(models.SessionActivity.query_id).label("query_id"),
+            func.min(models.SessionActivity.query).label("sample_query"),
+        )
+        .where(
+            models.SessionActivity.snapshot_id == snapshot_id,
+            models.SessionActivity.query_fingerprint.isnot(None)
+        )
+        .group_by(models.SessionActivity.query_fingerprint)
+        .subquery()
+    )
+    statements = (
+        select(
+            models.StatementStats.query_fingerprint.label("query_fingerprint"),
+            func.min(models.StatementStats.queryid).label("queryid"),
+            func.sum(models.StatementStats.calls).label("calls"),
+            func.sum(models.StatementStats.total_time).label("total_time"),
+            func.sum(models.StatementStats.rows).label("rows"),
+        )
+        .where(
+            models.StatementStats.snapshot_id == snapshot_id,
+            models.StatementStats.query_fingerprint.isnot(None)
+        )
+        .group_by(models.StatementStats.query_fingerprint)
+        .subquery()
+    )
+    stmt = (
+        select(
+            sessions.c.query_fingerprint,
+            sessions.c.session_count,
+            sessions.c.active_count,
+            sessions.c.waiting_count,
+            sessions.c.query_id,
+            sessions.c.sample_query,
+            statements.c.queryid,
+            statements.c.calls,
+            statements.c.total_time,
+            (statements.c.total_time / func.nullif(statements.c.calls, 0)).label("mean_time"),
+            statements.c.rows,
+        )
+        .select_from(sessions.outerjoin(statements, statements.c.query_fingerprint == sessions.c.query_fingerprint))
+        .order_by(desc(sessions.c.session_count), sessions.c.query_fingerprint)
+    )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return _fetch_rows(db, stmt)
+
+class StatementWindowSortBy(str, Enum):
+    total_time = "total_time"
+    calls = "calls"
+    mean_time = "mean_time"
+    rows = "rows"
+    shared_blks_read = "shared_blks_read"
+    temp_blks_written = "temp_blks_written"
+
+# Cumulative pg_stat_statements counters that are differenced over a time window
+STATEMENT_WINDOW_METRICS = ("calls", "total_time", "rows", "shared_blks_hit", "shared_blks_read", "temp_blks_written")
+
+def statement_interval_deltas(
+    db_id: int,
+    count_from: datetime,
+    count_to: datetime,
+    lookback_from: Optional[datetime] = None,
+    include_end: bool = True
+):
+    """Builds a subquery of per-interval counter increases for each statement.
+
+    Each sample (the entry's rows in one snapshot, summed) is differenced
+    against the previous sample of the same (userid, dbid, queryid) with LAG(). A sample whose calls went down marks
+    a counter reset; its own values are then the increase since the reset.
+    Only intervals ending in [count_from, count_to] are returned; samples from
+    lookback_from on serve as predecessors of the first ones.
+
+    Args:
+        db_id: ID of the monitored database.
+        count_from: Start of the counted range.
+        count_to: End of the counted range.
+        lookback_from: Earliest predecessor sample (defaults to count_from).
+        include_end: Whether count_to itself is inside the range.
+
+    Returns:
+        Subquery with userid, dbid, queryid, query, snapshot_time and one column per STATEMENT_WINDOW_METRICS.
+    """
+    st = models.StatementStats
+    # One sample per entry and snapshot: with pg_stat_statements.track = all (PG14+) an entry
+    # has a toplevel and a nested row, which would tie in the LAG() order below
+    per_snapshot = (
+        select(
+            st.userid,
+            st.dbid,
+            st.queryid,
+            func.max(st.query).label("query"),
+            models.Snapshot.snapshot_time,
+            *[cast(func.sum(getattr(st, metric)), getattr(st, metric).type).label(metric) for metric in STATEMENT_WINDOW_METRICS],
+        )
+        .join(models.Snapshot, models.Snapshot.id == st.snapshot_id)
+        .where(
+            models.Snapshot.database_id == db_id,
+            models.Snapshot.snapshot_time >= (lookback_from or count_from),
+            models.Snapshot.snapshot_time <= count_to if include_end else models.Snapshot.snapshot_time < count_to,
+            st.queryid.isnot(None)
+        )
+        .group_by(models.Snapshot.id, models.Snapshot.snapshot_time, st.userid, st.dbid, st.queryid)
+        .subquery()
+    )
+    window = dict(partition_by=(per_snapshot.c.userid, per_snapshot.c.dbid, per_snapshot.c.queryid), order_by=per_snapshot.c.snapshot_time)
+    samples = (
+        select(
+            per_snapshot,
+            *[func.lag(per_snapshot.c[metric]).over(**window).label(f"prev_{metric}") for metric in STATEMENT_WINDOW_METRICS],
+        )
+        .subquery()
+    )
+    reset = samples.c.calls < samples.c.prev_calls
+    deltas = [
+        case(
+            (samples.c.prev_calls.is_(None), 0),
+            (reset, func.coalesce(samples.c[metric], 0)),
+            else_=func.greatest(func.coalesce(samples.c[metric], 0) - func.coalesce(samples.c[f"prev_{metric}"], 0), 0)
+        ).label(metric)
+        for metric in STATEMENT_WINDOW_METRICS
+    ]
+    return (
+        select(samples.c.userid, samples.c.dbid, samples.c.queryid, samples.c.query, samples.c.snapshot_time, *deltas)
+        .where(samples.c.snapshot_time >= count_from)
+        .subquery()
+    )
+
+def get_statement_rolled_until(db: Session, db_id: int) -> Optional[datetime]:
+    """Start of the last hour rolled up into statement_stats_hourly (None if none yet)."""
+    return db.execute(
+        select(models.StatementRollupProgress.rolled_until)
+        .where(models.StatementRollupProgress.database_id == db_id)
+    ).scalar()
+
+def get_top_statements_in_window(
+    db: Session,
+    db_id: int,
+    start_time: datetime,
+    end_time: datetime,
+    sort_by: StatementWindowSortBy = StatementWindowSortBy.total_time,
+    limit: int = 20
+) -> Tuple[List[Dict[str, Any]], str]:
+    """Ranks statements by what they consumed between start_time and end_time.
+
+    Short windows are computed from the raw snapshots. Windows of at least
+    STATEMENT_TOP_ROLLUP_MIN_HOURS read the full hours that are already rolled
+    up from statement_stats_hourly and difference only the partial hours at
+    both ends from the raw snapshots.
+
+    Args:
+        db: Database session.
+        db_id: ID of the monitored database.
+        start_time: Start of the window.
+        end_time: End of the window.
+        sort_by: Metric to rank by (descending).
+        limit: Number of statements.
+
+    Returns:
+        Rows aggregated per queryid, and the source used ("raw" or "rollup").
+    """
+    source = "raw"
+    parts = []
+    first_hour = floor_to_hour(start_time)
+    if first_hour < start_time:
+        first_hour += timedelta(hours=1)
+    last_hour = floor_to_hour(end_time)
+    if end_time - start_time >= timedelta(hours=settings.STATEMENT_TOP_ROLLUP_MIN_HOURS):
+        rolled_until = get_statement_rolled_until(db, db_id)
+        if rolled_until is not None:
+            last_hour = min(last_hour, rolled_until + timedelta(hours=1))
+            if last_hour > first_hour:
+                source = "rollup"
+
+    def metric_columns(subquery) -> List:
+        return [subquery.c[metric] for metric in STATEMENT_WINDOW_METRICS]
+
+    if source == "raw":
+        raw = statement_interval_deltas(db_id, start_time, end_time)
+        parts.append(select(raw.c.queryid, raw.c.query, *metric_columns(raw), literal(1).label("samples")))
+    else:
+        lookback = timedelta(minutes=settings.STATEMENT_ROLLUP_LOOKBACK_MINUTES)
+        head = statement_interval_deltas(db_id, start_time, first_hour, include_end=False)
+        tail = statement_interval_deltas(db_id, last_hour, end_time, lookback_from=last_hour - lookback)
+        hourly = models.StatementStatsHourly
+        parts.append(select(head.c.queryid, head.c.query, *metric_columns(head), literal(1).label("samples")))
+        parts.append(
+            select(hourly.queryid, hourly.query, *[getattr(hourly, metric) for metric in STATEMENT_WINDOW_METRICS], hourly.samples)
+            .where(
+                hourly.database_id == db_id,
+                hourly.bucket_start >= first_hour,
+                hourly.bucket_start < last_hour
+            )
+        )
+        parts.append(select(tail.c.queryid, tail.c.query, *metric_columns(tail), literal(1).label("samples")))
+
+    combined = union_all(*parts).subquery()
+    # SUM() of bigint is numeric; cast back so rows serialize as plain ints/floats
+    totals = {
+        metric: cast(func.sum(combined.c[metric]), Float if metric == "total_time" else BigInteger)
+        for metric in STATEMENT_WINDOW_METRICS
+    }
+    mean_time = totals["total_time"] / func.nullif(totals["calls"], 0)
+    sort_column = mean_time if sort_by == StatementWindowSortBy.mean_time else totals[sort_by.value]
+    stmt = (
+        select(
+            combined.c.queryid,
+            func.max(combined.c.query).label("query"),
+            *[total.label(metric) for metric, total in totals.items()],
+            mean_time.label("mean_time"),
+            cast(func.sum(combined.c.samples), BigInteger).label("samples"),
+        )
+        .group_by(combined.c.queryid)
+        .having(totals["calls"] > 0)
+        .order_by(desc(sort_column).nulls_last(), combined.c.queryid)
+        .limit(limit)
+    )
+    return _fetch_rows(db, stmt), source
+
+def get_statement_regressions(
+    db: Session,
+    db_id: int,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    kind: Optional[str] = None,
+    limit: int = 100
+) -> List[models.StatementRegression]:
+    """Fetches regression flags raised at ingest for a monitored database, newest first.
+
+    Args:
+        db: Database session.
+        db_id: ID of the monitored database.
+        start_time: Only flags detected at or after this time.
+        end_time: Only flags detected at or before this time.
+        kind: Only flags of this kind.
+        limit: Maximum number of flags.
+
+    Returns:
+        StatementRegression rows.
+    """
+    query = db.query(models.StatementRegression).filter(models.StatementRegression.database_id == db_id)
+    if start_time is not None:
+        query = query.filter(models.StatementRegression.detected_at >= start_time)
+    if end_time is not None:
+        query = query.filter(models.StatementRegression.detected_at <= end_time)
+    if kind is not None:
+        query = query.filter(models.StatementRegression.kind == kind)
+    return (
+        query.order_by(desc(models.StatementRegression.detected_at), models.StatementRegression.id)
+        .limit(limit)
+        .all()
+    )
 
-    return query.all()
+DB_OBJECT_DETAIL_COLUMNS = (
+    models.DbObject.id,
+    models.DbObject.snapshot_id,
+    models.DbObject.object_type,
+    models.DbObject.schema_name,
+    models.DbObject.object_name,
+    models.DbObject.total_size_bytes,
+    models.DbObject.table_size_bytes,
+    models.DbObject.index_size_bytes,
+    models.DbObject.toast_size_bytes,
+    models.DbObject.owner,
+    models.DbObject.estimated_row_count,
+)
 
-def get_db_objects_by_snapshot(
+DB_OBJECT_FIELDS = frozenset(column.key for column in DB_OBJECT_DETAIL_COLUMNS)
+DB_OBJECT_SIZE_KEYSET = ("total_size_bytes", "id")
+DB_OBJECT_NAME_KEYSET = ("schema_name", "object_name", "id")
+
+def get_db_object_rows_by_snapshot(
     db: Session,
     snapshot_id: int,
     sort_by_size: bool = True, # Default to sorting by size descending
+    schema_name: Optional[str] = None,
+    object_type: Optional[str] = None,
+    min_size_bytes: Optional[int] = None,
+    fields: Optional[Sequence[str]] = None,
+    after: Optional[Sequence[Any]] = None,
     limit: Optional[int] = 100 # Default limit
-) -> List[models.DbObject]:
-    """Fetches database objects for a specific snapshot ID, optionally sorted by size.
+) -> Tuple[List[Dict[str, Any]], Optional[Tuple[Any, ...]]]:
+    """Fetches a page of database objects for a snapshot, optionally sorted by size.
+
+    Size order is (total_size_bytes DESC NULLS LAST, id), name order is
+    (schema_name, object_name, id); both are served by composite indexes
+    so every page costs the same.
 
     Args:
         db: Database session.
         snapshot_id: ID of the snapshot.
         sort_by_size: If True, sort by total_size_bytes descending.
-        limit: Maximum number of results to return.
+        schema_name: Only objects in this schema.
+        object_type: Only objects of this type (e.g. 'table').
+        min_size_bytes: Only objects with at least this total size.
+        fields: Optional column projection.
+        after: Keyset of the last row of the previous page.
+        limit: Page size.
 
     Returns:
-        List of DbObject models.
+        Rows as plain dicts (without `size_pretty`) and the keyset for the next page.
     """
-    query = (
-        db.query(models.DbObject)
-        .filter(models.DbObject.snapshot_id == snapshot_id)
+    keyset = DB_OBJECT_SIZE_KEYSET if sort_by_size else DB_OBJECT_NAME_KEYSET
+    _check_cursor(after, models.DbObject, keyset)
+    size_column = models.DbObject.total_size_bytes
+
+    stmt = (
+        select(*_project_columns(DB_OBJECT_DETAIL_COLUMNS, fields, keyset))
+        .where(models.DbObject.snapshot_id == snapshot_id)
     )
+    if schema_name is not None:
+        stmt = stmt.where(models.DbObject.schema_name == schema_name)
+    if object_type is not None:
+        stmt = stmt.where(models.DbObject.object_type == object_type)
+    if min_size_bytes is not None:
+        stmt = stmt.where(size_column >= min_size_bytes)
 
     if sort_by_size:
         # Ensure nulls are treated consistently if size can be null
-        # Apply desc() first, then nullslast()
-        query = query.order_by(desc(models.DbObject.total_size_bytes).nullslast())
+        stmt = stmt.order_by(desc(size_column).nullslast(), models.DbObject.id)
+        if after is not None:
+            last_size, last_id = after
+            if last_size is None:
+                # Already inside the trailing NULL block
+                stmt = stmt.where(and_(size_column.is_(None), models.DbObject.id > last_id))
+            else:
+                stmt = stmt.where(or_(
+                    size_column < last_size,
+                    and_(size_column == last_size, models.DbObject.id > last_id),
+                    size_column.is_(None),
+                ))
     else:
         # Default sort order if not sorting by size
-        query = query.order_by(models.DbObject.schema_name, models.DbObject.object_name)
+        stmt = stmt.order_by(models.DbObject.schema_name, models.DbObject.object_name, models.DbObject.id)
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(models.DbObject.schema_name, models.DbObject.object_name, models.DbObject.id) > tuple_(*after)
+            )
 
-    if limit is not None:
-        query = query.limit(limit)
+    return _fetch_page(db, stmt, keyset, limit)
+
+class ObjectGrowthSortBy(str, Enum):
+    bytes_per_day = "bytes_per_day"
+    projected_size_30d = "projected_size_30d"
+    projected_size_90d = "projected_size_90d"
+    current_size_bytes = "current_size_bytes"
+
+OBJECT_GROWTH_COLUMNS = (
+    models.ObjectGrowth.object_type,
+    models.ObjectGrowth.schema_name,
+    models.ObjectGrowth.object_name,
+    models.ObjectGrowth.current_size_bytes,
+    models.ObjectGrowth.bytes_per_day,
+    models.ObjectGrowth.r_squared,
+    models.ObjectGrowth.projected_size_30d,
+    models.ObjectGrowth.projected_size_90d,
+    models.ObjectGrowth.samples,
+    models.ObjectGrowth.first_sample_at,
+    models.ObjectGrowth.last_sample_at,
+)
+
+def get_object_growth(
+    db: Session,
+    db_id: int,
+    sort_by: ObjectGrowthSortBy = ObjectGrowthSortBy.bytes_per_day,
+    object_type: Optional[str] = None,
+    limit: int = 20
+) -> Tuple[List[Dict[str, Any]], Optional[datetime]]:
+    """Fetches the stored growth forecasts of a monitored database, largest first.
+
+    Args:
+        db: Database session.
+        db_id: ID of the monitored database.
+        sort_by: Column to rank by (descending).
+        object_type: Only objects of this type (e.g. 'table', 'index').
+        limit: Maximum number of objects.
+
+    Returns:
+        Forecast rows, and when they were computed (None if never).
+    """
+    growth = models.ObjectGrowth
+    stmt = select(*OBJECT_GROWTH_COLUMNS).where(growth.database_id == db_id)
+    if object_type is not None:
+        stmt = stmt.where(growth.object_type == object_type)
+    stmt = stmt.order_by(desc(getattr(growth, sort_by.value)), growth.schema_name, growth.object_name).limit(limit)
+    computed_at = db.execute(select(func.max(growth.computed_at)).where(growth.database_id == db_id)).scalar()
+    return _fetch_rows(db, stmt), computed_at
+
+LOCK_DETAIL_COLUMNS = (
+    models.Lock.id,
+    models.Lock.snapshot_id,
+    models.Lock.pid,
+    models.Lock.relation,
+    models.Lock.relation_name,
+    models.Lock.database,
+    models.Lock.database_name,
+    models.Lock.locktype,
+    models.Lock.mode,
+    models.Lock.granted,
+    models.Lock.waitstart,
+)
 
-    return query.all()
+LOCK_FIELDS = frozenset(column.key for column in LOCK_DETAIL_COLUMNS)
+LOCK_KEYSET = ("pid", "id")
 
-def get_locks_by_snapshot(db: Session, snapshot_id: int) -> List[models.Lock]:
-    """Fetches all lock records for a specific snapshot ID."""
+def get_lock_rows_by_snapshot(
+    db: Session,
+    snapshot_id: int,
+    granted: Optional[bool] = None,
+    pid: Optional[int] = None,
+    fields: Optional[Sequence[str]] = None,
+    after: Optional[Sequence[Any]] = None,
+    limit: Optional[int] = None
+) -> Tuple[List[Dict[str, Any]], Optional[Tuple[Any, ...]]]:
+    """Fetches a page of lock rows for a snapshot, ordered by (pid, id), NULL pids last.
+
+    Args:
+        db: Database session.
+        snapshot_id: ID of the snapshot.
+        granted: Only held (True) or awaited (False) locks.
+        pid: Only locks of this backend.
+        fields: Optional column projection.
+        after: Keyset (pid, id) of the last row of the previous page.
+        limit: Page size; None returns every matching row.
+
+    Returns:
+        Rows as plain dicts and the keyset for the next page (None if exhausted).
+    """
+    _check_cursor(after, models.Lock, LOCK_KEYSET)
+    stmt = (
+        select(*_project_columns(LOCK_DETAIL_COLUMNS, fields, LOCK_KEYSET))
+        .where(models.Lock.snapshot_id == snapshot_id)
+        .order_by(models.Lock.pid.asc().nullslast(), models.Lock.id)
+    )
+    if granted is not None:
+        stmt = stmt.where(models.Lock.granted == granted)
+    if pid is not None:
+        stmt = stmt.where(models.Lock.pid == pid)
+    if after is not None:
+        # Prepared transactions hold locks without a pid; they sort last, as in the size keyset
+        last_pid, last_id = after
+        if last_pid is None:
+            stmt = stmt.where(and_(models.Lock.pid.is_(None), models.Lock.id > last_id))
+        else:
+            stmt = stmt.where(or_(
+                tuple_(models.Lock.pid, models.Lock.id) > tuple_(last_pid, last_id),
+                models.Lock.pid.is_(None),
+            ))
+    return _fetch_page(db, stmt, LOCK_KEYSET, limit)
+
+def get_lock_summary_by_snapshot(db: Session, snapshot_id: int) -> List[Dict[str, Any]]:
+    """Fetches the per (locktype, mode, granted) lock counts of a snapshot, largest first."""
+    stmt = (
+        select(
+            models.LockSummary.locktype,
+            models.LockSummary.mode,
+            models.LockSummary.granted,
+            models.LockSummary.lock_count,
+            models.LockSummary.fastpath_count,
+        )
+        .where(models.LockSummary.snapshot_id == snapshot_id)
+        .order_by(models.LockSummary.lock_count.desc(), models.LockSummary.id)
+    )
+    return _fetch_rows(db, stmt)
+
+def get_blocking_tree_by_snapshot(db: Session, snapshot_id: int) -> Optional[models.BlockingTree]:
+    """Fetches the blocking tree stored for a snapshot (None if nobody was blocked)."""
     return (
-        db.query(models.Lock)
-        .filter(models.Lock.snapshot_id == snapshot_id)
-        .order_by(models.Lock.pid, models.Lock.granted.desc()) # Example sort order
-        .all()
+        db.query(models.BlockingTree)
+        .filter(models.BlockingTree.snapshot_id == snapshot_id)
+        .first()
+    )
+
+def _epoch_bucket(column, seconds: int):
+    """Start of the `seconds`-wide bucket (since the Unix epoch) a timestamp column falls in, as epoch seconds."""
+    return (func.floor(func.extract("epoch", column) / seconds) * seconds).cast(BigInteger)
+
+def get_wait_event_heatmap(
+    db: Session,
+    db_id: int,
+    start_time: datetime,
+    end_time: datetime,
+    bucket_minutes: int,
+    wait_event_type: Optional[str] = None,
+    limit: int = 20
+) -> Dict[str, Any]:
+    """Builds a time x wait event matrix from the per-bucket histograms written at ingest.
+
+    The range is widened to whole stored buckets. Cells hold the average number
+    of sessions in the wait per snapshot of the bucket (None for buckets without
+    snapshots) and the peak in any one snapshot.
+
+    Args:
+        db: Database session.
+        db_id: ID of the monitored database.
+        start_time: Start of the range.
+        end_time: End of the range.
+        bucket_minutes: Heatmap bucket width, a multiple of WAIT_HISTOGRAM_BUCKET_MINUTES.
+        wait_event_type: Only wait events of this type (e.g. 'Lock', 'IO', 'CPU').
+        limit: Number of wait events (rows), busiest first.
+
+    Returns:
+        Dict with the aligned start_time/end_time, buckets, snapshots per bucket and series.
+    """
+    stored_seconds = settings.WAIT_HISTOGRAM_BUCKET_MINUTES * 60
+    seconds = bucket_minutes * 60
+    start_time = floor_to_interval(start_time, seconds)
+    aligned_end = floor_to_interval(end_time, stored_seconds)
+    end_time = aligned_end if aligned_end == end_time else aligned_end + timedelta(seconds=stored_seconds)
+
+    histogram = models.WaitEventHistogram
+    bucket = _epoch_bucket(histogram.bucket_start, seconds)
+    stmt = (
+        select(
+            bucket.label("bucket"),
+            histogram.wait_event_type,
+            histogram.wait_event,
+            cast(func.sum(histogram.session_samples), BigInteger).label("session_samples"),
+            func.max(histogram.max_sessions).label("max_sessions"),
+        )
+        .where(
+            histogram.database_id == db_id,
+            histogram.bucket_start >= start_time,
+            histogram.bucket_start < end_time
+        )
+        .group_by(bucket, histogram.wait_event_type, histogram.wait_event)
+    )
+    if wait_event_type is not None:
+        stmt = stmt.where(histogram.wait_event_type == wait_event_type)
+    cells = db.execute(stmt).all()
+
+    snapshot_bucket = _epoch_bucket(models.Snapshot.snapshot_time, seconds)
+    snapshot_counts = dict(db.execute(
+        select(snapshot_bucket, func.count())
+        .where(
+            models.Snapshot.database_id == db_id,
+            models.Snapshot.snapshot_time >= start_time,
+            models.Snapshot.snapshot_time < end_time
+        )
+        .group_by(snapshot_bucket)
+    ).all())
+
+    first = int(start_time.timestamp())
+    bucket_count = -(-(int(end_time.timestamp()) - first) // seconds)
+    snapshots = [snapshot_counts.get(first + i * seconds, 0) for i in range(bucket_count)]
+
+    series: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for cell in cells:
+        entry = series.get((cell.wait_event_type, cell.wait_event))
+        if entry is None:
+            entry = series[(cell.wait_event_type, cell.wait_event)] = {
+                "wait_event_type": cell.wait_event_type,
+                "wait_event": cell.wait_event,
+                "total_session_samples": 0,
+                "avg_sessions": [None if count == 0 else 0.0 for count in snapshots],
+                "max_sessions": [0] * bucket_count,
+            }
+        i = (cell.bucket - first) // seconds
+        entry["total_session_samples"] += cell.session_samples
+        if snapshots[i]:
+            entry["avg_sessions"][i] = cell.session_samples / snapshots[i]
+        entry["max_sessions"][i] = cell.max_sessions
+
+    ranked = sorted(series.values(), key=lambda entry: (-entry["total_session_samples"], entry["wait_event_type"], entry["wait_event"]))
+    return {
+        "start_time": start_time,
+        "end_time": end_time,
+        "buckets": [datetime.fromtimestamp(first + i * seconds, tz=timezone.utc) for i in range(bucket_count)],
+        "snapshots": snapshots,
+        "wait_events_total": len(ranked),
+        "series": ranked[:limit],
+    }
+
+# --- Snapshot diff ---
+# Each diff is one FULL OUTER JOIN of the two snapshots' rows on the entity key, so
+# only rows that differ leave the database. Nullable key columns are coalesced to a
+# sentinel: FULL JOIN needs a plain (hash- or merge-joinable) equality.
+
+def _join_key(before, after, columns: Sequence[str]):
+    conditions = []
+    for name in columns:
+        sentinel = "" if isinstance(before.c[name].type, String) else -1
+        conditions.append(func.coalesce(before.c[name], sentinel) == func.coalesce(after.c[name], sentinel))
+    return and_(*conditions)
+
+def _fetch_diff(db: Session, diff, order_by: Sequence, limit: int) -> Tuple[Dict[str, int], List[Dict[str, Any]]]:
+    """Counts the rows of a diff subquery per `change` and fetches the first `limit` of them."""
+    counts = {change: count for change, count in db.execute(select(diff.c.change, func.count()).group_by(diff.c.change))}
+    return counts, _fetch_rows(db, select(diff).order_by(*order_by).limit(limit))
+
+def diff_db_objects(
+    db: Session,
+    from_snapshot_id: int,
+    to_snapshot_id: int,
+    limit: int = 100
+) -> Tuple[Dict[str, int], List[Dict[str, Any]], Optional[int]]:
+    """Objects added, dropped or changed in size/row estimate between two snapshots.
+
+    Returns:
+        Change counts, the rows with the largest size changes first, and the total size delta.
+    """
+    obj = models.DbObject
+    columns = (obj.object_type, obj.schema_name, obj.object_name, obj.total_size_bytes, obj.estimated_row_count)
+    before = select(*columns).where(obj.snapshot_id == from_snapshot_id).subquery()
+    after = select(*columns).where(obj.snapshot_id == to_snapshot_id).subquery()
+    size_delta = func.coalesce(after.c.total_size_bytes, 0) - func.coalesce(before.c.total_size_bytes, 0)
+    diff = (
+        select(
+            case(
+                (before.c.object_name.is_(None), "added"),
+                (after.c.object_name.is_(None), "dropped"),
+                else_="changed"
+            ).label("change"),
+            func.coalesce(after.c.object_type, before.c.object_type).label("object_type"),
+            func.coalesce(after.c.schema_name, before.c.schema_name).label("schema_name"),
+            func.coalesce(after.c.object_name, before.c.object_name).label("object_name"),
+            before.c.total_size_bytes.label("total_size_before"),
+            after.c.total_size_bytes.label("total_size_after"),
+            size_delta.label("size_delta"),
+            before.c.estimated_row_count.label("rows_before"),
+            after.c.estimated_row_count.label("rows_after"),
+        )
+        .select_from(before.outerjoin(after, _join_key(before, after, ("object_type", "schema_name", "object_name")), full=True))
+        .where(or_(
+            before.c.object_name.is_(None),
+            after.c.object_name.is_(None),
+            before.c.total_size_bytes.is_distinct_from(after.c.total_size_bytes),
+            before.c.estimated_row_count.is_distinct_from(after.c.estimated_row_count)
+        ))
+        .subquery()
+    )
+    counts, rows = _fetch_diff(db, diff, (desc(func.abs(diff.c.size_delta)), diff.c.schema_name, diff.c.object_name), limit)
+    total_size_delta = db.execute(select(cast(func.sum(diff.c.size_delta), BigInteger))).scalar()
+    return counts, rows, total_size_delta
+
+def diff_sessions(
+    db: Session,
+    from_snapshot_id: int,
+    to_snapshot_id: int,
+    limit: int = 100
+) -> Tuple[Dict[str, int], List[Dict[str, Any]]]:
+    """Backends that started or ended between two snapshots, keyed by (pid, backend_start)."""
+    sa = models.SessionActivity
+    columns = (sa.pid, sa.backend_start, sa.usename, sa.application_name, sa.client_addr, sa.backend_type, sa.state, sa.query)
+    before = select(*columns, literal(True).label("present")).where(sa.snapshot_id == from_snapshot_id).subquery()
+    after = select(*columns, literal(True).label("present")).where(sa.snapshot_id == to_snapshot_id).subquery()
+    never = literal(datetime.min.replace(tzinfo=timezone.utc))
+    join = and_(
+        func.coalesce(before.c.pid, -1) == func.coalesce(after.c.pid, -1),
+        func.coalesce(before.c.backend_start, never) == func.coalesce(after.c.backend_start, never)
+    )
+    ended = after.c.present.is_(None)
+    # The side the session was seen on: `after` for new sessions, `before` for ended ones
+    seen = [case((ended, before.c[column.key]), else_=after.c[column.key]).label(column.key) for column in columns]
+    diff = (
+        select(case((ended, "ended"), else_="new").label("change"), *seen)
+        .select_from(before.outerjoin(after, join, full=True))
+        .where(or_(before.c.present.is_(None), ended))
+        .subquery()
+    )
+    return _fetch_diff(db, diff, (diff.c.change, diff.c.pid), limit)
+
+LOCK_DIFF_KEY = (
+    "pid", "locktype", "mode", "database", "relation", "page", "tuple",
+    "virtualxid", "transactionid", "classid", "objid", "objsubid",
+)
+
+def diff_locks(
+    db: Session,
+    from_snapshot_id: int,
+    to_snapshot_id: int,
+    limit: int = 100
+) -> Tuple[Dict[str, int], List[Dict[str, Any]]]:
+    """pg_locks entries acquired, awaited, released or granted between two snapshots.
+
+    Only stored lock rows take part; with LOCK_COLLECTION_MODE=adaptive those exist
+    for contended snapshots only (see diff_lock_counts for the always-present counts).
+    """
+    lock = models.Lock
+    columns = [getattr(lock, name) for name in LOCK_DIFF_KEY] + [lock.relation_name, lock.database_name, lock.granted]
+    before = select(*columns, literal(True).label("present")).where(lock.snapshot_id == from_snapshot_id).subquery()
+    after = select(*columns, literal(True).label("present")).where(lock.snapshot_id == to_snapshot_id).subquery()
+    gone = after.c.present.is_(None)
+    appeared = before.c.present.is_(None)
+    seen = [case((gone, before.c[name]), else_=after.c[name]).label(name) for name in LOCK_DIFF_KEY + ("relation_name", "database_name")]
+    diff = (
+        select(
+            case(
+                (appeared & after.c.granted.is_(True), "acquired"),
+                (appeared, "waiting"),
+                (gone & before.c.granted.is_(True), "released"),
+                (gone, "wait_ended"),
+                else_="granted"
+            ).label("change"),
+            *seen,
+            before.c.granted.label("granted_before"),
+            after.c.granted.label("granted_after"),
+        )
+        .select_from(before.outerjoin(after, _join_key(before, after, LOCK_DIFF_KEY), full=True))
+        .where(or_(appeared, gone, before.c.granted.is_distinct_from(after.c.granted)))
+        .subquery()
+    )
+    return _fetch_diff(db, diff, (diff.c.change, diff.c.pid, diff.c.locktype, diff.c.mode), limit)
+
+def diff_lock_counts(db: Session, from_snapshot_id: int, to_snapshot_id: int) -> List[Dict[str, Any]]:
+    """Lock count groups (locktype, mode, granted) whose count changed between two snapshots."""
+    summary = models.LockSummary
+    columns = (summary.locktype, summary.mode, summary.granted, summary.lock_count)
+    before = select(*columns).where(summary.snapshot_id == from_snapshot_id).subquery()
+    after = select(*columns).where(summary.snapshot_id == to_snapshot_id).subquery()
+    count_before = func.coalesce(before.c.lock_count, 0)
+    count_after = func.coalesce(after.c.lock_count, 0)
+    join = and_(
+        _join_key(before, after, ("locktype", "mode")),
+        func.coalesce(before.c.granted, False) == func.coalesce(after.c.granted, False)
+    )
+    stmt = (
+        select(
+            func.coalesce(after.c.locktype, before.c.locktype).label("locktype"),
+            func.coalesce(after.c.mode, before.c.mode).label("mode"),
+            func.coalesce(after.c.granted, before.c.granted).label("granted"),
+            count_before.label("count_before"),
+            count_after.label("count_after"),
+            (count_after - count_before).label("delta"),
+        )
+        .select_from(before.outerjoin(after, join, full=True))
+        .where(count_before != count_after)
+        .order_by(desc(func.abs(count_after - count_before)), "locktype", "mode")
+    )
+    return _fetch_rows(db, stmt)
+
+STATEMENT_DIFF_METRICS = ("calls", "total_time", "rows", "shared_blks_read", "temp_blks_written")
+
+def diff_statements(
+    db: Session,
+    from_snapshot_id: int,
+    to_snapshot_id: int,
+    limit: int = 100
+) -> Tuple[Dict[str, int], List[Dict[str, Any]]]:
+    """Statement counter increases between two snapshots, keyed by (userid, dbid, queryid).
+
+    Statements new in the later snapshot, or whose calls went down (counters reset),
+    count their later values as the increase. Evicted statements are listed without deltas.
+    """
+    st = models.StatementStats
+
+    def side(snapshot_id: int):
+        # Summed per key: PG14+ can list a statement twice (toplevel and nested)
+        return (
+            select(
+                st.userid, st.dbid, st.queryid,
+                func.max(st.username).label("username"),
+                func.max(st.database_name).label("database_name"),
+                func.max(st.query).label("query"),
+                *[cast(func.sum(getattr(st, metric)), Float if metric == "total_time" else BigInteger).label(metric)
+                  for metric in STATEMENT_DIFF_METRICS],
+            )
+            .where(st.snapshot_id == snapshot_id, st.queryid.isnot(None))
+            .group_by(st.userid, st.dbid, st.queryid)
+            .subquery()
+        )
+
+    before, after = side(from_snapshot_id), side(to_snapshot_id)
+    appeared = before.c.queryid.is_(None)
+    gone = after.c.queryid.is_(None)
+    reset = after.c.calls < before.c.calls
+    deltas = {
+        metric: case(
+            (gone, None),
+            (appeared | reset, after.c[metric]),
+            else_=after.c[metric] - before.c[metric]
+        )
+        for metric in STATEMENT_DIFF_METRICS
+    }
+    seen = [case((gone, before.c[name]), else_=after.c[name]).label(name)
+            for name in ("userid", "dbid", "username", "database_name", "queryid", "query")]
+    diff = (
+        select(
+            case((appeared, "new"), (gone, "evicted"), (reset, "reset"), else_="changed").label("change"),
+            *seen,
+            *[delta.label(metric) for metric, delta in deltas.items()],
+            (deltas["total_time"] / func.nullif(deltas["calls"], 0)).label("mean_time"),
+        )
+        .select_from(before.outerjoin(after, _join_key(before, after, ("userid", "dbid", "queryid")), full=True))
+        .where(or_(appeared, gone, before.c.calls.is_distinct_from(after.c.calls)))
+        .subquery()
     )
+    return _fetch_diff(db, diff, (desc(diff.c.total_time).nulls_last(), diff.c.queryid), limit)
 
-# You might combine the above or use them separately in the endpoint 
\ No newline at end of file
+# You might combine the above or use them separately in the endpoint
@@ -5,8 +5,15 @@ from .monitored_database import Connection
 from .snapshot import Snapshot
 from .session_activity import SessionActivity
 from .statement_stats import StatementStats
+from .statement_stats_hourly import StatementStatsHourly
+from .statement_rollup_progress import StatementRollupProgress
 from .db_object import DbObject
+from .object_growth import ObjectGrowth
+from .wait_event_histogram import WaitEventHistogram
 from .lock import Lock
+from .lock_summary import LockSummary
+from .blocking_tree import BlockingTree
+from .statement_regression import StatementRegression
 
 # Exposing via __all__ can be useful for linters or wildcard imports
 __all__ = [
@@ -15,6 +22,13 @@ __all__ = [
     "Snapshot",
     "SessionActivity",
     "StatementStats",
+    "StatementStatsHourly",
+    "StatementRollupProgress",
     "DbObject",
+    "ObjectGrowth",
+    "WaitEventHistogram",
     "Lock",
+    "LockSummary",
+    "BlockingTree",
+    "StatementRegression",
 ]
\ No newline at end of file
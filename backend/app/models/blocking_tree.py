@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, ForeignKey, Boolean, JSON
+from sqlalchemy.orm import relationship
+
+# Import the common BaseClass
+from app.db.base_class import BaseClass
+
+
+class BlockingTree(BaseClass):
+    __tablename__ = "blocking_trees"
+    # id = Column(Integer, primary_key=True, index=True)
+
+    snapshot_id = Column(Integer, ForeignKey("snapshots.id"), nullable=False, unique=True, index=True)
+
+    # Summary of the wait-for graph resolved from pg_blocking_pids() at collection time
+    blocked_sessions = Column(Integer, nullable=False)  # Sessions waiting on another session
+    root_count = Column(Integer, nullable=False)  # Blockers that are not blocked themselves
+    max_depth = Column(Integer, nullable=False)  # Longest chain below a root
+    has_cycle = Column(Boolean, nullable=False, default=False)  # Deadlock in progress
+
+    # Compact tree: {"roots": [...], "nodes": [...], "cycles": [...]} (see services/lock_analysis.py)
+    tree = Column(JSON, nullable=False)
+
+    # Relationships
+    snapshot = relationship("Snapshot", back_populates="blocking_tree")
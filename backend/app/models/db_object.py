@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, BigInteger
+from sqlalchemy import Column, Integer, ForeignKey, String, BigInteger, Index, text
 from sqlalchemy.orm import relationship
 
 # Import the common BaseClass
@@ -7,6 +7,11 @@ from app.db.base_class import BaseClass
 
 class DbObject(BaseClass):
     __tablename__ = "db_objects"
+    __table_args__ = (
+        # Keyset pagination of the latest-objects endpoint: size order and name order
+        Index("ix_db_objects_snapshot_size", "snapshot_id", text("total_size_bytes DESC NULLS LAST"), "id"),
+        Index("ix_db_objects_snapshot_name", "snapshot_id", "schema_name", "object_name", "id"),
+    )
     # id = Column(Integer, primary_key=True, index=True)
 
     snapshot_id = Column(Integer, ForeignKey("snapshots.id"), nullable=False, index=True)
@@ -26,5 +31,8 @@ class DbObject(BaseClass):
     index_size_bytes = Column(BigInteger, nullable=True)  # pg_indexes_size(), nullable
     toast_size_bytes = Column(BigInteger, nullable=True)  # Size of the TOAST table, if any, nullable
 
+    # Row count estimate from reltuples/n_live_tup (tables, matviews), kept per snapshot for history
+    estimated_row_count = Column(BigInteger, nullable=True)
+
     # Relationships
     snapshot = relationship("Snapshot", back_populates="db_objects") 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, Boolean, BigInteger, Text
+from sqlalchemy import Column, Integer, ForeignKey, String, Boolean, BigInteger, Text, Index
 from sqlalchemy.orm import relationship
 
 # Import the common BaseClass
@@ -7,6 +7,10 @@ from app.db.base_class import BaseClass
 
 class Lock(BaseClass):
     __tablename__ = "locks"
+    __table_args__ = (
+        # Keyset pagination of the latest-locks endpoint
+        Index("ix_locks_snapshot_pid", "snapshot_id", "pid", "id"),
+    )
     # id = Column(Integer, primary_key=True, index=True)
 
     snapshot_id = Column(Integer, ForeignKey("snapshots.id"), nullable=False, index=True)
@@ -15,6 +19,8 @@ class Lock(BaseClass):
     locktype = Column(String)  # Type of the lockable object
     database = Column(BigInteger)  # OID of the database containing the object
     relation = Column(BigInteger)  # OID of the relation target of the lock
+    relation_name = Column(String)  # schema.relation resolved at collection time
+    database_name = Column(String)  # Name of the database resolved at collection time
     page = Column(Integer)  # Page number target of the lock within the relation
     tuple = Column(Integer)  # Tuple number target of the lock within the page
     virtualxid = Column(String)  # Virtual transaction ID holding or awaiting the lock
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, ForeignKey, String, Boolean
+from sqlalchemy.orm import relationship
+
+# Import the common BaseClass
+from app.db.base_class import BaseClass
+
+
+class LockSummary(BaseClass):
+    __tablename__ = "lock_summaries"
+    # id = Column(Integer, primary_key=True, index=True)
+
+    snapshot_id = Column(Integer, ForeignKey("snapshots.id"), nullable=False, index=True)
+
+    # pg_locks aggregated by (locktype, mode, granted), collected every snapshot
+    locktype = Column(String)  # Type of the lockable object
+    mode = Column(String)  # Name of the lock mode held or desired
+    granted = Column(Boolean)  # True if held, false if awaited
+    lock_count = Column(Integer, nullable=False)  # Number of pg_locks rows in the group
+    fastpath_count = Column(Integer, nullable=False, default=0)  # Of which taken via fast path
+
+    # Relationships
+    snapshot = relationship("Snapshot", back_populates="lock_summaries")
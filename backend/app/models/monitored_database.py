@@ -16,8 +16,18 @@ class Connection(BaseClass):
     db_name = Column(String, nullable=False) # Renamed from dbname
     username = Column(String, nullable=False)
     encrypted_password = Column(String, nullable=False)  # Renamed from hashed_password
+    # Per-target overrides of the collector session limits (NULL: COLLECTOR_* settings)
+    statement_timeout_ms = Column(Integer, nullable=True) # statement_timeout of every collector
+    lock_timeout_ms = Column(Integer, nullable=True)
+    idle_in_transaction_timeout_ms = Column(Integer, nullable=True)
     # is_active = Column(Boolean, default=True) # Removed, does not exist in DB
     # is_monitored = Column(Boolean, default=True)  # Removed, does not exist in DB
 
     # Relationships
-    snapshots = relationship("Snapshot", back_populates="database", cascade="all, delete-orphan") 
\ No newline at end of file
+    snapshots = relationship("Snapshot", back_populates="database", cascade="all, delete-orphan")
+    statement_rollups = relationship("StatementStatsHourly", back_populates="database", cascade="all, delete-orphan")
+    statement_rollup_progress = relationship(
+        "StatementRollupProgress", back_populates="database", cascade="all, delete-orphan", uselist=False
+    )
+    object_growth = relationship("ObjectGrowth", back_populates="database", cascade="all, delete-orphan")
+    wait_histograms = relationship("WaitEventHistogram", back_populates="database", cascade="all, delete-orphan") 
\ No newline at end of file
@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, ForeignKey, String, Float, BigInteger, DateTime, Index
+from sqlalchemy.orm import relationship
+
+# Import the common BaseClass
+from app.db.base_class import BaseClass
+
+
+class ObjectGrowth(BaseClass):
+    __tablename__ = "object_growth"
+    __table_args__ = (
+        # One forecast per object; replaced by every forecast run
+        Index("ix_object_growth_object", "database_id", "object_type", "schema_name", "object_name", unique=True),
+        # Ranking the fastest-growing objects of a database
+        Index("ix_object_growth_rate", "database_id", "bytes_per_day"),
+    )
+    # id = Column(Integer, primary_key=True, index=True)
+
+    database_id = Column(Integer, ForeignKey("monitored_databases.id"), nullable=False)
+
+    # Object identity, as in db_objects
+    object_type = Column(String, nullable=False)
+    schema_name = Column(String, nullable=False)
+    object_name = Column(String, nullable=False)
+
+    # Least squares fit of total_size_bytes over the snapshot history
+    computed_at = Column(DateTime(timezone=True), nullable=False)  # When the forecast run happened
+    first_sample_at = Column(DateTime(timezone=True), nullable=False)  # Oldest snapshot used in the fit
+    last_sample_at = Column(DateTime(timezone=True), nullable=False)  # Latest snapshot used in the fit
+    samples = Column(Integer, nullable=False)  # Snapshots used in the fit
+    current_size_bytes = Column(BigInteger, nullable=False)  # Size in the latest snapshot
+    bytes_per_day = Column(Float, nullable=False)  # Fitted growth rate (negative when shrinking)
+    r_squared = Column(Float, nullable=True)  # Goodness of fit, None for a constant size
+    projected_size_30d = Column(BigInteger, nullable=False)  # current_size_bytes + 30 days of growth, floored at 0
+    projected_size_90d = Column(BigInteger, nullable=False)  # current_size_bytes + 90 days of growth, floored at 0
+
+    # Relationships
+    database = relationship("Connection", back_populates="object_growth")
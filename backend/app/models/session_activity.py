@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Text, BigInteger, Boolean
+from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Text, BigInteger, Boolean, Index
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import BaseClass
@@ -6,6 +6,12 @@ from app.db.base_class import BaseClass
 
 class SessionActivity(BaseClass):
     __tablename__ = "session_activity"
+    __table_args__ = (
+        # Keyset pagination of the latest-sessions endpoint
+        Index("ix_session_activity_snapshot_pid", "snapshot_id", "pid", "id"),
+        # Grouping sessions by query shape within a snapshot
+        Index("ix_session_activity_snapshot_fingerprint", "snapshot_id", "query_fingerprint"),
+    )
 
     snapshot_id = Column(Integer, ForeignKey("snapshots.id"), nullable=False, index=True)
 
@@ -30,6 +36,7 @@ class SessionActivity(BaseClass):
     backend_xmin = Column(String) # Type 'xid' might require custom handling or cast
     query_id = Column(BigInteger) # pg_stat_activity in newer PG versions
     query = Column(Text)
+    query_fingerprint = Column(BigInteger) # Shape of `query` (app.core.query_fingerprint), set at ingest
     backend_type = Column(String)
 
     # Relationships
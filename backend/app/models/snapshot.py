@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index, JSON, String
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -7,14 +8,25 @@ from app.db.base_class import BaseClass
 
 class Snapshot(BaseClass):
     __tablename__ = "snapshots"
+    __table_args__ = (
+        # Time range scans of one database (snapshot lookups, per-bucket snapshot counts)
+        Index("ix_snapshots_database_time", "database_id", "snapshot_time"),
+    )
     # id = Column(Integer, primary_key=True, index=True)
 
     database_id = Column(Integer, ForeignKey("monitored_databases.id"), nullable=False) # Use correct table name
     snapshot_time = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Target load when the snapshot was taken (collection_throttle); NULL for snapshots before throttling
+    load_state = Column(String, nullable=True) # normal or pressure
+    skipped_collectors = Column(ARRAY(String), nullable=True) # Heavy collectors not run (NULL: none skipped)
+    load_metrics = Column(JSON, nullable=True) # Backends, probe latency, timeouts and the pressure reasons
 
     # Relationships
     database = relationship("Connection", back_populates="snapshots")
     session_activities = relationship("SessionActivity", back_populates="snapshot", cascade="all, delete-orphan")
     statement_stats = relationship("StatementStats", back_populates="snapshot", cascade="all, delete-orphan")
     db_objects = relationship("DbObject", back_populates="snapshot", cascade="all, delete-orphan")
-    locks = relationship("Lock", back_populates="snapshot", cascade="all, delete-orphan") 
\ No newline at end of file
+    locks = relationship("Lock", back_populates="snapshot", cascade="all, delete-orphan")
+    lock_summaries = relationship("LockSummary", back_populates="snapshot", cascade="all, delete-orphan")
+    statement_regressions = relationship("StatementRegression", back_populates="snapshot", cascade="all, delete-orphan")
+    blocking_tree = relationship("BlockingTree", back_populates="snapshot", uselist=False, cascade="all, delete-orphan") 
\ No newline at end of file
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, ForeignKey, String, Float, BigInteger, Text, DateTime, Index
+from sqlalchemy.orm import relationship
+
+# Import the common BaseClass
+from app.db.base_class import BaseClass
+
+
+class StatementRegression(BaseClass):
+    __tablename__ = "statement_regressions"
+    __table_args__ = (
+        # Regressions of one monitored database, newest first
+        Index("ix_statement_regressions_database_detected", "database_id", "detected_at"),
+    )
+    # id = Column(Integer, primary_key=True, index=True)
+
+    snapshot_id = Column(Integer, ForeignKey("snapshots.id"), nullable=False, index=True)
+    database_id = Column(Integer, ForeignKey("monitored_databases.id"), nullable=False)
+    detected_at = Column(DateTime(timezone=True), nullable=False)  # Time of the snapshot that showed it
+
+    # Statement the flag is about (pg_stat_statements entry key)
+    queryid = Column(BigInteger)
+    userid = Column(BigInteger)
+    dbid = Column(BigInteger)
+    query_fingerprint = Column(BigInteger)
+    query = Column(Text)
+
+    kind = Column(String, nullable=False)  # latency_regression | call_rate_spike | new_top_consumer
+    observed_value = Column(Float)  # Interval value (ms per call, calls/sec, or ms of execution time)
+    baseline_value = Column(Float)  # EWMA baseline it was compared with (None for new_top_consumer)
+    ratio = Column(Float)  # observed / baseline
+    calls_delta = Column(BigInteger)  # Calls during the interval
+    time_delta = Column(Float)  # Execution time (ms) during the interval
+    rank = Column(Integer)  # Position in the interval's top consumers (new_top_consumer only)
+
+    # Relationships
+    snapshot = relationship("Snapshot", back_populates="statement_regressions")
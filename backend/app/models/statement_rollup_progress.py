@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy.orm import relationship
+
+# Import the common BaseClass
+from app.db.base_class import BaseClass
+
+
+class StatementRollupProgress(BaseClass):
+    __tablename__ = "statement_rollup_progress"
+    # id = Column(Integer, primary_key=True, index=True)
+
+    database_id = Column(Integer, ForeignKey("monitored_databases.id"), nullable=False, unique=True)
+    # Start of the last hour rolled up into statement_stats_hourly. Kept apart from the rollup rows,
+    # since an hour can roll up to no rows at all (e.g. no interval with a previous sample)
+    rolled_until = Column(DateTime(timezone=True), nullable=False)
+
+    # Relationships
+    database = relationship("Connection", back_populates="statement_rollup_progress")
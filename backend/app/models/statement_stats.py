@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, Float, BigInteger, Text, Boolean
+from sqlalchemy import Column, Integer, ForeignKey, String, Float, BigInteger, Text, Boolean, Index
 from sqlalchemy.orm import relationship
 
 # Import the common BaseClass
@@ -7,6 +7,12 @@ from app.db.base_class import BaseClass
 
 class StatementStats(BaseClass):
     __tablename__ = "statement_stats"
+    __table_args__ = (
+        # Joining session activity to statements by query shape within a snapshot
+        Index("ix_statement_stats_snapshot_fingerprint", "snapshot_id", "query_fingerprint"),
+        # Time window queries: snapshots in range -> their statements, per queryid
+        Index("ix_statement_stats_snapshot_queryid", "snapshot_id", "queryid"),
+    )
     # id = Column(Integer, primary_key=True, index=True)
 
     snapshot_id = Column(Integer, ForeignKey("snapshots.id"), nullable=False, index=True)
@@ -14,9 +20,12 @@ class StatementStats(BaseClass):
     # Columns from pg_stat_statements
     userid = Column(BigInteger)  # OID of user who executed the statement
     dbid = Column(BigInteger)  # OID of database in which the statement was executed
+    username = Column(String)  # Role name for userid, resolved at collection time
+    database_name = Column(String)  # Database name for dbid, resolved at collection time
     # toplevel = Column(Boolean) # Available in newer PG versions (PG14+)
     queryid = Column(BigInteger, index=True)  # Internal hash code, computed from the statement's parse tree
     query = Column(Text)  # Text of a representative statement
+    query_fingerprint = Column(BigInteger)  # Shape of `query` (app.core.query_fingerprint), set at ingest
 
     # Statistics
     calls = Column(BigInteger)  # Number of times executed
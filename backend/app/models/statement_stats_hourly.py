@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, ForeignKey, Float, BigInteger, Text, DateTime, Index
+from sqlalchemy.orm import relationship
+
+# Import the common BaseClass
+from app.db.base_class import BaseClass
+
+
+class StatementStatsHourly(BaseClass):
+    __tablename__ = "statement_stats_hourly"
+    __table_args__ = (
+        # One row per statement and hour; also serves the time range scans of the top endpoint
+        Index("ix_statement_stats_hourly_bucket", "database_id", "bucket_start", "userid", "dbid", "queryid", unique=True),
+    )
+    # id = Column(Integer, primary_key=True, index=True)
+
+    database_id = Column(Integer, ForeignKey("monitored_databases.id"), nullable=False)
+    bucket_start = Column(DateTime(timezone=True), nullable=False)  # Hour the counted intervals ended in
+
+    # pg_stat_statements entry key
+    userid = Column(BigInteger)
+    dbid = Column(BigInteger)
+    queryid = Column(BigInteger, index=True)
+    query = Column(Text)
+
+    # Counter increases between consecutive snapshots whose later snapshot falls in the hour (resets handled)
+    calls = Column(BigInteger)
+    total_time = Column(Float)
+    rows = Column(BigInteger)
+    shared_blks_hit = Column(BigInteger)
+    shared_blks_read = Column(BigInteger)
+    temp_blks_written = Column(BigInteger)
+    samples = Column(Integer)  # Snapshots of the statement in the hour
+
+    # Relationships
+    database = relationship("Connection", back_populates="statement_rollups")
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, ForeignKey, String, BigInteger, DateTime, Index
+from sqlalchemy.orm import relationship
+
+# Import the common BaseClass
+from app.db.base_class import BaseClass
+
+
+class WaitEventHistogram(BaseClass):
+    __tablename__ = "wait_event_histograms"
+    __table_args__ = (
+        # Upsert target at ingest; also serves the time range reads of the heatmap endpoint
+        Index("ix_wait_event_histograms_bucket", "database_id", "bucket_start", "wait_event_type", "wait_event", unique=True),
+    )
+    # id = Column(Integer, primary_key=True, index=True)
+
+    database_id = Column(Integer, ForeignKey("monitored_databases.id"), nullable=False)
+    bucket_start = Column(DateTime(timezone=True), nullable=False)  # Start of a WAIT_HISTOGRAM_BUCKET_MINUTES bucket
+
+    # Wait event of non-idle sessions; active sessions not waiting count as CPU/CPU
+    wait_event_type = Column(String, nullable=False)
+    wait_event = Column(String, nullable=False)
+
+    session_samples = Column(BigInteger, nullable=False, default=0)  # Sessions in this wait, summed over the bucket's snapshots
+    max_sessions = Column(Integer, nullable=False, default=0)  # Most sessions in this wait in one snapshot
+    snapshots = Column(Integer, nullable=False, default=0)  # Snapshots of the bucket in which the wait was seen
+
+    # Relationships
+    database = relationship("Connection", back_populates="wait_histograms")
@@ -1,15 +1,24 @@
 # backend/app/scheduler.py
 import logging
+import re
+from datetime import datetime, timezone
+from apscheduler.events import (
+    EVENT_JOB_ERROR, EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED, EVENT_JOB_SUBMITTED
+)
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.executors.asyncio import AsyncIOExecutor
 import asyncio # Import asyncio
 import os # Import os module
 
+from app.core import metrics
 from app.core.config import settings
 # Import necessary functions/models
 from app.db.session import SessionLocal # For accessing app DB
 from app.services.snapshot_service import take_snapshot # The job to run
+from app.services.statement_rollups import run_statement_rollups # Hourly statement rollups
+from app.services.growth_forecast import run_growth_forecasts # Object growth forecasts
+from app.services.target_health import target_circuit_breaker # Backoff for unreachable targets
 from app.crud.crud_connection import get_connections # To get monitored DBs
 # from app.core.security import get_password_hash # Original comment, can be removed
 from app.core.security import decrypt # Import decrypt function
@@ -26,13 +35,36 @@ def get_scheduler():
         raise RuntimeError("Scheduler not initialized")
     return scheduler
 
-def init_scheduler():
-    """Initializes and starts the APScheduler."""
+def _job_label(job_id: str) -> str:
+    """Metric label for a job: per-target jobs (snapshot_db_7) share one label (snapshot_db)."""
+    return re.sub(r"_\d+$", "", job_id)
+
+def _record_job_event(event) -> None:
+    """Scheduler listener feeding the scheduler metrics."""
+    job = _job_label(event.job_id)
+    if event.code == EVENT_JOB_SUBMITTED:
+        if event.scheduled_run_times:
+            lag = (datetime.now(timezone.utc) - max(event.scheduled_run_times)).total_seconds()
+            metrics.SCHEDULER_LAG_SECONDS.observe(max(lag, 0.0), job)
+    elif event.code == EVENT_JOB_MAX_INSTANCES:
+        metrics.SCHEDULER_JOB_OVERRUNS.inc(job)
+    elif event.code == EVENT_JOB_MISSED:
+        metrics.SCHEDULER_JOB_MISSED.inc(job)
+    elif event.code == EVENT_JOB_ERROR:
+        metrics.SCHEDULER_JOB_FAILURES.inc(job, type(event.exception).__name__)
+
+def init_scheduler(jobstore=None, event_loop=None):
+    """
+    Initializes and starts the APScheduler. `jobstore` replaces the default
+    SQLAlchemyJobStore on the application database (e.g. a MemoryJobStore in
+    benchmarks/simulate_fleet.py). Pass the running `event_loop` when calling
+    this from a worker thread (see app/startup.py).
+    """
     global scheduler
     logger.info("Initializing scheduler...")
 
     jobstores = {
-        'default': SQLAlchemyJobStore(url=settings.SQLALCHEMY_DATABASE_URI)
+        'default': jobstore or SQLAlchemyJobStore(url=settings.SQLALCHEMY_DATABASE_URI)
         # Consider using a separate DB or schema for job store in production
     }
     executors = {
@@ -47,7 +79,8 @@ def init_scheduler():
         jobstores=jobstores,
         executors=executors,
         job_defaults=job_defaults,
-        timezone='UTC' # Or configure based on requirements
+        timezone='UTC', # Or configure based on requirements
+        event_loop=event_loop
     )
 
     # Add the main snapshot job (runs on interval)
@@ -59,12 +92,32 @@ def init_scheduler():
         replace_existing=True # Replace if job with same ID exists
     )
 
+    # Roll completed hours of statement statistics into statement_stats_hourly
+    scheduler.add_job(
+        run_statement_rollups,
+        'interval',
+        minutes=settings.STATEMENT_ROLLUP_INTERVAL_MINUTES,
+        id='statement_rollups_interval',
+        replace_existing=True
+    )
+
+    # Refit object growth rates from the db_objects size history
+    scheduler.add_job(
+        run_growth_forecasts,
+        'interval',
+        minutes=settings.GROWTH_FORECAST_INTERVAL_MINUTES,
+        id='growth_forecasts_interval',
+        replace_existing=True
+    )
+
+    scheduler.add_listener(
+        _record_job_event,
+        EVENT_JOB_SUBMITTED | EVENT_JOB_MAX_INSTANCES | EVENT_JOB_MISSED | EVENT_JOB_ERROR
+    )
+
     scheduler.start()
     logger.info("Scheduler started.")
-
-    # Trigger the first run immediately after startup - REMOVED
-    # logger.info("Creating task for initial snapshot trigger.")
-    # asyncio.create_task(trigger_snapshot_runs())
+    # The first snapshot run is triggered by app/startup.py once the scheduler is up
 
 def shutdown_scheduler():
     """Shuts down the scheduler gracefully."""
@@ -88,9 +141,18 @@ async def trigger_snapshot_runs():
         logger.info(f"Found {len(monitored_dbs)} databases to potentially snapshot.")
 
         active_dbs = [db_conn for db_conn in monitored_dbs if getattr(db_conn, 'is_active', True)]
-        logger.info(f"Scheduling snapshots for {len(active_dbs)} active databases.")
-
+        # Unreachable databases in backoff are skipped without a connection attempt
+        due_dbs = []
         for db_conn in active_dbs:
+            if target_circuit_breaker.allow(db_conn.id):
+                due_dbs.append(db_conn)
+            else:
+                metrics.COLLECTOR_SKIPPED.inc(db_conn.id, "backoff")
+        if len(due_dbs) < len(active_dbs):
+            logger.info(f"Skipping {len(active_dbs) - len(due_dbs)} unreachable databases in backoff.")
+        logger.info(f"Scheduling snapshots for {len(due_dbs)} active databases.")
+
+        for db_conn in due_dbs:
             # Retrieve encrypted password and decrypt it
             if not hasattr(db_conn, 'encrypted_password') or not db_conn.encrypted_password:
                 logger.warning(f"No encrypted password found for database ID {db_conn.id} ({db_conn.alias}). Skipping snapshot.")
@@ -110,7 +172,10 @@ async def trigger_snapshot_runs():
                 "port": db_conn.port,
                 "db_name": db_conn.db_name,
                 "username": db_conn.username,
-                "password": plain_password
+                "password": plain_password,
+                "statement_timeout_ms": db_conn.statement_timeout_ms,
+                "lock_timeout_ms": db_conn.lock_timeout_ms,
+                "idle_in_transaction_timeout_ms": db_conn.idle_in_transaction_timeout_ms
             }
             # Schedule immediate run for each DB
             job_id = f"snapshot_db_{db_conn.id}"
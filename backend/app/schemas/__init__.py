@@ -1,10 +1,18 @@
-from .connection import Connection, ConnectionCreate, ConnectionUpdate
+from .connection import Connection, ConnectionCreate, ConnectionHealth, ConnectionUpdate
 from .monitoring import (
     ActivityTimeSeries,
     SessionDetailList,
+    SessionQueryGroupList,
     StatementStatList,
+    StatementRegressionList,
+    StatementWindowTopList,
     DbObjectList,
+    ObjectGrowthList,
     LockList,
+    LockTree,
+    LockSummaryList,
+    SnapshotDiff,
+    WaitEventHeatmap,
     # Add other monitoring schemas if needed directly
     ActivityDataPoint,
     SessionDetail,
@@ -12,3 +20,12 @@ from .monitoring import (
     DbObjectDetail,
     LockDetail,
 )
+from .analytics import (
+    StatementRateSeries,
+    StatementLatencyPercentileList,
+    ActivityLoadCorrelation,
+)
+from .health import (
+    LivenessStatus,
+    ReadinessStatus,
+)
@@ -0,0 +1,61 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+# One interval of a statement's rate series
+class StatementRatePoint(BaseModel):
+    timestamp: datetime # End of the interval (snapshot time)
+    calls_per_sec: float
+    ms_per_call: Optional[float] = None # None for intervals without calls
+    rows_per_sec: float
+    ms_per_call_rolling: Optional[float] = None # Trailing mean over `window` intervals
+
+
+class StatementRateSeries(BaseModel):
+    db_id: int
+    queryid: int
+    start_time: datetime
+    end_time: datetime
+    window: int
+    points: List[StatementRatePoint]
+
+
+# Latency distribution of one statement across the snapshot intervals of a window
+class StatementLatencyPercentiles(BaseModel):
+    queryid: int
+    intervals: int # Intervals with calls
+    mean_ms_per_call: float
+    max_ms_per_call: float
+    percentiles: Dict[str, float] # e.g. {"p50": 1.2, "p95": 4.8}
+
+
+class StatementLatencyPercentileList(BaseModel):
+    db_id: int
+    start_time: datetime
+    end_time: datetime
+    statements: List[StatementLatencyPercentiles]
+
+
+# Active sessions next to total statement load for one snapshot
+class ActivityLoadPoint(BaseModel):
+    timestamp: datetime
+    active: float
+    waiting: float
+    calls_per_sec: float
+    exec_ms_per_sec: float
+    active_rolling: Optional[float] = None
+    exec_ms_per_sec_rolling: Optional[float] = None
+
+
+class ActivityLoadCorrelation(BaseModel):
+    db_id: int
+    start_time: datetime
+    end_time: datetime
+    window: int
+    # Pearson coefficients; None when undefined (fewer than 3 points or a constant series)
+    active_vs_calls: Optional[float] = None
+    active_vs_exec_time: Optional[float] = None
+    waiting_vs_exec_time: Optional[float] = None
+    points: List[ActivityLoadPoint]
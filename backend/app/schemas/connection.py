@@ -1,3 +1,4 @@
+from datetime import datetime
 from pydantic import BaseModel, Field, SecretStr, validator
 from typing import Optional
 
@@ -8,6 +9,10 @@ class ConnectionBase(BaseModel):
     port: int = Field(default=5432, example=5432, ge=1, le=65535)
     username: str = Field(..., example="postgres", max_length=100)
     db_name: str = Field(..., example="mydatabase", max_length=100)
+    # Collector session limits for this target; None uses the server-wide defaults
+    statement_timeout_ms: Optional[int] = Field(None, example=20000, ge=0) # Replaces every collector's statement_timeout
+    lock_timeout_ms: Optional[int] = Field(None, example=2000, ge=0)
+    idle_in_transaction_timeout_ms: Optional[int] = Field(None, example=60000, ge=0)
 
     @validator('alias', 'hostname', 'username', 'db_name')
     def not_empty(cls, v):
@@ -27,6 +32,10 @@ class ConnectionUpdate(BaseModel):
     port: Optional[int] = Field(None, example=5433, ge=1, le=65535)
     username: Optional[str] = Field(None, example="admin_user", max_length=100)
     db_name: Optional[str] = Field(None, example="production_db", max_length=100)
+    # Collector session limits; set to null to go back to the server-wide defaults
+    statement_timeout_ms: Optional[int] = Field(None, example=20000, ge=0)
+    lock_timeout_ms: Optional[int] = Field(None, example=2000, ge=0)
+    idle_in_transaction_timeout_ms: Optional[int] = Field(None, example=60000, ge=0)
     # Allow updating the password
     password: Optional[SecretStr] = Field(None, example="newsecretpassword")
 
@@ -47,6 +56,19 @@ class Connection(ConnectionInDBBase):
     """Schema for returning connection details via the API. Excludes password."""
     pass # Inherits all fields from ConnectionInDBBase, no password
 
+class ConnectionHealth(BaseModel):
+    """Collection circuit breaker state of a connection (see app/services/target_health.py)."""
+    db_id: int
+    state: str # closed (collected), open (skipped until retry_at) or half_open (probe in flight)
+    consecutive_failures: int # Failed connection attempts since the last success
+    trips: int # Times the circuit opened since the last success
+    skipped_runs: int # Collection cycles skipped while in backoff
+    last_error: Optional[str] = None
+    last_failure_at: Optional[datetime] = None
+    last_success_at: Optional[datetime] = None
+    opened_at: Optional[datetime] = None # Start of the current outage
+    retry_at: Optional[datetime] = None # Next probe, while open
+
 # This schema might not be strictly necessary if the DB model includes password
 # and orm_mode handles it, but explicitly defining it can be clearer.
 # class ConnectionInDB(ConnectionInDBBase):
@@ -0,0 +1,50 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class LivenessStatus(BaseModel):
+    status: str # Always "alive" when the process answers
+    uptime_seconds: float
+
+
+# Last successful snapshot of one monitored database
+class TargetSnapshotLag(BaseModel):
+    db_id: int
+    alias: str
+    last_snapshot_time: Optional[datetime] = None # None if the target was never snapshotted
+    lag_seconds: Optional[float] = None
+    stale: bool
+
+
+class PoolUsage(BaseModel):
+    db_id: int
+    size: int # Open connections
+    idle: int
+    in_use: int
+    max_size: int
+
+
+class HealthThresholds(BaseModel):
+    db_latency_max_ms: float
+    max_collector_queue: int
+    max_pool_saturation: float
+    snapshot_max_lag_seconds: float
+
+
+class ReadinessStatus(BaseModel):
+    status: str # ready, degraded (ready, but some targets are stale) or not_ready
+    ready: bool
+    reasons: List[str] = [] # Why the instance is not ready or degraded
+    database_connected: bool
+    database_latency_ms: Optional[float] = None
+    scheduler_running: bool
+    collector_queue_depth: int # Snapshot jobs pending in the scheduler plus snapshots running
+    snapshots_running: int
+    pool_saturation: float # In-use share of all target pool connections
+    pools: List[PoolUsage] = []
+    targets: List[TargetSnapshotLag] = []
+    startup_complete: bool # Background startup (scheduler, warm-up, first collection) finished
+    startup_phases: Dict[str, float] = {} # Startup phase -> seconds
+    thresholds: HealthThresholds
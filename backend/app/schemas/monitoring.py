@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field, model_validator
 from app.core.utils import format_bytes_to_pretty_str
@@ -45,6 +45,7 @@ class SessionDetail(BaseModel):
     backend_xmin: Optional[str] = None # Representing xid as string
     query_id: Optional[int] = None
     query: Optional[str] = None
+    query_fingerprint: Optional[int] = None # Shape of the query (literals stripped), joinable to statements
     backend_type: Optional[str] = None
 
     class Config:
@@ -57,6 +58,7 @@ class SessionDetailList(BaseModel):
     snapshot_id: int
     snapshot_time: datetime
     sessions: List[SessionDetail]
+    next_cursor: Optional[str] = None # Pass as `cursor` to fetch the next page
 
 
 # Schema for individual statement statistics
@@ -66,8 +68,11 @@ class StatementStatDetail(BaseModel):
     snapshot_id: int
     userid: Optional[int] = None
     dbid: Optional[int] = None
+    username: Optional[str] = None # Resolved from userid
+    database_name: Optional[str] = None # Resolved from dbid
     queryid: Optional[int] = None
     query: Optional[str] = None
+    query_fingerprint: Optional[int] = None # Same shape hash as SessionDetail.query_fingerprint
     calls: Optional[int] = None
     total_time: Optional[float] = None
     min_time: Optional[float] = None
@@ -100,6 +105,79 @@ class StatementStatList(BaseModel):
     statements: List[StatementStatDetail]
 
 
+# Schema for one statement's consumption within a time window
+class StatementWindowStat(BaseModel):
+    queryid: int
+    query: Optional[str] = None
+    calls: int = 0
+    total_time: float = 0.0 # ms
+    mean_time: Optional[float] = None # ms per call
+    rows: int = 0
+    shared_blks_hit: int = 0
+    shared_blks_read: int = 0
+    temp_blks_written: int = 0
+    samples: int = 0 # Snapshots (or rolled up snapshots) the statement appeared in
+
+
+class StatementWindowTopList(BaseModel):
+    db_id: int
+    start_time: datetime
+    end_time: datetime
+    sort_by: str
+    source: str # "raw" (snapshots only) or "rollup" (hourly rollups plus raw edges)
+    statements: List[StatementWindowStat]
+
+
+# Schema for a statement regression flagged at ingest
+class StatementRegressionDetail(BaseModel):
+    id: int
+    snapshot_id: int
+    detected_at: datetime
+    kind: str # latency_regression | call_rate_spike | new_top_consumer
+    queryid: Optional[int] = None
+    userid: Optional[int] = None
+    dbid: Optional[int] = None
+    query_fingerprint: Optional[int] = None
+    query: Optional[str] = None
+    observed_value: Optional[float] = None # ms per call, calls/sec, or ms of execution time
+    baseline_value: Optional[float] = None
+    ratio: Optional[float] = None
+    calls_delta: Optional[int] = None
+    time_delta: Optional[float] = None
+    rank: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+
+class StatementRegressionList(BaseModel):
+    db_id: int
+    regressions: List[StatementRegressionDetail]
+
+
+# Schema for sessions grouped by query shape
+class SessionQueryGroup(BaseModel):
+    query_fingerprint: int
+    session_count: int
+    active_count: int = 0
+    waiting_count: int = 0 # Sessions with a wait event
+    query_id: Optional[int] = None # compute_query_id, when enabled on the target
+    sample_query: Optional[str] = None # One literal instance of the shape
+    # Cumulative pg_stat_statements totals of the same shape (None if not tracked)
+    queryid: Optional[int] = None
+    calls: Optional[int] = None
+    total_time: Optional[float] = None
+    mean_time: Optional[float] = None
+    rows: Optional[int] = None
+
+
+class SessionQueryGroupList(BaseModel):
+    db_id: int
+    snapshot_id: int
+    snapshot_time: datetime
+    groups: List[SessionQueryGroup]
+
+
 # Schema for individual database object metadata and size
 class DbObjectDetail(BaseModel):
     # Match fields from DbObject model
@@ -113,6 +191,7 @@ class DbObjectDetail(BaseModel):
     index_size_bytes: Optional[int] = None
     toast_size_bytes: Optional[int] = None
     owner: Optional[str] = None
+    estimated_row_count: Optional[int] = None # reltuples/n_live_tup at snapshot time (tables, matviews)
     size_pretty: Optional[str] = Field(None, description="Human-readable size (e.g., '1.2 MiB')")
 
     @model_validator(mode='before')
@@ -135,6 +214,33 @@ class DbObjectList(BaseModel):
     snapshot_id: int
     snapshot_time: datetime
     objects: List[DbObjectDetail]
+    next_cursor: Optional[str] = None # Pass as `cursor` to fetch the next page
+
+
+# Schema for one object's fitted growth
+class ObjectGrowthDetail(BaseModel):
+    object_type: str
+    schema_name: str
+    object_name: str
+    current_size_bytes: int
+    bytes_per_day: float # Least squares slope of total_size_bytes over the history window
+    r_squared: Optional[float] = None # Fit quality, 0..1
+    projected_size_30d: int
+    projected_size_90d: int
+    samples: int
+    first_sample_at: datetime
+    last_sample_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+# Schema for the object growth ranking response
+class ObjectGrowthList(BaseModel):
+    db_id: int
+    computed_at: Optional[datetime] = None # None until the first forecast run
+    sort_by: str
+    objects: List[ObjectGrowthDetail]
 
 
 # Schema for individual lock information
@@ -147,6 +253,9 @@ class LockDetail(BaseModel):
     # Fields corresponding to pg_locks or similar view
     pid: Optional[int] = None
     relation: Optional[int] = None # Changed from relation_name: str to match model's relation: BigInteger (stores OID)
+    relation_name: Optional[str] = None # schema.relation resolved from the relation OID
+    database: Optional[int] = None
+    database_name: Optional[str] = None # Resolved from the database OID
     locktype: Optional[str] = None
     mode: Optional[str] = None
     granted: Optional[bool] = None
@@ -176,6 +285,180 @@ class LockList(BaseModel):
     snapshot_id: int
     snapshot_time: datetime
     locks: List[LockDetail]
+    next_cursor: Optional[str] = None # Pass as `cursor` to fetch the next page
+
+
+# Schema for one lock count group (locktype, mode, granted)
+class LockSummaryRow(BaseModel):
+    locktype: Optional[str] = None
+    mode: Optional[str] = None
+    granted: Optional[bool] = None
+    lock_count: int
+    fastpath_count: int = 0
+
+    class Config:
+        from_attributes = True
+
+
+# Schema for the lock summary response
+class LockSummaryList(BaseModel):
+    db_id: int
+    snapshot_id: int
+    snapshot_time: datetime
+    total_locks: int
+    waiting_locks: int
+    summary: List[LockSummaryRow]
+
+
+# Schema for one session in the blocking tree
+class BlockingNode(BaseModel):
+    pid: int
+    blocked_by: List[int] = [] # pids this session waits for (pg_blocking_pids)
+    blocks: List[int] = [] # pids directly waiting on this session
+    depth: Optional[int] = None # 0 for roots; None if only reachable through a cycle
+    blocked_count: int = 0 # Sessions transitively waiting on this one
+    usename: Optional[str] = None
+    application_name: Optional[str] = None
+    state: Optional[str] = None
+    wait_event_type: Optional[str] = None
+    wait_event: Optional[str] = None
+    xact_start: Optional[datetime] = None
+    query: Optional[str] = None
+
+
+# Schema for the blocking tree response
+class LockTree(BaseModel):
+    db_id: int
+    snapshot_id: int
+    snapshot_time: datetime
+    blocked_sessions: int = 0
+    max_depth: int = 0
+    roots: List[int] = [] # Ordered by blocked_count descending
+    nodes: List[BlockingNode] = []
+    cycles: List[List[int]] = [] # Deadlocks in progress
+
+
+# One wait event's row of the heatmap, aligned with WaitEventHeatmap.buckets
+class WaitEventSeries(BaseModel):
+    wait_event_type: str # CPU for active sessions not waiting
+    wait_event: str
+    total_session_samples: int # Sessions in this wait summed over all snapshots in range
+    avg_sessions: List[Optional[float]] # Per bucket: average sessions per snapshot (None without snapshots)
+    max_sessions: List[int] # Per bucket: peak sessions in one snapshot
+
+
+# Schema for the wait event heatmap response
+class WaitEventHeatmap(BaseModel):
+    db_id: int
+    start_time: datetime # Aligned to bucket boundaries
+    end_time: datetime
+    bucket_minutes: int
+    buckets: List[datetime] # Bucket start times
+    snapshots: List[int] # Snapshots taken per bucket
+    wait_events_total: int # Distinct wait events in range; series holds the busiest `limit`
+    series: List[WaitEventSeries] = []
+
+
+# --- Snapshot Diff Schemas ---
+
+class SnapshotRef(BaseModel):
+    id: int
+    snapshot_time: datetime
+    load_state: Optional[str] = None # normal or pressure; None before load-adaptive collection
+    skipped_collectors: List[str] = [] # Heavy collectors skipped under load; their diff sections are empty
+
+
+# Object present in either snapshot whose size or row estimate differs
+class ObjectSizeChange(BaseModel):
+    change: str # added, dropped or changed
+    object_type: str
+    schema_name: str
+    object_name: str
+    total_size_before: Optional[int] = None
+    total_size_after: Optional[int] = None
+    size_delta: Optional[int] = None
+    rows_before: Optional[int] = None
+    rows_after: Optional[int] = None
+
+
+# Backend (pid, backend_start) present in only one of the snapshots
+class SessionChange(BaseModel):
+    change: str # new or ended
+    pid: Optional[int] = None
+    backend_start: Optional[datetime] = None
+    usename: Optional[str] = None
+    application_name: Optional[str] = None
+    client_addr: Optional[str] = None
+    backend_type: Optional[str] = None
+    state: Optional[str] = None
+    query: Optional[str] = None
+
+
+# pg_locks entry that appeared, disappeared or was granted between the snapshots
+class LockChange(BaseModel):
+    change: str # acquired, waiting, released, wait_ended or granted
+    pid: Optional[int] = None
+    locktype: Optional[str] = None
+    mode: Optional[str] = None
+    database: Optional[int] = None
+    database_name: Optional[str] = None
+    relation: Optional[int] = None
+    relation_name: Optional[str] = None
+    page: Optional[int] = None
+    tuple: Optional[int] = None
+    virtualxid: Optional[str] = None
+    transactionid: Optional[str] = None
+    classid: Optional[int] = None
+    objid: Optional[int] = None
+    objsubid: Optional[int] = None
+    granted_before: Optional[bool] = None
+    granted_after: Optional[bool] = None
+
+
+# Lock count group (locktype, mode, granted) whose count differs
+class LockCountChange(BaseModel):
+    locktype: Optional[str] = None
+    mode: Optional[str] = None
+    granted: Optional[bool] = None
+    count_before: int = 0
+    count_after: int = 0
+    delta: int = 0
+
+
+# Counter increase of one statement between the snapshots
+class StatementDelta(BaseModel):
+    change: str # changed, new, reset (counters went down) or evicted
+    userid: Optional[int] = None
+    dbid: Optional[int] = None
+    username: Optional[str] = None
+    database_name: Optional[str] = None
+    queryid: Optional[int] = None
+    query: Optional[str] = None
+    calls: Optional[int] = None
+    total_time: Optional[float] = None
+    mean_time: Optional[float] = None
+    rows: Optional[int] = None
+    shared_blks_read: Optional[int] = None
+    temp_blks_written: Optional[int] = None
+
+
+# Schema for the snapshot diff response. The *_changes maps count every change by
+# kind; the row lists are capped at `limit` each, largest changes first.
+class SnapshotDiff(BaseModel):
+    db_id: int
+    from_snapshot: SnapshotRef
+    to_snapshot: SnapshotRef
+    elapsed_seconds: float
+    object_changes: Dict[str, int] = {}
+    objects: List[ObjectSizeChange] = []
+    total_size_delta: Optional[int] = None
+    session_changes: Dict[str, int] = {}
+    sessions: List[SessionChange] = []
+    lock_changes: Dict[str, int] = {}
+    locks: List[LockChange] = []
+    lock_counts: List[LockCountChange] = []
+    statement_changes: Dict[str, int] = {}
+    statements: List[StatementDelta] = []
 
 
 # --- Detailed Object Information Schemas ---
@@ -250,13 +533,42 @@ class ObjectFullDetails(BaseModel):
     class Config:
         from_attributes = True
 
+class ObjectDetailsCacheStats(BaseModel):
+    hits: int
+    misses: int
+    invalidations: int # Cached entries refetched because the catalog changed
+    evictions: int # Entries dropped by the per-target size bound
+    hit_ratio: Optional[float] = None
+    entries: int
+    targets: int
+    max_entries_per_target: int
+
 # New schema for row count response
 class ObjectRowCount(BaseModel):
     row_count: Optional[int] = None
+    precision: str = "exact" # 'estimate' (planner statistics) or 'exact' (COUNT(*))
+    source: Optional[str] = None # reltuples, n_live_tup or count
 
     class Config:
         from_attributes = True
 
+# Background exact row count job
+class RowCountJob(BaseModel):
+    job_id: str
+    db_id: int
+    schema_name: str
+    object_name: str
+    status: str # pending, running, succeeded, failed, cancelled
+    submitted_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    elapsed_seconds: Optional[float] = None # Progress indicator while running
+    row_count: Optional[int] = None
+    estimated_row_count: Optional[int] = None # Statistics estimate, known once the job starts
+    counted_at: Optional[datetime] = None # When row_count was computed
+    cached: bool = False # True if row_count was served from an earlier job
+    error: Optional[str] = None
+
 # End of new schemas
 
 # Add other monitoring-related schemas here... 
\ No newline at end of file
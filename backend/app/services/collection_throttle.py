@@ -0,0 +1,102 @@
+# backend/app/services/collection_throttle.py
+import logging
+from typing import Any, Dict, List, Mapping, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Collectors that read a lot from the target (full pg_stat_statements, a size function call per relation)
+HEAVY_COLLECTORS = ("statements", "objects")
+
+# Weight of the newest probe latency in its baseline
+BASELINE_ALPHA = 0.2
+
+# One cheap round trip before the heavy collectors; its own latency is a signal too
+PRESSURE_QUERY = """
+    SELECT
+        count(*) FILTER (WHERE backend_type = 'client backend') AS backends,
+        count(*) FILTER (WHERE backend_type = 'client backend' AND state = 'active') AS active,
+        current_setting('max_connections')::int AS max_connections
+    FROM pg_stat_activity
+"""
+
+
+class _TargetLoad:
+    def __init__(self):
+        self.probe_ewma_ms: Optional[float] = None # Probe latency baseline, updated only without pressure
+        self.timeouts = 0 # Collector queries cancelled by statement_timeout or lock_timeout since the last assessment
+        self.snapshots_under_pressure = 0 # Consecutive snapshots assessed under pressure
+
+
+class CollectionThrottle:
+    """
+    Decides per snapshot whether a monitored database is under pressure, and if
+    so which heavy collectors to skip.
+
+    Pressure is any of: client backends at THROTTLE_BACKENDS_RATIO of
+    max_connections, active backends at THROTTLE_ACTIVE_RATIO of max_connections,
+    the pressure probe taking THROTTLE_LATENCY_FACTOR times its baseline (and at
+    least THROTTLE_MIN_LATENCY_MS), or collector queries of the previous snapshot
+    hitting statement_timeout or lock_timeout. Under pressure the heavy
+    collectors run only every THROTTLE_HEAVY_EVERY-th snapshot (0: not at all),
+    which stretches their interval; the other collectors are cheap and always run.
+    """
+
+    def __init__(self):
+        self._targets: Dict[int, _TargetLoad] = {}
+
+    def record_timeout(self, db_id: int) -> None:
+        self._targets.setdefault(db_id, _TargetLoad()).timeouts += 1
+
+    def assess(self, db_id: int, probe: Optional[Mapping[str, Any]], probe_ms: Optional[float]) -> Dict[str, Any]:
+        """
+        Returns the snapshot's load record: `state` (normal or pressure), the
+        `skipped` heavy collectors and the `metrics` behind the decision.
+        `probe` is the PRESSURE_QUERY row, None if the probe failed.
+        """
+        load = self._targets.setdefault(db_id, _TargetLoad())
+        reasons: List[str] = []
+        metrics: Dict[str, Any] = {"probe_ms": probe_ms, "baseline_ms": load.probe_ewma_ms, "timeouts": load.timeouts}
+
+        if probe is None:
+            reasons.append("pressure probe failed")
+        else:
+            max_connections = probe["max_connections"] or 1
+            metrics.update(backends=probe["backends"], active=probe["active"], max_connections=probe["max_connections"])
+            if probe["backends"] >= settings.THROTTLE_BACKENDS_RATIO * max_connections:
+                reasons.append(f"{probe['backends']} of {max_connections} connections in use")
+            if probe["active"] >= settings.THROTTLE_ACTIVE_RATIO * max_connections:
+                reasons.append(f"{probe['active']} active backends (max_connections {max_connections})")
+        if (probe_ms is not None and load.probe_ewma_ms is not None
+                and probe_ms >= settings.THROTTLE_MIN_LATENCY_MS
+                and probe_ms >= settings.THROTTLE_LATENCY_FACTOR * load.probe_ewma_ms):
+            reasons.append(f"probe took {probe_ms:.0f} ms (baseline {load.probe_ewma_ms:.0f} ms)")
+        if load.timeouts:
+            reasons.append(f"{load.timeouts} collector queries timed out")
+        load.timeouts = 0
+
+        skipped: List[str] = []
+        if reasons:
+            load.snapshots_under_pressure += 1
+            every = settings.THROTTLE_HEAVY_EVERY
+            if every <= 0 or load.snapshots_under_pressure % every != 0:
+                skipped = list(HEAVY_COLLECTORS)
+        else:
+            load.snapshots_under_pressure = 0
+            if probe_ms is not None:
+                baseline = load.probe_ewma_ms
+                load.probe_ewma_ms = probe_ms if baseline is None else baseline + BASELINE_ALPHA * (probe_ms - baseline)
+
+        metrics["reasons"] = reasons
+        if skipped:
+            logger.warning(f"Database ID {db_id} under pressure ({'; '.join(reasons)}); skipping {', '.join(skipped)}.")
+        elif reasons:
+            logger.info(f"Database ID {db_id} under pressure ({'; '.join(reasons)}); running heavy collectors this time.")
+        return {"state": "pressure" if reasons else "normal", "skipped": skipped, "metrics": metrics}
+
+    def forget_target(self, db_id: int) -> None:
+        self._targets.pop(db_id, None)
+
+
+collection_throttle = CollectionThrottle()
@@ -0,0 +1,83 @@
+# backend/app/services/growth_forecast.py
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400.0
+FORECAST_HORIZON_DAYS = {"projected_size_30d": 30, "projected_size_90d": 90}
+
+
+def forecast_object_growth(db: Session, db_id: int, now: Optional[datetime] = None) -> int:
+    """
+    Fits the size history of every object of one database over the last
+    GROWTH_FORECAST_WINDOW_DAYS and replaces its object_growth rows. Only
+    objects present in the latest snapshot are forecast. Returns rows written.
+    """
+    # Imported here so NumPy loads with the first forecast, not with the scheduler
+    import numpy as np
+
+    from app.services import history_analytics
+
+    now = now or datetime.now(timezone.utc)
+    start_time = now - timedelta(days=settings.GROWTH_FORECAST_WINDOW_DAYS)
+    current = {row.object_key: row for row in db.execute(history_analytics.CURRENT_OBJECTS_QUERY, {"db_id": db_id, "end_time": now})}
+    history = history_analytics.load_object_size_history(db, db_id, start_time, now)
+
+    rows = []
+    if current and len(history):
+        # Fit in days since the window start: slope is bytes per day
+        days = (history["ts"] - start_time.timestamp()) / SECONDS_PER_DAY
+        fit = history_analytics.grouped_linear_fit(history["object_key"], days, history["size"])
+        usable = (fit["count"] >= settings.GROWTH_FORECAST_MIN_SAMPLES) & np.isfinite(fit["slope"]) \
+            & np.isin(fit["keys"], np.fromiter(current.keys(), dtype="i8", count=len(current)))
+        for i in np.flatnonzero(usable):
+            obj = current[int(fit["keys"][i])]
+            size, slope = float(fit["last_y"][i]), float(fit["slope"][i])
+            rows.append({
+                "database_id": db_id,
+                "object_type": obj.object_type,
+                "schema_name": obj.schema_name,
+                "object_name": obj.object_name,
+                "computed_at": now,
+                "first_sample_at": start_time + timedelta(days=float(fit["first_x"][i])),
+                "last_sample_at": start_time + timedelta(days=float(fit["last_x"][i])),
+                "samples": int(fit["count"][i]),
+                "current_size_bytes": int(size),
+                "bytes_per_day": slope,
+                "r_squared": float(fit["r_squared"][i]) if np.isfinite(fit["r_squared"][i]) else None,
+                **{column: int(max(size + slope * horizon, 0.0)) for column, horizon in FORECAST_HORIZON_DAYS.items()},
+            })
+
+    db.execute(delete(models.ObjectGrowth).where(models.ObjectGrowth.database_id == db_id))
+    if rows:
+        db.execute(insert(models.ObjectGrowth), rows)
+    db.commit()
+    return len(rows)
+
+
+def forecast_all_databases() -> None:
+    """Refits growth forecasts for every monitored database."""
+    with SessionLocal() as db:
+        db_ids = db.execute(select(models.Connection.id)).scalars().all()
+        for db_id in db_ids:
+            try:
+                written = forecast_object_growth(db, db_id)
+                logger.info(f"Stored {written} object growth forecasts for database ID {db_id}.")
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Growth forecast failed for database ID {db_id}: {e}", exc_info=True)
+
+
+async def run_growth_forecasts():
+    """Scheduler job: runs the (synchronous, NumPy-bound) forecasts in a worker thread."""
+    await asyncio.to_thread(forecast_all_databases)
@@ -0,0 +1,331 @@
+# backend/app/services/history_analytics.py
+"""
+Long-window statistics over the snapshot history tables.
+
+Loaders stream one query per request through COPY ... (FORMAT binary): with
+only non-null 8-byte numeric columns every row has the same size, so the
+result is read as a single NumPy buffer without building a Python object per
+row. The compute functions are pure array code, so they can be benchmarked on
+synthetic data (see benchmarks/bench_history_analytics.py).
+"""
+import io
+import logging
+from datetime import datetime
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Cumulative statement counters per snapshot. Unordered and not aggregated: sorting and
+# summing over users/databases is cheaper in NumPy (see load_statement_history).
+# Every column must be non-null and 8 bytes wide for the binary COPY decoding.
+STATEMENT_HISTORY_QUERY = text("""
+    SELECT
+        extract(epoch FROM s.snapshot_time)::float8 AS ts,
+        st.queryid::int8,
+        coalesce(st.calls, 0)::float8 AS calls,
+        coalesce(st.total_time, 0)::float8 AS total_time,
+        coalesce(st.rows, 0)::float8 AS rows
+    FROM statement_stats st
+    JOIN snapshots s ON s.id = st.snapshot_id
+    WHERE s.database_id = :db_id
+      AND s.snapshot_time >= :start_time
+      AND s.snapshot_time <= :end_time
+      AND st.queryid IS NOT NULL
+      AND (CAST(:queryid AS bigint) IS NULL OR st.queryid = CAST(:queryid AS bigint))
+""")
+
+# Sessions per snapshot (snapshots without sessions count as zero)
+ACTIVITY_HISTORY_QUERY = text("""
+    SELECT
+        extract(epoch FROM s.snapshot_time)::float8 AS ts,
+        count(sa.id)::float8 AS sessions,
+        count(sa.id) FILTER (WHERE sa.state = 'active')::float8 AS active,
+        count(sa.id) FILTER (WHERE sa.wait_event_type IS NOT NULL AND sa.state = 'active')::float8 AS waiting
+    FROM snapshots s
+    LEFT JOIN session_activity sa ON sa.snapshot_id = s.id
+    WHERE s.database_id = :db_id
+      AND s.snapshot_time >= :start_time
+      AND s.snapshot_time <= :end_time
+    GROUP BY s.id, s.snapshot_time
+    ORDER BY s.snapshot_time
+""")
+
+# Object sizes per snapshot. Objects are keyed by a 64-bit hash of their identity so
+# the query needs no sort or GROUP BY; OBJECT_KEY_EXPRESSION maps names to the same keys.
+OBJECT_KEY_EXPRESSION = "hashtextextended(o.object_type || '/' || o.schema_name || '.' || o.object_name, 0)"
+OBJECT_SIZE_HISTORY_QUERY = text(f"""
+    SELECT
+        extract(epoch FROM s.snapshot_time)::float8 AS ts,
+        {OBJECT_KEY_EXPRESSION} AS object_key,
+        o.total_size_bytes::float8 AS size
+    FROM db_objects o
+    JOIN snapshots s ON s.id = o.snapshot_id
+    WHERE s.database_id = :db_id
+      AND s.snapshot_time >= :start_time
+      AND s.snapshot_time <= :end_time
+      AND o.total_size_bytes IS NOT NULL
+""")
+
+# Objects of the latest snapshot in the window, keyed like OBJECT_SIZE_HISTORY_QUERY
+CURRENT_OBJECTS_QUERY = text(f"""
+    SELECT {OBJECT_KEY_EXPRESSION} AS object_key, o.object_type, o.schema_name, o.object_name
+    FROM db_objects o
+    WHERE o.snapshot_id = (
+        SELECT s.id FROM snapshots s
+        WHERE s.database_id = :db_id
+          AND s.snapshot_time <= :end_time
+          AND EXISTS (SELECT 1 FROM db_objects d WHERE d.snapshot_id = s.id)
+        ORDER BY s.snapshot_time DESC
+        LIMIT 1
+    )
+""")
+
+STATEMENT_DTYPE = np.dtype([("ts", "f8"), ("queryid", "i8"), ("calls", "f8"), ("total_time", "f8"), ("rows", "f8")])
+ACTIVITY_DTYPE = np.dtype([("ts", "f8"), ("sessions", "f8"), ("active", "f8"), ("waiting", "f8")])
+OBJECT_SIZE_DTYPE = np.dtype([("ts", "f8"), ("object_key", "i8"), ("size", "f8")])
+
+
+# Binary COPY framing: 11-byte signature + 4-byte flags + 4-byte extension length,
+# then per row a 2-byte field count and a 4-byte length before every field, then a
+# 2-byte trailer. All big-endian.
+_COPY_HEADER_SIZE = 19
+_COPY_TRAILER_SIZE = 2
+
+
+def _load(db: Session, query, dtype: np.dtype, params: dict) -> np.ndarray:
+    """Runs a query of non-null 8-byte numeric columns through binary COPY into a structured array."""
+    wire_fields = [("field_count", ">i2")]
+    for name in dtype.names:
+        wire_fields += [(f"{name}_length", ">i4"), (name, dtype[name].newbyteorder(">"))]
+    wire_dtype = np.dtype(wire_fields)
+
+    cursor = db.connection().connection.cursor()
+    try:
+        compiled = query.compile(dialect=db.get_bind().dialect)
+        sql = cursor.mogrify(str(compiled), {key: params.get(key) for key in compiled.params}).decode()
+        buffer = io.BytesIO()
+        cursor.copy_expert(f"COPY ({sql}) TO STDOUT WITH (FORMAT binary)", buffer)
+    finally:
+        cursor.close()
+
+    payload = buffer.getbuffer()[_COPY_HEADER_SIZE:len(buffer.getbuffer()) - _COPY_TRAILER_SIZE]
+    wire = np.frombuffer(payload, dtype=wire_dtype)
+    result = np.empty(len(wire), dtype=dtype)
+    for name in dtype.names:
+        result[name] = wire[name]
+    return result
+
+
+def load_statement_history(
+    db: Session,
+    db_id: int,
+    start_time: datetime,
+    end_time: datetime,
+    queryid: Optional[int] = None
+) -> np.ndarray:
+    """Loads cumulative statement counters as a STATEMENT_DTYPE array, ordered by (queryid, ts)."""
+    rows = _load(db, STATEMENT_HISTORY_QUERY, STATEMENT_DTYPE, {
+        "db_id": db_id, "start_time": start_time, "end_time": end_time, "queryid": queryid
+    })
+    return merge_statement_rows(rows)
+
+
+def merge_statement_rows(rows: np.ndarray) -> np.ndarray:
+    """Sorts rows by (queryid, ts) and sums entries of the same queryid and snapshot (different users/databases)."""
+    if len(rows) == 0:
+        return rows
+    rows = rows[np.lexsort((rows["ts"], rows["queryid"]))]
+    starts = np.flatnonzero(np.r_[True, (rows["queryid"][1:] != rows["queryid"][:-1]) | (rows["ts"][1:] != rows["ts"][:-1])])
+    if len(starts) == len(rows):
+        return rows
+    merged = rows[starts]
+    for name in ("calls", "total_time", "rows"):
+        merged[name] = np.add.reduceat(rows[name], starts)
+    return merged
+
+
+def load_activity_history(db: Session, db_id: int, start_time: datetime, end_time: datetime) -> np.ndarray:
+    """Loads per-snapshot session counts as an ACTIVITY_DTYPE array, ordered by ts."""
+    return _load(db, ACTIVITY_HISTORY_QUERY, ACTIVITY_DTYPE, {
+        "db_id": db_id, "start_time": start_time, "end_time": end_time
+    })
+
+
+def load_object_size_history(db: Session, db_id: int, start_time: datetime, end_time: datetime) -> np.ndarray:
+    """Loads object sizes as an OBJECT_SIZE_DTYPE array, unordered."""
+    return _load(db, OBJECT_SIZE_HISTORY_QUERY, OBJECT_SIZE_DTYPE, {
+        "db_id": db_id, "start_time": start_time, "end_time": end_time
+    })
+
+
+def statement_intervals(history: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Turns cumulative counters (ordered by queryid, ts) into per-interval deltas.
+
+    Returns arrays of equal length, one entry per valid interval: queryid, ts
+    (interval end), dt (seconds), calls_per_sec, ms_per_call (NaN without calls),
+    rows_per_sec and exec_ms_per_sec. Intervals that span two statements or a
+    counter reset (negative delta) are dropped.
+    """
+    if len(history) < 2:
+        empty = np.empty(0)
+        return {"queryid": np.empty(0, dtype="i8"), "ts": empty, "dt": empty, "calls_per_sec": empty,
+                "ms_per_call": empty, "rows_per_sec": empty, "exec_ms_per_sec": empty}
+
+    dt = np.diff(history["ts"])
+    d_calls = np.diff(history["calls"])
+    d_time = np.diff(history["total_time"])
+    d_rows = np.diff(history["rows"])
+    valid = (history["queryid"][1:] == history["queryid"][:-1]) & (dt > 0) & (d_calls >= 0) & (d_time >= 0)
+
+    dt, d_calls, d_time, d_rows = dt[valid], d_calls[valid], d_time[valid], d_rows[valid]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ms_per_call = np.where(d_calls > 0, d_time / d_calls, np.nan)
+    return {
+        "queryid": history["queryid"][1:][valid],
+        "ts": history["ts"][1:][valid],
+        "dt": dt,
+        "calls_per_sec": d_calls / dt,
+        "ms_per_call": ms_per_call,
+        "rows_per_sec": np.maximum(d_rows, 0) / dt,
+        "exec_ms_per_sec": d_time / dt,
+    }
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over `window` samples (NaNs ignored); the first window-1 entries use what is available."""
+    if window <= 1 or len(values) == 0:
+        return values.astype("f8", copy=True)
+    finite = np.isfinite(values)
+    sums = np.cumsum(np.where(finite, values, 0.0))
+    counts = np.cumsum(finite)
+    sums[window:] = sums[window:] - sums[:-window]
+    counts[window:] = counts[window:] - counts[:-window]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def grouped_quantiles(keys: np.ndarray, values: np.ndarray, quantiles: Sequence[float]) -> Dict[str, np.ndarray]:
+    """
+    Quantiles of `values` per distinct key, fully vectorized: one lexsort, then
+    linear interpolation between order statistics of every group at once.
+    NaN values are ignored. Returns keys, count, mean, max and one array per quantile.
+    """
+    finite = np.isfinite(values)
+    keys, values = keys[finite], values[finite]
+    if len(keys) == 0:
+        result = {"keys": np.empty(0, dtype=keys.dtype), "count": np.empty(0, dtype="i8"),
+                  "mean": np.empty(0), "max": np.empty(0)}
+        result.update({q: np.empty(0) for q in quantiles})
+        return result
+
+    order = np.lexsort((values, keys))
+    keys, values = keys[order], values[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    counts = np.diff(np.r_[starts, len(keys)])
+
+    result = {
+        "keys": keys[starts],
+        "count": counts,
+        "mean": np.add.reduceat(values, starts) / counts,
+        "max": values[starts + counts - 1],
+    }
+    for q in quantiles:
+        position = starts + q * (counts - 1)
+        lower = np.floor(position).astype("i8")
+        upper = np.minimum(lower + 1, starts + counts - 1)
+        weight = position - lower
+        result[q] = values[lower] * (1.0 - weight) + values[upper] * weight
+    return result
+
+
+def load_by_snapshot(intervals: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Sums every statement's interval rates per snapshot (interval end time)."""
+    ts, inverse = np.unique(intervals["ts"], return_inverse=True)
+    return {
+        "ts": ts,
+        "calls_per_sec": np.bincount(inverse, weights=intervals["calls_per_sec"], minlength=len(ts)),
+        "exec_ms_per_sec": np.bincount(inverse, weights=intervals["exec_ms_per_sec"], minlength=len(ts)),
+    }
+
+
+def pearson(x: np.ndarray, y: np.ndarray) -> Optional[float]:
+    """Pearson correlation of two aligned series; None if undefined (too short or constant)."""
+    mask = np.isfinite(x) & np.isfinite(y)
+    x, y = x[mask], y[mask]
+    if len(x) < 3:
+        return None
+    x = x - x.mean()
+    y = y - y.mean()
+    denominator = np.sqrt((x * x).sum() * (y * y).sum())
+    if denominator == 0:
+        return None
+    return float((x * y).sum() / denominator)
+
+
+def activity_statement_correlation(activity: np.ndarray, intervals: Dict[str, np.ndarray], window: int = 1) -> Dict[str, object]:
+    """
+    Aligns active sessions with total statement load per snapshot and correlates them.
+    Only snapshots present in both series take part.
+    """
+    load = load_by_snapshot(intervals)
+    common, activity_index, load_index = np.intersect1d(activity["ts"], load["ts"], return_indices=True)
+    active = activity["active"][activity_index]
+    waiting = activity["waiting"][activity_index]
+    calls_per_sec = load["calls_per_sec"][load_index]
+    exec_ms_per_sec = load["exec_ms_per_sec"][load_index]
+    return {
+        "ts": common,
+        "active": active,
+        "waiting": waiting,
+        "calls_per_sec": calls_per_sec,
+        "exec_ms_per_sec": exec_ms_per_sec,
+        "active_rolling": rolling_mean(active, window),
+        "exec_ms_per_sec_rolling": rolling_mean(exec_ms_per_sec, window),
+        "active_vs_calls": pearson(active, calls_per_sec),
+        "active_vs_exec_time": pearson(active, exec_ms_per_sec),
+        "waiting_vs_exec_time": pearson(waiting, exec_ms_per_sec),
+    }
+
+
+def grouped_linear_fit(keys: np.ndarray, x: np.ndarray, y: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Ordinary least squares y = intercept + slope * x per distinct key, for all
+    groups at once: one lexsort, then per-group sums of centered products via
+    reduceat. Returns keys, count, slope, r_squared (NaN for a constant y),
+    first_x, last_x and last_y. Slope is NaN for groups with a single distinct x.
+    """
+    if len(keys) == 0:
+        empty = np.empty(0)
+        return {"keys": np.empty(0, dtype=keys.dtype), "count": np.empty(0, dtype="i8"), "slope": empty,
+                "r_squared": empty, "first_x": empty, "last_x": empty, "last_y": empty}
+
+    order = np.lexsort((x, keys))
+    keys, x, y = keys[order], x[order], y[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    counts = np.diff(np.r_[starts, len(keys)])
+    group = np.repeat(np.arange(len(starts)), counts)
+
+    # Centering per group keeps the sums exact enough for epoch-sized x values
+    dx = x - (np.add.reduceat(x, starts) / counts)[group]
+    dy = y - (np.add.reduceat(y, starts) / counts)[group]
+    sxx = np.add.reduceat(dx * dx, starts)
+    sxy = np.add.reduceat(dx * dy, starts)
+    syy = np.add.reduceat(dy * dy, starts)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(sxx > 0, sxy / sxx, np.nan)
+        r_squared = np.where((sxx > 0) & (syy > 0), sxy * sxy / (sxx * syy), np.nan)
+    last = starts + counts - 1
+    return {
+        "keys": keys[starts],
+        "count": counts,
+        "slope": slope,
+        "r_squared": r_squared,
+        "first_x": x[starts],
+        "last_x": x[last],
+        "last_y": y[last],
+    }
@@ -0,0 +1,150 @@
+# backend/app/services/lock_analysis.py
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+# Session fields copied into each node of the stored tree
+NODE_SESSION_FIELDS = ("usename", "application_name", "state", "wait_event_type", "wait_event")
+QUERY_PREVIEW_LENGTH = 1000
+
+
+def _strongly_connected_cycles(edges: Mapping[int, Sequence[int]]) -> List[List[int]]:
+    """Returns the cycles of a wait-for graph (SCCs with more than one node, or a self-loop). Iterative Tarjan."""
+    index: Dict[int, int] = {}
+    lowlink: Dict[int, int] = {}
+    on_stack = set()
+    stack: List[int] = []
+    cycles: List[List[int]] = []
+    counter = 0
+
+    for start in edges:
+        if start in index:
+            continue
+        work = [(start, iter(edges.get(start, ())))]
+        index[start] = lowlink[start] = counter
+        counter += 1
+        stack.append(start)
+        on_stack.add(start)
+        while work:
+            node, successors = work[-1]
+            advanced = False
+            for succ in successors:
+                if succ not in index:
+                    index[succ] = lowlink[succ] = counter
+                    counter += 1
+                    stack.append(succ)
+                    on_stack.add(succ)
+                    work.append((succ, iter(edges.get(succ, ()))))
+                    advanced = True
+                    break
+                if succ in on_stack:
+                    lowlink[node] = min(lowlink[node], index[succ])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                if len(component) > 1 or node in edges.get(node, ()):
+                    cycles.append(sorted(component))
+    return cycles
+
+
+def build_blocking_tree(activity_records: Iterable[Mapping[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Resolves the wait-for graph captured with pg_blocking_pids() into blocking chains.
+
+    Each activity record may carry `blocking_pids` (the pids it waits for).
+    Returns None when nobody is blocked; otherwise a compact JSON-ready dict:
+
+        roots:   pids that block others but are not blocked themselves,
+                 ordered by how many sessions they block transitively
+        nodes:   one entry per involved pid with blocked_by, blocks, depth
+                 (distance from its root; None for pids only reachable
+                 through a cycle) and blocked_count (sessions transitively
+                 waiting on it)
+        cycles:  groups of pids waiting on each other (deadlock in progress)
+    """
+    sessions: Dict[int, Mapping[str, Any]] = {}
+    blocked_by: Dict[int, List[int]] = {}
+    for record in activity_records:
+        pid = record.get("pid")
+        if pid is None:
+            continue
+        sessions[pid] = record
+        blockers = record.get("blocking_pids")
+        if blockers:
+            blocked_by[pid] = sorted(set(blockers))
+
+    if not blocked_by:
+        return None
+
+    blocks: Dict[int, List[int]] = {}
+    for pid, blockers in blocked_by.items():
+        for blocker in blockers:
+            blocks.setdefault(blocker, []).append(pid)
+    involved = set(blocked_by) | set(blocks)
+
+    # Transitive blocked count: everything reachable along "blocks" edges
+    blocked_count: Dict[int, int] = {}
+    for pid in involved:
+        seen = set()
+        pending = list(blocks.get(pid, ()))
+        while pending:
+            waiter = pending.pop()
+            if waiter in seen or waiter == pid:
+                continue
+            seen.add(waiter)
+            pending.extend(blocks.get(waiter, ()))
+        blocked_count[pid] = len(seen)
+
+    roots = sorted(
+        (pid for pid in involved if pid not in blocked_by),
+        key=lambda pid: (-blocked_count[pid], pid)
+    )
+
+    # Depth: BFS level from the roots
+    depth: Dict[int, int] = {pid: 0 for pid in roots}
+    frontier = list(roots)
+    while frontier:
+        next_frontier = []
+        for pid in frontier:
+            for waiter in blocks.get(pid, ()):
+                if waiter not in depth:
+                    depth[waiter] = depth[pid] + 1
+                    next_frontier.append(waiter)
+        frontier = next_frontier
+
+    cycles = _strongly_connected_cycles(blocked_by)
+
+    nodes = []
+    for pid in sorted(involved, key=lambda p: (depth.get(p, len(involved)), p)):
+        session = sessions.get(pid, {})
+        query = session.get("query")
+        xact_start = session.get("xact_start")
+        node = {
+            "pid": pid,
+            "blocked_by": blocked_by.get(pid, []),
+            "blocks": sorted(blocks.get(pid, [])),
+            "depth": depth.get(pid),
+            "blocked_count": blocked_count[pid],
+            "xact_start": xact_start.isoformat() if xact_start is not None else None,
+            "query": query[:QUERY_PREVIEW_LENGTH] if query else None,
+        }
+        for field in NODE_SESSION_FIELDS:
+            node[field] = session.get(field)
+        nodes.append(node)
+
+    return {
+        "roots": roots,
+        "nodes": nodes,
+        "cycles": cycles,
+        "blocked_sessions": len(blocked_by),
+        "max_depth": max(depth.values()) if depth else 0,
+    }
@@ -0,0 +1,121 @@
+# backend/app/services/object_details_cache.py
+import logging
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import asyncpg
+
+from app import schemas
+from app.core.config import settings
+from app.services import object_details_service
+
+logger = logging.getLogger(__name__)
+
+# Cheap change marker for a relation's catalog entries, keyed by its resolved OID.
+# Any DDL that changes what the details view shows rewrites at least one of these
+# catalog rows and therefore changes its xmin: ALTER TABLE/OWNER (pg_class),
+# TRUNCATE/VACUUM FULL/CLUSTER (relfilenode), column changes (pg_attribute),
+# CREATE/DROP INDEX (pg_index), constraints (pg_constraint), COMMENT ON
+# (pg_description) and CREATE OR REPLACE VIEW (pg_rewrite).
+CATALOG_MARKER_QUERY = """
+    SELECT
+        c.oid,
+        md5(concat_ws('|',
+            c.xmin::text,
+            c.relfilenode::text,
+            (SELECT string_agg(a.xmin::text, ',' ORDER BY a.attnum)
+             FROM pg_catalog.pg_attribute a WHERE a.attrelid = c.oid AND a.attnum > 0),
+            (SELECT string_agg(i.indexrelid::text || ':' || i.xmin::text, ',' ORDER BY i.indexrelid)
+             FROM pg_catalog.pg_index i WHERE i.indrelid = c.oid),
+            (SELECT string_agg(con.oid::text || ':' || con.xmin::text, ',' ORDER BY con.oid)
+             FROM pg_catalog.pg_constraint con WHERE con.conrelid = c.oid),
+            (SELECT string_agg(d.objsubid::text || ':' || d.xmin::text, ',' ORDER BY d.objsubid)
+             FROM pg_catalog.pg_description d
+             WHERE d.objoid = c.oid AND d.classoid = 'pg_catalog.pg_class'::regclass),
+            (SELECT string_agg(r.oid::text || ':' || r.xmin::text, ',' ORDER BY r.oid)
+             FROM pg_catalog.pg_rewrite r WHERE r.ev_class = c.oid)
+        )) AS marker
+    FROM pg_catalog.pg_class c
+    WHERE c.oid = pg_catalog.to_regclass(pg_catalog.format('%I.%I', $1::text, $2::text));
+"""
+
+
+class ObjectDetailsCache:
+    """
+    Per-target LRU cache of ObjectFullDetails keyed by (relation OID, object type).
+
+    Every lookup costs one small marker query; the full catalog query only runs
+    when the relation is new to the cache or its catalog rows changed (DDL).
+    """
+
+    def __init__(self, max_entries_per_target: int):
+        self.max_entries_per_target = max_entries_per_target
+        self._targets: Dict[int, "OrderedDict[Tuple[int, str], Tuple[str, schemas.monitoring.ObjectFullDetails]]"] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    async def get_object_full_details(
+        self,
+        db_id: int,
+        conn: asyncpg.Connection,
+        schema_name: str,
+        object_name: str,
+        object_type: str
+    ) -> Optional[schemas.monitoring.ObjectFullDetails]:
+        """Returns object details from cache if the catalog marker still matches, else refetches."""
+        marker_row = await conn.fetchrow(CATALOG_MARKER_QUERY, schema_name, object_name)
+        if marker_row is None:
+            return None
+
+        entries = self._targets.setdefault(db_id, OrderedDict())
+        key = (marker_row['oid'], object_type)
+        cached = entries.get(key)
+        if cached is not None:
+            if cached[0] == marker_row['marker']:
+                entries.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+            self.invalidations += 1
+            logger.debug(f"Catalog change detected for {schema_name}.{object_name} (DB ID {db_id}); refetching details.")
+
+        self.misses += 1
+        details = await object_details_service.get_object_full_details(
+            conn=conn,
+            schema_name=schema_name,
+            object_name=object_name,
+            object_type=object_type
+        )
+        if details is None:
+            entries.pop(key, None)
+            return None
+
+        # A DDL racing between the two queries only costs an extra refetch next time,
+        # because the stored marker then predates the stored details.
+        entries[key] = (marker_row['marker'], details)
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries_per_target:
+            entries.popitem(last=False)
+            self.evictions += 1
+        return details
+
+    def invalidate_target(self, db_id: int) -> None:
+        """Drops every cached entry of one monitored database."""
+        self._targets.pop(db_id, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits / lookups) if lookups else None,
+            "entries": sum(len(entries) for entries in self._targets.values()),
+            "targets": len(self._targets),
+            "max_entries_per_target": self.max_entries_per_target,
+        }
+
+
+object_details_cache = ObjectDetailsCache(max_entries_per_target=settings.OBJECT_DETAILS_CACHE_SIZE)
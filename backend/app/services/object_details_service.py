@@ -1,138 +1,176 @@
 import asyncpg
 import logging
+import orjson
+from enum import Enum
 from typing import List, Dict, Any, Optional
 
 from app import schemas # Import your Pydantic schemas
 
 logger = logging.getLogger(__name__)
 
-async def get_column_details(conn: asyncpg.Connection, schema_name: str, object_name: str) -> List[schemas.monitoring.ColumnDetail]:
-    """Fetches detailed column information for a table or view."""
-    cols = []
-    # Query based on information_schema.columns and pg_description for comments
-    # Similar to `psql \d+ table_name` column section
-    query = """
-        SELECT
-            c.column_name,
-            c.data_type,
-            c.character_maximum_length,
-            c.numeric_precision,
-            c.numeric_scale,
-            c.is_nullable,
-            c.column_default,
-            c.collation_name AS collation,
-            pgd.description
-            -- col_description(pc.oid, c.ordinal_position) as description, -- Alternative for description
-            -- pa.attstorage AS storage, -- Requires joining pg_attribute
-            -- pa.attcompression AS compression -- Requires joining pg_attribute
-        FROM information_schema.columns c
-        LEFT JOIN pg_catalog.pg_stat_all_tables psat ON c.table_schema = psat.schemaname AND c.table_name = psat.relname
-        LEFT JOIN pg_catalog.pg_description pgd ON pgd.objoid = psat.relid AND pgd.objsubid = c.ordinal_position
-        -- LEFT JOIN pg_catalog.pg_class pc ON pc.relname = c.table_name AND pc.relnamespace = (SELECT oid FROM pg_catalog.pg_namespace WHERE nspname = c.table_schema)
-        -- LEFT JOIN pg_catalog.pg_attribute pa ON pa.attrelid = pc.oid AND pa.attname = c.column_name
-        WHERE c.table_schema = $1 AND c.table_name = $2
-        ORDER BY c.ordinal_position;
-    """
-    try:
-        records = await conn.fetch(query, schema_name, object_name)
-        for r in records:
-            # Map record to schemas.ColumnDetail
-            # Need to format data_type properly (e.g., with length/precision/scale)
-            # is_nullable is 'YES' or 'NO'
-            dt = r['data_type']
-            if r['character_maximum_length']:
-                dt = f"{dt}({r['character_maximum_length']})"
-            elif r['numeric_precision'] is not None:
-                dt = f"{dt}({r['numeric_precision']},{r['numeric_scale']})" if r['numeric_scale'] is not None else f"{dt}({r['numeric_precision']})"
+# One catalog round trip for everything the object details view needs.
+# The relation is resolved to its OID once (to_regclass) and every section is
+# keyed by that OID through pg_class/pg_attribute/pg_index/pg_constraint,
+# instead of going through information_schema views and name-based subselects.
+OBJECT_DETAILS_QUERY = """
+    WITH rel AS (
+        SELECT c.oid, c.relkind, c.relam, c.relowner, c.reloptions
+        FROM pg_catalog.pg_class c
+        WHERE c.oid = pg_catalog.to_regclass(pg_catalog.format('%I.%I', $1::text, $2::text))
+    )
+    SELECT
+        rel.oid,
+        pg_catalog.pg_get_userbyid(rel.relowner) AS owner,
+        pg_catalog.obj_description(rel.oid, 'pg_class') AS description,
+        am.amname AS access_method,
+        rel.reloptions AS options,
+        CASE WHEN rel.relkind = 'v' THEN pg_catalog.pg_get_viewdef(rel.oid) END AS view_definition,
+        (
+            SELECT json_agg(json_build_object(
+                'column_name', a.attname,
+                'data_type', pg_catalog.format_type(a.atttypid, a.atttypmod),
+                'collation', CASE WHEN a.attcollation <> t.typcollation THEN co.collname END,
+                'is_nullable', NOT a.attnotnull,
+                'column_default', pg_catalog.pg_get_expr(ad.adbin, ad.adrelid),
+                'storage', a.attstorage,
+                'stats_target', a.attstattarget,
+                'description', pg_catalog.col_description(a.attrelid, a.attnum)
+            ) ORDER BY a.attnum)
+            FROM pg_catalog.pg_attribute a
+            JOIN pg_catalog.pg_type t ON t.oid = a.atttypid
+            LEFT JOIN pg_catalog.pg_attrdef ad ON ad.adrelid = a.attrelid AND ad.adnum = a.attnum
+            LEFT JOIN pg_catalog.pg_collation co ON co.oid = a.attcollation
+            WHERE a.attrelid = rel.oid AND a.attnum > 0 AND NOT a.attisdropped
+        ) AS columns,
+        (
+            SELECT json_agg(json_build_object(
+                'index_name', ic.relname,
+                'index_definition', pg_catalog.pg_get_indexdef(i.indexrelid),
+                'is_primary_key', i.indisprimary,
+                'is_unique', i.indisunique,
+                'index_type', iam.amname
+            ) ORDER BY ic.relname)
+            FROM pg_catalog.pg_index i
+            JOIN pg_catalog.pg_class ic ON ic.oid = i.indexrelid
+            JOIN pg_catalog.pg_am iam ON iam.oid = ic.relam
+            WHERE i.indrelid = rel.oid
+        ) AS indexes,
+        (
+            SELECT json_agg(json_build_object(
+                'constraint_name', con.conname,
+                'constraint_type', con.contype,
+                'definition', pg_catalog.pg_get_constraintdef(con.oid)
+            ) ORDER BY con.conname)
+            FROM pg_catalog.pg_constraint con
+            WHERE con.conrelid = rel.oid
+        ) AS constraints
+    FROM rel
+    LEFT JOIN pg_catalog.pg_am am ON am.oid = rel.relam;
+"""
 
-            cols.append(schemas.monitoring.ColumnDetail(
-                column_name=r['column_name'],
-                data_type=dt,
-                collation=r['collation'],
-                is_nullable=r['is_nullable'] == 'YES',
-                column_default=r['column_default'],
-                description=r['description'],
-                # storage= ... need to map char to text for attstorage
-                # compression= ... need to map char to text for attcompression
-            ))
-    except Exception as e:
-        logger.error(f"Error fetching column details for {schema_name}.{object_name}: {e}")
+# pg_attribute.attstorage codes
+STORAGE_MAP = {
+    'p': 'plain',
+    'e': 'external',
+    'm': 'main',
+    'x': 'extended'
+}
+
+# Constraint type codes: c = CHECK, f = FOREIGN KEY, p = PRIMARY KEY, u = UNIQUE, t = TRIGGER, x = EXCLUSION
+CONSTRAINT_TYPE_MAP = {
+    'c': 'CHECK',
+    'f': 'FOREIGN KEY',
+    'p': 'PRIMARY KEY',
+    'u': 'UNIQUE',
+    'x': 'EXCLUSION'
+}
+
+RELATION_TYPES_WITH_COLUMNS = ('table', 'view', 'materialized view', 'foreign table', 'partitioned table')
+TABLE_TYPES = ('table', 'partitioned table')
+
+
+def _map_columns(raw: Optional[str]) -> List[schemas.monitoring.ColumnDetail]:
+    """Maps the json_agg column section to ColumnDetail schemas."""
+    cols = []
+    for c in orjson.loads(raw) if raw else []:
+        stats_target = c['stats_target']
+        cols.append(schemas.monitoring.ColumnDetail(
+            column_name=c['column_name'],
+            data_type=c['data_type'],
+            collation=c['collation'],
+            is_nullable=c['is_nullable'],
+            column_default=c['column_default'],
+            storage=STORAGE_MAP.get(c['storage'], c['storage']),
+            # -1 (NULL from PG17 on) means the default statistics target
+            stats_target=stats_target if stats_target is not None and stats_target >= 0 else None,
+            description=c['description'],
+        ))
     return cols
 
-async def get_index_details(conn: asyncpg.Connection, schema_name: str, table_name: str) -> List[schemas.monitoring.IndexDetail]:
-    """Fetches index information for a table."""
-    indexes = []
-    # Query based on pg_indexes or pg_class/pg_index for more detail
-    # `psql \d+ table_name` indexes section
-    query = """
-        SELECT
-            i.indexname,
-            i.indexdef,
-            idx.indisprimary AS is_primary_key,
-            idx.indisunique AS is_unique,
-            am.amname AS index_type
-        FROM pg_catalog.pg_indexes i
-        JOIN pg_catalog.pg_class c ON c.relname = i.tablename AND c.relnamespace = (SELECT oid FROM pg_catalog.pg_namespace WHERE nspname = i.schemaname)
-        JOIN pg_catalog.pg_index idx ON idx.indexrelid = (SELECT oid FROM pg_catalog.pg_class WHERE relname = i.indexname AND relnamespace = (SELECT oid FROM pg_catalog.pg_namespace WHERE nspname = i.schemaname))
-        JOIN pg_catalog.pg_class ic ON ic.oid = idx.indexrelid
-        JOIN pg_catalog.pg_am am ON am.oid = ic.relam
-        WHERE i.schemaname = $1 AND i.tablename = $2;
-    """
-    try:
-        records = await conn.fetch(query, schema_name, table_name)
-        for r in records:
-            indexes.append(schemas.monitoring.IndexDetail(
-                index_name=r['indexname'],
-                index_definition=r['indexdef'],
-                is_primary_key=r['is_primary_key'],
-                is_unique=r['is_unique'],
-                index_type=r['index_type'],
-            ))
-    except Exception as e:
-        logger.error(f"Error fetching index details for {schema_name}.{table_name}: {e}")
-    return indexes
 
-async def get_constraint_details(conn: asyncpg.Connection, schema_name: str, table_name: str) -> List[schemas.monitoring.ConstraintDetail]:
-    """Fetches constraint information for a table."""
+def _map_indexes(raw: Optional[str]) -> List[schemas.monitoring.IndexDetail]:
+    """Maps the json_agg index section to IndexDetail schemas."""
+    return [schemas.monitoring.IndexDetail(**i) for i in (orjson.loads(raw) if raw else [])]
+
+
+def _map_constraints(raw: Optional[str]) -> List[schemas.monitoring.ConstraintDetail]:
+    """Maps the json_agg constraint section to ConstraintDetail schemas."""
     constraints = []
-    # Query based on pg_constraint, information_schema.table_constraints etc.
-    # `psql \d+ table_name` constraints section
-    query = """
-        SELECT
-            conname AS constraint_name,
-            contype AS constraint_type_code,
-            pg_get_constraintdef(oid) AS definition
-        FROM pg_catalog.pg_constraint
-        WHERE conrelid = (
-            SELECT c.oid
-            FROM pg_catalog.pg_class c
-            JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
-            WHERE c.relname = $2 AND n.nspname = $1
-        );
-    """
-    # Constraint type codes: c = CHECK, f = FOREIGN KEY, p = PRIMARY KEY, u = UNIQUE, t = TRIGGER, x = EXCLUSION
-    type_map = {
-        'c': 'CHECK',
-        'f': 'FOREIGN KEY',
-        'p': 'PRIMARY KEY',
-        'u': 'UNIQUE',
-        'x': 'EXCLUSION'
-    }
-    try:
-        records = await conn.fetch(query, schema_name, table_name)
-        for r in records:
-            constraint_type = type_map.get(r['constraint_type_code'], r['constraint_type_code'])
-            constraints.append(schemas.monitoring.ConstraintDetail(
-                constraint_name=r['constraint_name'],
-                constraint_type=constraint_type,
-                definition=r['definition'],
-            ))
-    except Exception as e:
-        logger.error(f"Error fetching constraint details for {schema_name}.{table_name}: {e}")
+    for c in orjson.loads(raw) if raw else []:
+        constraints.append(schemas.monitoring.ConstraintDetail(
+            constraint_name=c['constraint_name'],
+            constraint_type=CONSTRAINT_TYPE_MAP.get(c['constraint_type'], c['constraint_type']),
+            definition=c['definition'],
+        ))
     return constraints
 
-async def get_row_count(conn: asyncpg.Connection, schema_name: str, table_name: str) -> Optional[int]:
-    """Fetches the row count for a table."""
+class RowCountPrecision(str, Enum):
+    estimate = "estimate" # Planner statistics, no table scan
+    exact = "exact" # SELECT COUNT(*), guarded by statement_timeout
+
+# Planner row estimate of pg_class row `c`, NULL when there is none. reltuples
+# is -1 for never-analyzed tables (PG14+); callers fall back to n_live_tup from
+# the stats collector. Partitioned parents carry no tuples themselves, so their
+# leaf partitions are summed. Shared with the snapshot's object size collector.
+ROW_ESTIMATE_SQL = """
+    CASE
+        WHEN c.relkind = 'p' THEN (
+            SELECT sum(GREATEST(pc.reltuples, 0))::bigint
+            FROM pg_catalog.pg_partition_tree(c.oid) pt
+            JOIN pg_catalog.pg_class pc ON pc.oid = pt.relid
+            WHERE pt.isleaf
+        )
+        WHEN c.reltuples >= 0 AND (c.reltuples > 0 OR c.relpages > 0) THEN c.reltuples::bigint
+    END
+"""
+
+# Planner statistics for one relation
+ROW_COUNT_ESTIMATE_QUERY = f"""
+    SELECT
+        {ROW_ESTIMATE_SQL} AS reltuples,
+        s.n_live_tup
+    FROM pg_catalog.pg_class c
+    LEFT JOIN pg_catalog.pg_stat_all_tables s ON s.relid = c.oid
+    WHERE c.oid = pg_catalog.to_regclass(pg_catalog.format('%I.%I', $1::text, $2::text));
+"""
+
+async def get_row_count_estimate(conn: asyncpg.Connection, schema_name: str, table_name: str) -> Optional[schemas.monitoring.ObjectRowCount]:
+    """Returns a row count estimate from planner/collector statistics. Never scans the table."""
+    record = await conn.fetchrow(ROW_COUNT_ESTIMATE_QUERY, schema_name, table_name)
+    if record is None:
+        return None
+    if record['reltuples'] is not None:
+        return schemas.monitoring.ObjectRowCount(row_count=record['reltuples'], precision=RowCountPrecision.estimate, source="reltuples")
+    return schemas.monitoring.ObjectRowCount(row_count=record['n_live_tup'], precision=RowCountPrecision.estimate, source="n_live_tup")
+
+async def get_row_count(conn: asyncpg.Connection, schema_name: str, table_name: str, timeout_ms: Optional[int] = None) -> Optional[int]:
+    """Fetches the exact row count for a table.
+
+    The COUNT(*) runs in its own transaction with `SET LOCAL statement_timeout`
+    when `timeout_ms` is given; asyncpg.QueryCanceledError is raised on timeout.
+    Other database errors (missing table, permissions) are raised too, so
+    callers can report them.
+    """
     # formatted_sql = "" # No longer needed to initialize here
     try:
         # Use PostgreSQL's format function with %I for safe identifier quoting.
@@ -157,57 +195,19 @@ async def get_row_count(conn: asyncpg.Connection, schema_name: str, table_name:
         logger.info(f"Executing dynamically constructed row count query: {final_count_query_str}")
         
         # Step 2: Execute the constructed query string
-        count = await conn.fetchval(final_count_query_str)
+        async with conn.transaction():
+            if timeout_ms:
+                await conn.execute(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+            count = await conn.fetchval(final_count_query_str)
         
         return int(count) if count is not None else None
         
-    except asyncpg.PostgresError as e: # Catch specific asyncpg errors
-        logger.error(f"PostgresError fetching row count for {schema_name}.{table_name}: {e}. Query: {final_count_query_str if 'final_count_query_str' in locals() else 'not constructed'}")
-        return None
-    except Exception as e:
-        logger.error(f"Unexpected error fetching row count for {schema_name}.{table_name}: {e}. Query: {final_count_query_str if 'final_count_query_str' in locals() else 'not constructed'}")
-        return None
-
-async def get_view_definition(conn: asyncpg.Connection, schema_name: str, view_name: str) -> Optional[str]:
-    """Fetches the definition for a view."""
-    try:
-        definition = await conn.fetchval(
-            "SELECT definition FROM pg_catalog.pg_views WHERE schemaname = $1 AND viewname = $2",
-            schema_name, view_name
-        )
-        return definition
-    except Exception as e:
-        logger.error(f"Error fetching view definition for {schema_name}.{view_name}: {e}")
-        return None
-
-async def get_table_options(conn: asyncpg.Connection, schema_name: str, table_name: str) -> Optional[List[str]]:
-    """Fetches table options (like fillfactor) for a table."""
-    try:
-        options_array = await conn.fetchval("""
-            SELECT c.reloptions
-            FROM pg_catalog.pg_class c
-            JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
-            WHERE n.nspname = $1 AND c.relname = $2 AND c.relkind IN ('r', 'p', 'm');
-            """, schema_name, table_name)
-        return options_array if options_array else []
+    except asyncpg.QueryCanceledError:
+        logger.warning(f"Row count for {schema_name}.{table_name} exceeded statement_timeout of {timeout_ms} ms.")
+        raise
     except Exception as e:
-        logger.error(f"Error fetching table options for {schema_name}.{table_name}: {e}")
-        return None
-
-async def get_access_method(conn: asyncpg.Connection, schema_name: str, table_name: str) -> Optional[str]:
-    """Fetches the access method for a table."""
-    try:
-        access_method_name = await conn.fetchval("""
-            SELECT am.amname
-            FROM pg_catalog.pg_class c
-            JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
-            JOIN pg_catalog.pg_am am ON am.oid = c.relam
-            WHERE n.nspname = $1 AND c.relname = $2 AND c.relkind IN ('r', 'p', 'm');
-            """, schema_name, table_name)
-        return access_method_name
-    except Exception as e:
-        logger.error(f"Error fetching access method for {schema_name}.{table_name}: {e}")
-        return None
+        logger.error(f"Error fetching row count for {schema_name}.{table_name}: {e}. Query: {final_count_query_str if 'final_count_query_str' in locals() else 'not constructed'}")
+        raise
 
 
 async def get_object_full_details(
@@ -218,58 +218,39 @@ async def get_object_full_details(
     owner: Optional[str] = None # Owner can be passed if already known
 ) -> Optional[schemas.monitoring.ObjectFullDetails]:
     """
-    Fetches comprehensive details for a database object (table, view, index etc.).
+    Fetches comprehensive details for a database object (table, view, index etc.)
+    with a single JSON-aggregated catalog query.
     The `conn` should be an active asyncpg connection to the *monitored* database.
+    Returns None if the object does not exist.
     """
     logger.info(f"Fetching full details for {object_type} {schema_name}.{object_name}")
 
+    record = await conn.fetchrow(OBJECT_DETAILS_QUERY, schema_name, object_name)
+    if record is None:
+        return None
+
     details = schemas.monitoring.ObjectFullDetails(
         schema_name=schema_name,
         object_name=object_name,
         object_type=object_type,
-        owner=owner # Assign if passed
+        owner=owner or record['owner'], # Prefer the owner passed by the caller
+        description=record['description'],
     )
 
-    # Common details to fetch if owner is not provided
-    if not owner:
-        try:
-            # This query gets owner for various relkinds
-            owner_query = """
-                SELECT pg_catalog.pg_get_userbyid(c.relowner) AS owner
-                FROM pg_catalog.pg_class c
-                JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
-                WHERE n.nspname = $1 AND c.relname = $2;
-            """
-            # For sequences, pg_class might not have owner directly, or might need different handling
-            # For now, this covers tables, views, indexes.
-            # If object_type is 'sequence', a different query for owner might be needed if this fails.
-            fetched_owner = await conn.fetchval(owner_query, schema_name, object_name)
-            details.owner = fetched_owner
-        except Exception as e:
-            logger.warning(f"Could not fetch owner for {schema_name}.{object_name}: {e}")
+    if object_type in RELATION_TYPES_WITH_COLUMNS:
+        details.columns = _map_columns(record['columns'])
 
-    if object_type in ['table', 'view', 'materialized view', 'foreign table', 'partitioned table']:
-        details.columns = await get_column_details(conn, schema_name, object_name)
+    if object_type in TABLE_TYPES:
+        details.indexes = _map_indexes(record['indexes'])
+        details.constraints = _map_constraints(record['constraints'])
+        details.access_method = record['access_method']
+        details.options = list(record['options']) if record['options'] else []
 
-    if object_type in ['table', 'partitioned table']:
-        details.indexes = await get_index_details(conn, schema_name, object_name)
-        details.constraints = await get_constraint_details(conn, schema_name, object_name)
-        details.access_method = await get_access_method(conn, schema_name, object_name)
-        details.options = await get_table_options(conn, schema_name, object_name)
-    
     if object_type == 'view':
-        details.view_definition = await get_view_definition(conn, schema_name, object_name)
-    
-    # if object_type == 'index':
-    #     # Fetch specific index details if not already covered by general object info
-    #     # This might involve a query similar to get_index_details but focused on ONE index
-    #     pass
+        details.view_definition = record['view_definition']
 
     # if object_type == 'sequence':
     #     # Fetch sequence parameters (start_value, increment_by, max_value, min_value, cache_value, is_cycled)
     #     pass
 
-    # TODO: Add description fetching for the object itself (not just columns)
-    # e.g., obj_description(relid, 'pg_class')
-
-    return details 
\ No newline at end of file
+    return details
@@ -0,0 +1,110 @@
+# backend/app/services/oid_name_cache.py
+import logging
+import time
+from typing import Any, Dict, Iterable, List, MutableMapping, Optional, Sequence, Set
+
+import asyncpg
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# One batched lookup per kind of OID; `= ANY($1::oid[])` keeps it a single round trip
+NAME_QUERIES = {
+    "relation": """
+        SELECT c.oid, pg_catalog.format('%I.%I', n.nspname, c.relname) AS name
+        FROM pg_catalog.pg_class c
+        JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.oid = ANY($1::oid[])
+    """,
+    "role": "SELECT oid, rolname AS name FROM pg_catalog.pg_roles WHERE oid = ANY($1::oid[])",
+    "database": "SELECT oid, datname AS name FROM pg_catalog.pg_database WHERE oid = ANY($1::oid[])",
+}
+
+
+class OidNameCache:
+    """
+    Per-target cache of OID -> name for relations, roles and databases.
+
+    `resolve` fetches only the OIDs missing from the cache (one query per kind).
+    OIDs that no longer exist are remembered as None so they are not looked up
+    again. A target's names are dropped after OID_NAME_CACHE_TTL_SECONDS, which
+    picks up renames and OID reuse.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        # db_id -> (loaded_at, {kind: {oid: name}})
+        self._targets: Dict[int, tuple] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _names(self, db_id: int) -> Dict[str, Dict[int, Optional[str]]]:
+        entry = self._targets.get(db_id)
+        if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+            entry = (time.monotonic(), {kind: {} for kind in NAME_QUERIES})
+            self._targets[db_id] = entry
+        return entry[1]
+
+    async def resolve(
+        self,
+        db_id: int,
+        conn: asyncpg.Connection,
+        relations: Iterable[Optional[int]] = (),
+        roles: Iterable[Optional[int]] = (),
+        databases: Iterable[Optional[int]] = ()
+    ) -> Dict[str, Dict[int, Optional[str]]]:
+        """Makes sure the given OIDs are cached (refreshing misses from the target) and returns the name maps."""
+        names = self._names(db_id)
+        for kind, oids in (("relation", relations), ("role", roles), ("database", databases)):
+            known = names[kind]
+            wanted: Set[int] = {oid for oid in oids if oid is not None}
+            missing = [oid for oid in wanted if oid not in known]
+            self.hits += len(wanted) - len(missing)
+            if not missing:
+                continue
+            self.misses += len(missing)
+            try:
+                rows = await conn.fetch(NAME_QUERIES[kind], missing)
+            except asyncpg.PostgresError as e:
+                logger.warning(f"Could not resolve {kind} OIDs for database ID {db_id}: {e}")
+                continue
+            for oid in missing:
+                known[oid] = None
+            for row in rows:
+                known[row['oid']] = row['name']
+        return names
+
+    def lookup(self, db_id: int, kind: str, oid: Optional[int]) -> Optional[str]:
+        """Returns a cached name without touching the target (None if unknown)."""
+        if oid is None:
+            return None
+        entry = self._targets.get(db_id)
+        if entry is None:
+            return None
+        return entry[1][kind].get(oid)
+
+    def annotate(
+        self,
+        db_id: int,
+        rows: Sequence[MutableMapping[str, Any]],
+        columns: Dict[str, tuple]
+    ) -> List[MutableMapping[str, Any]]:
+        """
+        Fills empty name columns of stored rows from the cache, e.g.
+        columns={"relation_name": ("relation", "relation")} sets row["relation_name"]
+        from the relation OID in row["relation"]. Rows collected before names were
+        stored get names as long as the collector has seen the OIDs since.
+        """
+        for row in rows:
+            for name_column, (kind, oid_column) in columns.items():
+                if name_column in row and row[name_column] is None and oid_column in row:
+                    row[name_column] = self.lookup(db_id, kind, row[oid_column])
+        return rows
+
+    def invalidate_target(self, db_id: int) -> None:
+        """Drops the cached names of one monitored database."""
+        self._targets.pop(db_id, None)
+
+
+oid_name_cache = OidNameCache(ttl_seconds=settings.OID_NAME_CACHE_TTL_SECONDS)
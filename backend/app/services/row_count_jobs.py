@@ -0,0 +1,197 @@
+# backend/app/services/row_count_jobs.py
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Dict, Optional, Tuple
+
+import asyncpg
+
+from app import schemas
+from app.core.config import settings
+from app.services import object_details_service
+
+logger = logging.getLogger(__name__)
+
+
+class RowCountJobStatus(str, Enum):
+    pending = "pending" # Waiting for a per-target slot
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+    cancelled = "cancelled"
+
+
+FINISHED_STATUSES = (RowCountJobStatus.succeeded, RowCountJobStatus.failed, RowCountJobStatus.cancelled)
+
+
+@dataclass
+class CountJob:
+    """In-memory state of one exact COUNT(*) job."""
+    job_id: str
+    db_id: int
+    schema_name: str
+    object_name: str
+    status: RowCountJobStatus = RowCountJobStatus.pending
+    submitted_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    row_count: Optional[int] = None
+    estimated_row_count: Optional[int] = None
+    counted_at: Optional[datetime] = None
+    cached: bool = False
+    error: Optional[str] = None
+    pool: Optional[asyncpg.Pool] = field(default=None, repr=False)
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    @property
+    def key(self) -> Tuple[int, str, str]:
+        return (self.db_id, self.schema_name, self.object_name)
+
+    def to_schema(self) -> schemas.monitoring.RowCountJob:
+        end = self.finished_at or datetime.now(timezone.utc)
+        elapsed = (end - self.started_at).total_seconds() if self.started_at else None
+        return schemas.monitoring.RowCountJob(
+            job_id=self.job_id,
+            db_id=self.db_id,
+            schema_name=self.schema_name,
+            object_name=self.object_name,
+            status=self.status.value,
+            submitted_at=self.submitted_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            elapsed_seconds=elapsed,
+            row_count=self.row_count,
+            estimated_row_count=self.estimated_row_count,
+            counted_at=self.counted_at,
+            cached=self.cached,
+            error=self.error,
+        )
+
+
+class RowCountJobManager:
+    """
+    Runs exact row counts in the background on the target's pool.
+
+    - Requests for a table that is already being counted join the running job.
+    - At most ROW_COUNT_JOBS_PER_TARGET counts run per monitored database.
+    - Cancelling cancels the task; asyncpg then cancels the running COUNT(*) on the server.
+    - Finished counts are cached with their timestamp and reused via `max_age_seconds`,
+      for at most ROW_COUNT_JOB_RETENTION_SECONDS.
+    """
+
+    def __init__(self):
+        self._jobs: Dict[str, CountJob] = {}
+        self._active: Dict[Tuple[int, str, str], str] = {}
+        self._results: Dict[Tuple[int, str, str], Tuple[int, datetime]] = {}
+        self._slots: Dict[int, asyncio.Semaphore] = {}
+
+    def _slot(self, db_id: int) -> asyncio.Semaphore:
+        if db_id not in self._slots:
+            self._slots[db_id] = asyncio.Semaphore(settings.ROW_COUNT_JOBS_PER_TARGET)
+        return self._slots[db_id]
+
+    def _prune(self) -> None:
+        """Forgets finished jobs and cached counts past the retention window."""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.ROW_COUNT_JOB_RETENTION_SECONDS)
+        for job_id, job in list(self._jobs.items()):
+            if job.status in FINISHED_STATUSES and job.finished_at and job.finished_at < cutoff:
+                del self._jobs[job_id]
+        for key, (_, counted_at) in list(self._results.items()):
+            if counted_at < cutoff:
+                del self._results[key]
+
+    def submit(
+        self,
+        pool: asyncpg.Pool,
+        db_id: int,
+        schema_name: str,
+        object_name: str,
+        max_age_seconds: Optional[int] = None
+    ) -> CountJob:
+        """Starts (or joins) a count job, or answers from the result cache if fresh enough."""
+        self._prune()
+        key = (db_id, schema_name, object_name)
+
+        active_id = self._active.get(key)
+        if active_id is not None:
+            return self._jobs[active_id]
+
+        cached = self._results.get(key)
+        if cached is not None and max_age_seconds is not None:
+            count, counted_at = cached
+            if datetime.now(timezone.utc) - counted_at <= timedelta(seconds=max_age_seconds):
+                now = datetime.now(timezone.utc)
+                job = CountJob(
+                    job_id=uuid.uuid4().hex, db_id=db_id, schema_name=schema_name, object_name=object_name,
+                    status=RowCountJobStatus.succeeded, started_at=now, finished_at=now,
+                    row_count=count, counted_at=counted_at, cached=True
+                )
+                self._jobs[job.job_id] = job
+                return job
+
+        job = CountJob(job_id=uuid.uuid4().hex, db_id=db_id, schema_name=schema_name, object_name=object_name, pool=pool)
+        self._jobs[job.job_id] = job
+        self._active[key] = job.job_id
+        job.task = asyncio.create_task(self._run(job))
+        return job
+
+    def get(self, job_id: str) -> Optional[CountJob]:
+        return self._jobs.get(job_id)
+
+    async def _run(self, job: CountJob) -> None:
+        try:
+            async with self._slot(job.db_id):
+                job.status = RowCountJobStatus.running
+                job.started_at = datetime.now(timezone.utc)
+                async with job.pool.acquire() as conn:
+                    estimate = await object_details_service.get_row_count_estimate(conn, job.schema_name, job.object_name)
+                    if estimate is None:
+                        raise LookupError(f"Object '{job.schema_name}.{job.object_name}' not found.")
+                    job.estimated_row_count = estimate.row_count
+                    count = await object_details_service.get_row_count(
+                        conn, job.schema_name, job.object_name, timeout_ms=settings.ROW_COUNT_JOB_TIMEOUT_MS
+                    )
+            if count is None:
+                raise RuntimeError("Row count query returned no result.")
+            job.row_count = count
+            job.counted_at = datetime.now(timezone.utc)
+            job.status = RowCountJobStatus.succeeded
+            self._results[job.key] = (count, job.counted_at)
+        except asyncio.CancelledError:
+            job.status = RowCountJobStatus.cancelled
+        except asyncpg.QueryCanceledError:
+            job.status = RowCountJobStatus.failed
+            job.error = f"Exceeded statement_timeout of {settings.ROW_COUNT_JOB_TIMEOUT_MS} ms."
+        except Exception as e:
+            logger.error(f"Row count job {job.job_id} for {job.schema_name}.{job.object_name} failed: {e}")
+            job.status = RowCountJobStatus.failed
+            job.error = str(e)
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+            self._active.pop(job.key, None)
+
+    async def cancel(self, job_id: str) -> Optional[CountJob]:
+        """
+        Cancels a pending or running job and waits for it to stop, so the job
+        returned is already cancelled. Cancelling the task interrupts the
+        COUNT(*) inside asyncpg, which sends the server a cancel request for that
+        query only; nothing else on the shared pool is touched.
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.status in FINISHED_STATUSES:
+            return job
+        if job.task is not None:
+            job.task.cancel()
+            await asyncio.wait({job.task})
+        if job.status not in FINISHED_STATUSES:
+            # Cancelled before _run started, so its handler never ran
+            job.status = RowCountJobStatus.cancelled
+            job.finished_at = datetime.now(timezone.utc)
+            self._active.pop(job.key, None)
+        return job
+
+
+row_count_jobs = RowCountJobManager()
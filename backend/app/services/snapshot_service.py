@@ -1,18 +1,421 @@
 # backend/app/services/snapshot_service.py
 import logging
 import asyncpg
+from sqlalchemy.orm import Session
 from datetime import datetime, timezone # Import datetime
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
 import asyncio # Import asyncio
+import time
 
+from app.core import metrics
+from app.core.config import settings
+from app.core.query_fingerprint import fingerprint_query
 from app.db.session import SessionLocal # Import SessionLocal
 from app.models.snapshot import Snapshot # Import Snapshot model
 from app.models.session_activity import SessionActivity # Import SessionActivity model
 from app.models.statement_stats import StatementStats # Import StatementStats model
 from app.models.lock import Lock # Import Lock model
+from app.models.lock_summary import LockSummary # Import LockSummary model
 from app.models.db_object import DbObject # Import DbObject model
+from app.models.blocking_tree import BlockingTree # Import BlockingTree model
+from app.models.statement_regression import StatementRegression # Import StatementRegression model
+from app.services.lock_analysis import build_blocking_tree
+from app.services import target_pools
+from app.services.object_details_service import ROW_ESTIMATE_SQL
+from app.services.collection_throttle import PRESSURE_QUERY, collection_throttle
+from app.services.oid_name_cache import oid_name_cache
+from app.services.statement_regressions import statement_regression_detector
+from app.services.target_health import target_circuit_breaker
+from app.services.wait_histograms import fold_wait_histogram
 
 logger = logging.getLogger(__name__)
 
+# Server-side limits a collector query can hit -> `timeout` label of COLLECTOR_TIMEOUTS
+_TIMEOUT_ERRORS = {asyncpg.QueryCanceledError: "statement", asyncpg.LockNotAvailableError: "lock"}
+
+# Acquire errors that mean the target cannot be reached or will not let us in
+_CONNECT_ERRORS = (
+    OSError, # Refused, unreachable, DNS
+    asyncpg.PostgresConnectionError, # Includes asyncpg's client-side connect errors
+    asyncpg.CannotConnectNowError, # Starting up or shutting down
+    asyncpg.InvalidAuthorizationSpecificationError, # Authentication, incl. a wrong password
+    asyncpg.InvalidCatalogNameError, # Database does not exist
+)
+
+# Monitored database IDs with a snapshot in progress (collector queue depth for readiness)
+_in_flight = set()
+
+LOCK_COLUMNS = '''
+    locktype, database, relation, page, tuple, virtualxid,
+    transactionid, classid, objid, objsubid, virtualtransaction,
+    pid, mode, granted, fastpath, waitstart
+'''
+
+# Locks in the target database, plus the database-less ones (transaction IDs, virtual
+# XIDs) taken by its backends; row lock waits are waits on a transaction ID
+LOCKS_IN_DATABASE = '''
+    (database = (SELECT oid FROM pg_database WHERE datname = $1)
+     OR (database IS NULL AND pid IN (SELECT pid FROM pg_stat_activity WHERE datname = $1)))
+'''
+
+# Per-mode lock counts; cheap enough for every snapshot even with thousands of fast-path locks
+LOCK_SUMMARY_QUERY = f'''
+    SELECT locktype, mode, granted, count(*) AS lock_count, count(*) FILTER (WHERE fastpath) AS fastpath_count
+    FROM pg_locks
+    WHERE {LOCKS_IN_DATABASE}
+    GROUP BY locktype, mode, granted
+'''
+
+LOCKS_FULL_QUERY = f'''
+    SELECT {LOCK_COLUMNS}
+    FROM pg_locks
+    WHERE database = (SELECT oid FROM pg_database WHERE datname = $1)
+'''
+
+# Lock rows involved in waits: every lock on an awaited lockable object (the waiters and
+# the holders they queue behind), and the relation, page and tuple locks that waiting
+# and blocking sessions hold on the relations being waited for.
+LOCKS_CONTENTION_QUERY = f'''
+    WITH waiting AS (
+        SELECT *
+        FROM pg_locks
+        WHERE NOT granted AND {LOCKS_IN_DATABASE}
+    ),
+    involved_pids AS (
+        SELECT pid FROM waiting
+        UNION
+        SELECT unnest(pg_blocking_pids(pid)) FROM waiting
+    ),
+    -- Relations waited on directly, or through a row: a row lock waiter holds the
+    -- tuple lock of the row while it waits for the holder's transaction ID
+    waited_relations AS (
+        SELECT relation FROM waiting WHERE relation IS NOT NULL
+        UNION
+        SELECT relation FROM pg_locks
+        WHERE locktype = 'tuple' AND pid IN (SELECT pid FROM waiting)
+    )
+    SELECT {LOCK_COLUMNS}
+    FROM pg_locks l
+    WHERE EXISTS (
+            SELECT 1 FROM waiting w
+            WHERE w.locktype = l.locktype
+              AND w.database IS NOT DISTINCT FROM l.database
+              AND w.relation IS NOT DISTINCT FROM l.relation
+              AND w.page IS NOT DISTINCT FROM l.page
+              AND w.tuple IS NOT DISTINCT FROM l.tuple
+              AND w.virtualxid IS NOT DISTINCT FROM l.virtualxid
+              AND w.transactionid IS NOT DISTINCT FROM l.transactionid
+              AND w.classid IS NOT DISTINCT FROM l.classid
+              AND w.objid IS NOT DISTINCT FROM l.objid
+              AND w.objsubid IS NOT DISTINCT FROM l.objsubid
+       )
+       OR (l.relation IN (SELECT relation FROM waited_relations)
+           AND l.pid IN (SELECT pid FROM involved_pids))
+'''
+
+def ingest_snapshot(
+    app_db: Session,
+    monitored_db_id: int,
+    activity_records: Sequence[Mapping[str, Any]],
+    statements_records: Sequence[Mapping[str, Any]],
+    lock_records: Sequence[Mapping[str, Any]],
+    lock_summary_records: Sequence[Mapping[str, Any]],
+    object_records: Sequence[Mapping[str, Any]],
+    names: Dict[str, Dict[int, Optional[str]]],
+    snapshot_time: Optional[datetime] = None,
+    load: Optional[Dict[str, Any]] = None,
+    statements_collected: bool = True
+) -> Dict[str, Any]:
+    """
+    Maps one snapshot's collected records to rows in the application database
+    session: everything up to, but not including, the commit. Records are
+    asyncpg Records or plain dicts (see benchmarks/fixtures.py). `load` is the
+    collection_throttle assessment the snapshot was taken under, if any.
+    `statements_collected` is False when the pg_stat_statements fetch did not
+    run or failed, so the empty `statements_records` is not a real reading.
+
+    Returns the new snapshot ID and the number of rows added per kind.
+    """
+    activities_added = 0
+    statements_added = 0
+    locks_added = 0
+    regressions_added = 0
+    wait_events_added = 0
+    objects_added = 0
+
+    # 3. Create Snapshot record
+    skipped = load["skipped"] if load else []
+    new_snapshot = Snapshot(
+        database_id=monitored_db_id,
+        snapshot_time=snapshot_time or datetime.now(timezone.utc), # Use timezone-aware datetime
+        load_state=load["state"] if load else None,
+        skipped_collectors=skipped or None,
+        load_metrics=load["metrics"] if load else None
+    )
+    app_db.add(new_snapshot)
+    app_db.flush() # Flush to get the snapshot ID
+    snapshot_id = new_snapshot.id
+    logger.info(f"Created Snapshot record with ID: {snapshot_id}")
+
+    # 4. Process and store SessionActivity records
+    for record in activity_records:
+        # Ensure correct type casting, handle potential None values
+        session_activity = SessionActivity(
+            snapshot_id=snapshot_id,
+            datid=record.get('datid'),
+            datname=record.get('datname'),
+            pid=record.get('pid'),
+            usesysid=record.get('usesysid'),
+            usename=record.get('usename'),
+            application_name=record.get('application_name'),
+            client_addr=str(record.get('client_addr')) if record.get('client_addr') else None,
+            client_hostname=record.get('client_hostname'),
+            client_port=record.get('client_port'),
+            backend_start=record.get('backend_start'),
+            xact_start=record.get('xact_start'),
+            query_start=record.get('query_start'),
+            state_change=record.get('state_change'),
+            wait_event_type=record.get('wait_event_type'),
+            wait_event=record.get('wait_event'),
+            state=record.get('state'),
+            backend_xid=str(record.get('backend_xid')) if record.get('backend_xid') else None,
+            backend_xmin=str(record.get('backend_xmin')) if record.get('backend_xmin') else None,
+            query_id=record.get('query_id'), # May be None
+            query=record.get('query'),
+            query_fingerprint=fingerprint_query(record.get('query')),
+            backend_type=record.get('backend_type')
+        )
+        app_db.add(session_activity)
+    activities_added = len(activity_records)
+
+    # Fold the sessions' wait events into the heatmap bucket of this snapshot
+    wait_events_added = fold_wait_histogram(app_db, monitored_db_id, new_snapshot.snapshot_time, activity_records)
+
+    # 5. Process and store StatementStats records
+    for record in statements_records:
+        # Map pg_stat_statements columns to model attributes
+        statement_stats = StatementStats(
+            snapshot_id=snapshot_id,
+            userid=record.get('userid'),
+            dbid=record.get('dbid'),
+            username=names["role"].get(record.get('userid')),
+            database_name=names["database"].get(record.get('dbid')),
+            queryid=record.get('queryid'),
+            query=record.get('query'),
+            query_fingerprint=fingerprint_query(record.get('query')),
+            calls=record.get('calls'),
+            total_time=record.get('total_exec_time'), # Corrected: total_time <- total_exec_time
+            min_time=record.get('min_exec_time'),     # Corrected: min_time <- min_exec_time
+            max_time=record.get('max_exec_time'),     # Corrected: max_time <- max_exec_time
+            mean_time=record.get('mean_exec_time'),    # Corrected: mean_time <- mean_exec_time
+            stddev_time=record.get('stddev_exec_time'),# Corrected: stddev_time <- stddev_exec_time
+            rows=record.get('rows'),
+            shared_blks_hit=record.get('shared_blks_hit'),
+            shared_blks_read=record.get('shared_blks_read'),
+            shared_blks_dirtied=record.get('shared_blks_dirtied'),
+            shared_blks_written=record.get('shared_blks_written'),
+            local_blks_hit=record.get('local_blks_hit'),
+            local_blks_read=record.get('local_blks_read'),
+            local_blks_dirtied=record.get('local_blks_dirtied'),
+            local_blks_written=record.get('local_blks_written'),
+            temp_blks_read=record.get('temp_blks_read'),
+            temp_blks_written=record.get('temp_blks_written'),
+            blk_read_time=record.get('blk_read_time'),
+            blk_write_time=record.get('blk_write_time'),
+            # --- Handle potential newer fields ---
+            # The following fields might not exist in older PG versions or if pg_stat_statements is older
+            # Add them conditionally or handle potential KeyErrors if necessary.
+            # We use .get() which returns None if key doesn't exist, preventing errors.
+            # toplevel=record.get('toplevel'), # Uncomment if model supports it
+            # total_plan_time=record.get('total_plan_time'), # Check model field name
+            # min_plan_time=record.get('min_plan_time'),     # Check model field name
+            # max_plan_time=record.get('max_plan_time'),     # Check model field name
+            # mean_plan_time=record.get('mean_plan_time'),    # Check model field name
+            # stddev_plan_time=record.get('stddev_plan_time'),# Check model field name
+            # wal_records=record.get('wal_records'),
+            # wal_fpi=record.get('wal_fpi'),
+            # wal_bytes=record.get('wal_bytes')
+            # JIT stats can also be added if needed/available
+        )
+        app_db.add(statement_stats)
+    statements_added = len(statements_records)
+
+    # Compare this interval's statement deltas with their rolling baselines. A snapshot whose
+    # statements were throttled or failed to fetch (e.g. statement_timeout) has none, which
+    # would otherwise look like a reset and drop every baseline
+    observed = []
+    if statements_collected and "statements" not in skipped:
+        observed = statement_regression_detector.observe(monitored_db_id, new_snapshot.snapshot_time, statements_records)
+    for flag in observed:
+        app_db.add(StatementRegression(
+            snapshot_id=snapshot_id,
+            database_id=monitored_db_id,
+            detected_at=new_snapshot.snapshot_time,
+            query_fingerprint=fingerprint_query(flag['query']),
+            **flag
+        ))
+        regressions_added += 1
+
+    # 6. Process and store Lock records
+    for record in lock_records:
+        db_lock = Lock(
+            snapshot_id=snapshot_id,
+            locktype=record.get('locktype'),
+            database=record.get('database'), 
+            relation=record.get('relation'), 
+            relation_name=names["relation"].get(record.get('relation')),
+            database_name=names["database"].get(record.get('database')),
+            page=record.get('page'),
+            tuple=record.get('tuple'),
+            virtualxid=record.get('virtualxid'),
+            transactionid=str(record.get('transactionid')) if record.get('transactionid') else None,
+            classid=record.get('classid'),
+            objid=record.get('objid'),
+            objsubid=record.get('objsubid'),
+            virtualtransaction=record.get('virtualtransaction'),
+            pid=record.get('pid'),
+            mode=record.get('mode'),
+            granted=record.get('granted'),
+            fastpath=record.get('fastpath'),
+            waitstart=record.get('waitstart')
+        )
+        app_db.add(db_lock)
+    locks_added = len(lock_records)
+
+    for record in lock_summary_records:
+        app_db.add(LockSummary(
+            snapshot_id=snapshot_id,
+            locktype=record.get('locktype'),
+            mode=record.get('mode'),
+            granted=record.get('granted'),
+            lock_count=record.get('lock_count'),
+            fastpath_count=record.get('fastpath_count')
+        ))
+
+    # 7. Process and store DbObject records
+    for record in object_records:
+        total_size = record.get('total_size_bytes') # Keep as None if not available
+        table_size = record.get('table_size_bytes')
+        index_size = record.get('index_size_bytes')
+        toast_size = None
+
+        # Calculate toast size only if total, table, and index sizes are available
+        if total_size is not None and table_size is not None and index_size is not None:
+             # Calculate based on relation size and index size for tables/mviews
+             if record.get('object_type') in ['table', 'materialized view', 'partitioned table']:
+                 # toast size is often implicitly included in pg_total_relation_size
+                 # pg_total_relation_size = pg_relation_size + pg_indexes_size + toast_size
+                 calculated_toast = total_size - table_size - index_size
+                 toast_size = max(0, calculated_toast) # Ensure non-negative
+
+        db_object = DbObject(
+            snapshot_id=snapshot_id,
+            object_type=record.get('object_type'),
+            schema_name=record.get('schema_name'),
+            object_name=record.get('object_name'),
+            owner=record.get('owner'), # Add owner from query result
+            total_size_bytes=total_size,
+            table_size_bytes=table_size,
+            index_size_bytes=index_size,
+            toast_size_bytes=toast_size,
+            estimated_row_count=record.get('estimated_row_count')
+        )
+        app_db.add(db_object)
+    objects_added = len(object_records)
+
+    # 8. Resolve the wait-for graph into blocking chains and store it
+    blocking_tree = build_blocking_tree(activity_records)
+    if blocking_tree is not None:
+        app_db.add(BlockingTree(
+            snapshot_id=snapshot_id,
+            blocked_sessions=blocking_tree['blocked_sessions'],
+            root_count=len(blocking_tree['roots']),
+            max_depth=blocking_tree['max_depth'],
+            has_cycle=bool(blocking_tree['cycles']),
+            tree=blocking_tree
+        ))
+
+    return {
+        "snapshot_id": snapshot_id,
+        "activities": activities_added,
+        "wait_events": wait_events_added,
+        "statements": statements_added,
+        "regressions": regressions_added,
+        "locks": locks_added,
+        "lock_summaries": len(lock_summary_records),
+        "objects": objects_added,
+        "blocking_tree": blocking_tree,
+    }
+
+async def _fetch(conn: asyncpg.Connection, target: str, collector: str, query: str, *args) -> list:
+    """conn.fetch() recorded in the collector latency, row count, failure and timeout metrics."""
+    started = time.perf_counter()
+    try:
+        records = await conn.fetch(query, *args)
+    except Exception as e:
+        metrics.COLLECTOR_FAILURES.inc(target, collector, type(e).__name__)
+        timeout = _TIMEOUT_ERRORS.get(type(e))
+        if timeout:
+            metrics.COLLECTOR_TIMEOUTS.inc(target, collector, timeout)
+            # The next snapshot of this target is taken as under pressure
+            collection_throttle.record_timeout(int(target))
+        raise
+    finally:
+        metrics.COLLECTOR_QUERY_SECONDS.observe(time.perf_counter() - started, target, collector)
+    metrics.COLLECTOR_ROWS_FETCHED.observe(len(records), target, collector)
+    return records
+
+def collector_timeouts(collector: str, db_conn_details: Mapping[str, Any]) -> Tuple[int, int]:
+    """(statement_timeout, lock_timeout) in ms for a collector: the target's overrides, else the settings."""
+    statement_ms = db_conn_details.get('statement_timeout_ms')
+    if statement_ms is None:
+        statement_ms = settings.COLLECTOR_STATEMENT_TIMEOUTS_MS.get(collector, settings.COLLECTOR_STATEMENT_TIMEOUT_MS)
+    lock_ms = db_conn_details.get('lock_timeout_ms')
+    if lock_ms is None:
+        lock_ms = settings.COLLECTOR_LOCK_TIMEOUT_MS
+    return int(statement_ms), int(lock_ms)
+
+class _CollectorSession:
+    """
+    A pooled target connection whose statement_timeout and lock_timeout follow
+    the collector using it. The limits are set with a session-level SET, only
+    when they change between collectors; asyncpg's RESET ALL on release undoes
+    them before the connection is handed to anyone else.
+    """
+
+    def __init__(self, conn: asyncpg.Connection, target: str, db_conn_details: Mapping[str, Any]):
+        self.conn = conn
+        self.target = target
+        self.db_conn_details = db_conn_details
+        self._applied: Optional[Tuple[int, int]] = None
+
+    async def fetch(self, collector: str, query: str, *args) -> list:
+        timeouts = collector_timeouts(collector, self.db_conn_details)
+        if timeouts != self._applied:
+            await self.conn.execute(f"SET statement_timeout = {timeouts[0]}; SET lock_timeout = {timeouts[1]}")
+            self._applied = timeouts
+        try:
+            return await _fetch(self.conn, self.target, collector, query, *args)
+        except (asyncpg.QueryCanceledError, asyncpg.LockNotAvailableError) as e:
+            limit = f"statement_timeout of {timeouts[0]} ms" if isinstance(e, asyncpg.QueryCanceledError) else f"lock_timeout of {timeouts[1]} ms"
+            logger.warning(f"Collector {collector} on database ID {self.target} exceeded its {limit}.")
+            raise
+
+def _is_connect_failure(error: BaseException, pool: Optional[asyncpg.Pool]) -> bool:
+    """
+    Whether a failed pool acquire means the target could not be reached, as
+    opposed to the pool being busy; only the former counts toward the circuit
+    breaker. A timeout counts when the pool still had room for another
+    connection, i.e. a connect attempt was what hung.
+    """
+    if isinstance(error, asyncio.TimeoutError): # Before the OSError check: TimeoutError is one
+        return pool is None or pool.get_size() < pool.get_max_size()
+    return isinstance(error, _CONNECT_ERRORS)
+
+def snapshots_in_flight() -> int:
+    """Number of snapshots currently running."""
+    return len(_in_flight)
+
 async def take_snapshot(db_conn_details: dict):
     """
     Connects to a monitored PostgreSQL database, gathers monitoring data,
@@ -30,25 +433,65 @@ async def take_snapshot(db_conn_details: dict):
         return
 
     logger.info(f"Starting snapshot for database ID: {monitored_db_id} ({db_name} at {host}:{port})")
+    target = str(monitored_db_id)
+    snapshot_started = time.perf_counter()
+    _in_flight.add(monitored_db_id)
 
+    pool = None
     conn = None
     activity_records = []
     statements_records = []
     lock_records = []
+    lock_summary_records = []
     object_records = []
 
     try:
-        # 1. Establish connection to target database
+        # 1. Acquire a connection to the target database from its pool
         logger.info(f"Connecting to target database: {db_name} at {host}:{port} as {user}")
-        conn = await asyncpg.connect(
-            user=user,
-            password=password,
-            database=db_name,
-            host=host,
-            port=port,
-            timeout=10 # Add a connection timeout
-        )
+        acquire_started = time.perf_counter()
+        try:
+            pool = await target_pools.get_pool(
+                db_id=monitored_db_id,
+                host=host,
+                port=port,
+                database=db_name,
+                user=user,
+                password=password,
+                idle_in_transaction_timeout_ms=db_conn_details.get('idle_in_transaction_timeout_ms')
+            )
+            conn = await pool.acquire(timeout=10) # Add a connection timeout
+        except Exception as e:
+            metrics.COLLECTOR_FAILURES.inc(target, "connect", type(e).__name__)
+            if _is_connect_failure(e, pool):
+                # Unreachable target: counted by the circuit breaker (which logs it), no traceback
+                target_circuit_breaker.record_failure(monitored_db_id, e)
+            else:
+                # Reachable but every pooled connection is busy (object details, row count jobs)
+                metrics.COLLECTOR_SKIPPED.inc(target, "pool_busy")
+                logger.warning(
+                    f"No free connection to database ID {monitored_db_id} "
+                    f"({type(e).__name__}: {e or 'acquire timed out'}); skipping this snapshot."
+                )
+            return
+        finally:
+            metrics.POOL_ACQUIRE_SECONDS.observe(time.perf_counter() - acquire_started, target)
+        target_circuit_breaker.record_success(monitored_db_id)
         logger.info(f"Successfully connected to target database: {db_name}")
+        session = _CollectorSession(conn, target, db_conn_details)
+
+        # Probe the target's load; under pressure the heavy collectors are skipped this time
+        load = None
+        if settings.THROTTLE_ENABLED:
+            probe_started = time.perf_counter()
+            try:
+                probe = (await session.fetch("pressure", PRESSURE_QUERY))[0]
+            except Exception as e:
+                logger.warning(f"Pressure probe failed for {db_name}: {e}")
+                probe = None
+            load = collection_throttle.assess(monitored_db_id, probe, (time.perf_counter() - probe_started) * 1000)
+            for collector in load["skipped"]:
+                metrics.COLLECTOR_THROTTLED.inc(target, collector)
+        skipped = load["skipped"] if load else []
 
         # --- Execute monitoring queries --- 
         # (Error handling added around each query section)
@@ -62,11 +505,13 @@ async def take_snapshot(db_conn_details: dict):
                     client_addr, client_hostname, client_port, backend_start,
                     xact_start, state, wait_event_type, wait_event, query_start,
                     state_change, backend_xid, backend_xmin,
-                    query_id, query, backend_type
+                    query_id, query, backend_type,
+                    -- Wait-for edges, only for sessions actually waiting on a heavyweight lock
+                    CASE WHEN wait_event_type = 'Lock' THEN pg_blocking_pids(pid) END AS blocking_pids
                 FROM pg_stat_activity
                 WHERE datname = $1 AND backend_type = 'client backend'
             '''
-            activity_records = await conn.fetch(activity_query, db_name)
+            activity_records = await session.fetch("activity", activity_query, db_name)
             logger.info(f"Fetched {len(activity_records)} activity records from {db_name}.")
         except asyncpg.PostgresError as e:
             logger.error(f"Database error fetching pg_stat_activity for {db_name}: {e}")
@@ -76,9 +521,10 @@ async def take_snapshot(db_conn_details: dict):
 
         # Query pg_stat_statements (check if enabled first)
         statements_enabled = False
+        statements_collected = False
         try:
             check_ext_query = "SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements'"
-            statements_enabled = await conn.fetchval(check_ext_query) is not None
+            statements_enabled = "statements" not in skipped and await conn.fetchval(check_ext_query) is not None
             if statements_enabled:
                 logger.info(f"Fetching pg_stat_statements for {db_name}...")
                 statements_query = '''
@@ -99,8 +545,11 @@ async def take_snapshot(db_conn_details: dict):
                 '''
                 # Note: total_time and total_plan_time might be named differently in older PG
                 # Adjust query based on target PG version if needed
-                statements_records = await conn.fetch(statements_query, db_name)
+                statements_records = await session.fetch("statements", statements_query, db_name)
+                statements_collected = True
                 logger.info(f"Fetched {len(statements_records)} statement records from {db_name}.")
+            elif "statements" in skipped:
+                logger.info(f"Skipping pg_stat_statements for {db_name} (target under pressure).")
             else:
                 logger.warning(f"pg_stat_statements extension not found or enabled in database {db_name}. Skipping statement stats.")
         except asyncpg.UndefinedTableError:
@@ -112,17 +561,18 @@ async def take_snapshot(db_conn_details: dict):
 
         # Query pg_locks
         try:
-            logger.info(f"Fetching pg_locks for {db_name}...")
-            locks_query = '''
-                SELECT
-                    locktype, database, relation, page, tuple, virtualxid,
-                    transactionid, classid, objid, objsubid, virtualtransaction,
-                    pid, mode, granted, fastpath, waitstart
-                FROM pg_locks
-                WHERE database = (SELECT oid FROM pg_database WHERE datname = $1)
-            '''
-            lock_records = await conn.fetch(locks_query, db_name)
-            logger.info(f"Fetched {len(lock_records)} lock records from {db_name}.")
+            logger.info(f"Fetching pg_locks for {db_name} ({settings.LOCK_COLLECTION_MODE} mode)...")
+            lock_summary_records = await session.fetch("lock_summary", LOCK_SUMMARY_QUERY, db_name)
+            waiting_locks = sum(r['lock_count'] for r in lock_summary_records if not r['granted'])
+            if settings.LOCK_COLLECTION_MODE == "full":
+                lock_records = await session.fetch("locks", LOCKS_FULL_QUERY, db_name)
+            elif waiting_locks:
+                # Only under contention: the awaited locks plus the locks they conflict with
+                lock_records = await session.fetch("locks", LOCKS_CONTENTION_QUERY, db_name)
+            logger.info(
+                f"Fetched {sum(r['lock_count'] for r in lock_summary_records)} locks "
+                f"({waiting_locks} waiting, {len(lock_records)} detail rows) from {db_name}."
+            )
         except asyncpg.PostgresError as e:
             logger.error(f"Database error fetching pg_locks for {db_name}: {e}")
         except Exception as e:
@@ -130,9 +580,8 @@ async def take_snapshot(db_conn_details: dict):
 
         # Query object sizes
         try:
-            logger.info(f"Fetching object sizes for {db_name}...")
             # Enhanced query to include owner
-            objects_query = """
+            objects_query = f"""
                 SELECT
                     n.nspname AS schema_name,
                     c.relname AS object_name,
@@ -149,9 +598,15 @@ async def take_snapshot(db_conn_details: dict):
                     pg_catalog.pg_get_userbyid(c.relowner) AS owner, -- Fetch owner name
                     pg_total_relation_size(c.oid) AS total_size_bytes,
                     pg_relation_size(c.oid) AS table_size_bytes,
-                    pg_indexes_size(c.oid) AS index_size_bytes
+                    pg_indexes_size(c.oid) AS index_size_bytes,
+                    -- Planner estimate (no scan), the same as the row count endpoint's;
+                    -- falls back to n_live_tup for never-analyzed tables
+                    CASE
+                        WHEN c.relkind IN ('r', 'm', 'p', 'f') THEN COALESCE({ROW_ESTIMATE_SQL}, s.n_live_tup)
+                    END AS estimated_row_count
                 FROM pg_class c
                 JOIN pg_namespace n ON n.oid = c.relnamespace
+                LEFT JOIN pg_stat_all_tables s ON s.relid = c.oid
                 WHERE n.nspname NOT IN ('pg_catalog', 'information_schema')
                   AND n.nspname !~ '^pg_toast'
                   -- Include more object types if needed, but focus on those with size
@@ -159,171 +614,64 @@ async def take_snapshot(db_conn_details: dict):
                 ORDER BY total_size_bytes DESC NULLS LAST -- Ensure consistent ordering with NULL sizes
                 LIMIT 5000; -- Limit results to avoid overwhelming data
             """
-            object_records = await conn.fetch(objects_query)
-            logger.info(f"Fetched {len(object_records)} object size records from {db_name}.")
+            if "objects" in skipped:
+                logger.info(f"Skipping object sizes for {db_name} (target under pressure).")
+            else:
+                logger.info(f"Fetching object sizes for {db_name}...")
+                object_records = await session.fetch("objects", objects_query)
+                logger.info(f"Fetched {len(object_records)} object size records from {db_name}.")
         except asyncpg.PostgresError as e:
             logger.error(f"Database error fetching object sizes for {db_name}: {e}")
         except Exception as e:
             logger.error(f"Error fetching object sizes for {db_name}: {e}", exc_info=True)
 
+        # Resolve OIDs to names; only OIDs not seen before (or since the cache expired) hit the catalog
+        try:
+            names = await oid_name_cache.resolve(
+                monitored_db_id,
+                conn,
+                relations=(r.get('relation') for r in lock_records),
+                roles=(r.get('userid') for r in statements_records),
+                databases=[r.get('database') for r in lock_records] + [r.get('dbid') for r in statements_records]
+            )
+        except Exception as e:
+            logger.error(f"Error resolving OID names for {db_name}: {e}", exc_info=True)
+            names = {"relation": {}, "role": {}, "database": {}}
+
         # --- Store results in application database --- 
         logger.info("Attempting to store snapshot data in application database...")
         
         snapshot_id = None
-        activities_added = 0
-        statements_added = 0
-        locks_added = 0
-        objects_added = 0
+        added = {}
         
         # Use synchronous session for app DB access
         with SessionLocal() as app_db:
+            ingest_started = time.perf_counter()
             try:
-                # 3. Create Snapshot record
-                new_snapshot = Snapshot(
-                    database_id=monitored_db_id,
-                    snapshot_time=datetime.now(timezone.utc) # Use timezone-aware datetime
+                added = ingest_snapshot(
+                    app_db,
+                    monitored_db_id,
+                    activity_records,
+                    statements_records,
+                    lock_records,
+                    lock_summary_records,
+                    object_records,
+                    names,
+                    load=load,
+                    statements_collected=statements_collected
                 )
-                app_db.add(new_snapshot)
-                app_db.flush() # Flush to get the snapshot ID
-                snapshot_id = new_snapshot.id
-                logger.info(f"Created Snapshot record with ID: {snapshot_id}")
-
-                # 4. Process and store SessionActivity records
-                for record in activity_records:
-                    # Ensure correct type casting, handle potential None values
-                    session_activity = SessionActivity(
-                        snapshot_id=snapshot_id,
-                        datid=record.get('datid'),
-                        datname=record.get('datname'),
-                        pid=record.get('pid'),
-                        usesysid=record.get('usesysid'),
-                        usename=record.get('usename'),
-                        application_name=record.get('application_name'),
-                        client_addr=str(record.get('client_addr')) if record.get('client_addr') else None,
-                        client_hostname=record.get('client_hostname'),
-                        client_port=record.get('client_port'),
-                        backend_start=record.get('backend_start'),
-                        xact_start=record.get('xact_start'),
-                        query_start=record.get('query_start'),
-                        state_change=record.get('state_change'),
-                        wait_event_type=record.get('wait_event_type'),
-                        wait_event=record.get('wait_event'),
-                        state=record.get('state'),
-                        backend_xid=str(record.get('backend_xid')) if record.get('backend_xid') else None,
-                        backend_xmin=str(record.get('backend_xmin')) if record.get('backend_xmin') else None,
-                        query_id=record.get('query_id'), # May be None
-                        query=record.get('query'),
-                        backend_type=record.get('backend_type')
-                    )
-                    app_db.add(session_activity)
-                activities_added = len(activity_records)
-
-                # 5. Process and store StatementStats records
-                for record in statements_records:
-                    # Map pg_stat_statements columns to model attributes
-                    statement_stats = StatementStats(
-                        snapshot_id=snapshot_id,
-                        userid=record.get('userid'),
-                        dbid=record.get('dbid'),
-                        queryid=record.get('queryid'),
-                        query=record.get('query'),
-                        calls=record.get('calls'),
-                        total_time=record.get('total_exec_time'), # Corrected: total_time <- total_exec_time
-                        min_time=record.get('min_exec_time'),     # Corrected: min_time <- min_exec_time
-                        max_time=record.get('max_exec_time'),     # Corrected: max_time <- max_exec_time
-                        mean_time=record.get('mean_exec_time'),    # Corrected: mean_time <- mean_exec_time
-                        stddev_time=record.get('stddev_exec_time'),# Corrected: stddev_time <- stddev_exec_time
-                        rows=record.get('rows'),
-                        shared_blks_hit=record.get('shared_blks_hit'),
-                        shared_blks_read=record.get('shared_blks_read'),
-                        shared_blks_dirtied=record.get('shared_blks_dirtied'),
-                        shared_blks_written=record.get('shared_blks_written'),
-                        local_blks_hit=record.get('local_blks_hit'),
-                        local_blks_read=record.get('local_blks_read'),
-                        local_blks_dirtied=record.get('local_blks_dirtied'),
-                        local_blks_written=record.get('local_blks_written'),
-                        temp_blks_read=record.get('temp_blks_read'),
-                        temp_blks_written=record.get('temp_blks_written'),
-                        blk_read_time=record.get('blk_read_time'),
-                        blk_write_time=record.get('blk_write_time'),
-                        # --- Handle potential newer fields ---
-                        # The following fields might not exist in older PG versions or if pg_stat_statements is older
-                        # Add them conditionally or handle potential KeyErrors if necessary.
-                        # We use .get() which returns None if key doesn't exist, preventing errors.
-                        # toplevel=record.get('toplevel'), # Uncomment if model supports it
-                        # total_plan_time=record.get('total_plan_time'), # Check model field name
-                        # min_plan_time=record.get('min_plan_time'),     # Check model field name
-                        # max_plan_time=record.get('max_plan_time'),     # Check model field name
-                        # mean_plan_time=record.get('mean_plan_time'),    # Check model field name
-                        # stddev_plan_time=record.get('stddev_plan_time'),# Check model field name
-                        # wal_records=record.get('wal_records'),
-                        # wal_fpi=record.get('wal_fpi'),
-                        # wal_bytes=record.get('wal_bytes')
-                        # JIT stats can also be added if needed/available
-                    )
-                    app_db.add(statement_stats)
-                statements_added = len(statements_records)
-
-                # 6. Process and store Lock records
-                for record in lock_records:
-                    db_lock = Lock(
-                        snapshot_id=snapshot_id,
-                        locktype=record.get('locktype'),
-                        database=record.get('database'), 
-                        relation=record.get('relation'), 
-                        page=record.get('page'),
-                        tuple=record.get('tuple'),
-                        virtualxid=record.get('virtualxid'),
-                        transactionid=str(record.get('transactionid')) if record.get('transactionid') else None,
-                        classid=record.get('classid'),
-                        objid=record.get('objid'),
-                        objsubid=record.get('objsubid'),
-                        virtualtransaction=record.get('virtualtransaction'),
-                        pid=record.get('pid'),
-                        mode=record.get('mode'),
-                        granted=record.get('granted'),
-                        fastpath=record.get('fastpath'),
-                        waitstart=record.get('waitstart')
-                    )
-                    app_db.add(db_lock)
-                locks_added = len(lock_records)
-
-                # 7. Process and store DbObject records
-                for record in object_records:
-                    total_size = record.get('total_size_bytes') # Keep as None if not available
-                    table_size = record.get('table_size_bytes')
-                    index_size = record.get('index_size_bytes')
-                    toast_size = None
-
-                    # Calculate toast size only if total, table, and index sizes are available
-                    if total_size is not None and table_size is not None and index_size is not None:
-                         # Calculate based on relation size and index size for tables/mviews
-                         if record.get('object_type') in ['table', 'materialized view', 'partitioned table']:
-                             # toast size is often implicitly included in pg_total_relation_size
-                             # pg_total_relation_size = pg_relation_size + pg_indexes_size + toast_size
-                             calculated_toast = total_size - table_size - index_size
-                             toast_size = max(0, calculated_toast) # Ensure non-negative
-
-                    db_object = DbObject(
-                        snapshot_id=snapshot_id,
-                        object_type=record.get('object_type'),
-                        schema_name=record.get('schema_name'),
-                        object_name=record.get('object_name'),
-                        owner=record.get('owner'), # Add owner from query result
-                        total_size_bytes=total_size,
-                        table_size_bytes=table_size,
-                        index_size_bytes=index_size,
-                        toast_size_bytes=toast_size
-                    )
-                    app_db.add(db_object)
-                objects_added = len(object_records)
+                snapshot_id = added["snapshot_id"]
 
                 # Commit the transaction using asyncio.to_thread
+                commit_started = time.perf_counter()
+                metrics.SNAPSHOT_INGEST_SECONDS.observe(commit_started - ingest_started, target)
                 await asyncio.to_thread(app_db.commit)
+                metrics.SNAPSHOT_COMMIT_SECONDS.observe(time.perf_counter() - commit_started, target)
                 logger.info(f"Successfully committed snapshot data for snapshot ID: {snapshot_id}")
 
             except Exception as db_e:
                 logger.error(f"Error interacting with application database for snapshot {snapshot_id}: {db_e}", exc_info=True)
+                metrics.COLLECTOR_FAILURES.inc(target, "ingest", type(db_e).__name__)
                 try:
                     await asyncio.to_thread(app_db.rollback)
                     logger.info(f"Rolled back transaction for snapshot ID: {snapshot_id}")
@@ -333,23 +681,40 @@ async def take_snapshot(db_conn_details: dict):
 
             # Logging outside the try/except block, only if snapshot_id was obtained
             if snapshot_id:
-                 logger.info(f"Stored {activities_added} SessionActivity records for snapshot ID: {snapshot_id}")
-                 if statements_added > 0:
-                     logger.info(f"Stored {statements_added} StatementStats records for snapshot ID: {snapshot_id}")
-                 if locks_added > 0:
-                     logger.info(f"Stored {locks_added} Lock records for snapshot ID: {snapshot_id}")
-                 if objects_added > 0:
-                     logger.info(f"Stored {objects_added} DbObject records for snapshot ID: {snapshot_id}")
+                 logger.info(f"Stored {added['activities']} SessionActivity records for snapshot ID: {snapshot_id}")
+                 if added['wait_events'] > 0:
+                     logger.info(f"Folded {added['wait_events']} wait events into the wait histogram for snapshot ID: {snapshot_id}")
+                 if added['statements'] > 0:
+                     logger.info(f"Stored {added['statements']} StatementStats records for snapshot ID: {snapshot_id}")
+                 if added['regressions'] > 0:
+                     logger.info(f"Stored {added['regressions']} StatementRegression records for snapshot ID: {snapshot_id}")
+                 if added['locks'] > 0:
+                     logger.info(f"Stored {added['locks']} Lock records for snapshot ID: {snapshot_id}")
+                 if added['lock_summaries'] > 0:
+                     logger.info(f"Stored {added['lock_summaries']} LockSummary records for snapshot ID: {snapshot_id}")
+                 if added['objects'] > 0:
+                     logger.info(f"Stored {added['objects']} DbObject records for snapshot ID: {snapshot_id}")
+                 blocking_tree = added['blocking_tree']
+                 if blocking_tree is not None:
+                     logger.info(f"Stored blocking tree ({blocking_tree['blocked_sessions']} blocked sessions, {len(blocking_tree['cycles'])} cycles) for snapshot ID: {snapshot_id}")
 
             logger.info(f"Successfully finished snapshot processing for database ID: {monitored_db_id}")
+            elapsed = time.perf_counter() - snapshot_started
+            metrics.SNAPSHOT_DURATION_SECONDS.observe(elapsed, target)
+            if elapsed > settings.SNAPSHOT_INTERVAL_MINUTES * 60:
+                metrics.SNAPSHOT_OVERRUNS.inc(target)
 
     except asyncpg.InterfaceError as conn_e:
         logger.error(f"Connection error during snapshot for DB ID {monitored_db_id} ({db_name}): {conn_e}. Connection might be closed.")
+        metrics.COLLECTOR_FAILURES.inc(target, "snapshot", type(conn_e).__name__)
     except asyncpg.PostgresError as e:
         logger.error(f"Database error during snapshot for DB ID {monitored_db_id} ({db_name}): {e}")
+        metrics.COLLECTOR_FAILURES.inc(target, "snapshot", type(e).__name__)
     except Exception as e:
         logger.error(f"Unexpected error during snapshot for DB ID {monitored_db_id} ({db_name}): {e}", exc_info=True) # Add traceback
+        metrics.COLLECTOR_FAILURES.inc(target, "snapshot", type(e).__name__)
     finally:
-        if conn and not conn.is_closed():
-            await conn.close()
-            logger.info(f"Connection closed for target database: {db_name}") 
\ No newline at end of file
+        _in_flight.discard(monitored_db_id)
+        if conn is not None:
+            await pool.release(conn)
+            logger.info(f"Connection released for target database: {db_name}") 
\ No newline at end of file
@@ -0,0 +1,202 @@
+# backend/app/services/statement_regressions.py
+import logging
+from array import array
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+StatementKey = Tuple[int, int, int] # (userid, dbid, queryid), the pg_stat_statements entry key
+
+
+class StatementRegressionKind(str, Enum):
+    latency_regression = "latency_regression" # Interval ms/call jumped past its baseline
+    call_rate_spike = "call_rate_spike" # Interval calls/sec jumped past its baseline
+    new_top_consumer = "new_top_consumer" # Entered the top N by interval execution time
+
+
+class _TargetState:
+    """
+    Rolling per-statement state of one monitored database, kept in parallel typed
+    arrays (one slot per statement) instead of one object per statement.
+    """
+
+    def __init__(self, keys: List[StatementKey]):
+        n = len(keys)
+        self.slots: Dict[StatementKey, int] = {key: i for i, key in enumerate(keys)}
+        self.last_calls = array('d', [0.0]) * n # Cumulative counters at the previous snapshot
+        self.last_total_time = array('d', [0.0]) * n
+        self.latency_ewma = array('d', [0.0]) * n # Mean ms per call, per interval
+        self.latency_var = array('d', [0.0]) * n
+        self.rate_ewma = array('d', [0.0]) * n # Calls per second, per interval
+        self.rate_var = array('d', [0.0]) * n
+        self.samples = array('l', [0]) * n # Intervals folded into the EWMAs
+        self.snapshot_time: Optional[datetime] = None
+        self.top_consumers: frozenset = frozenset()
+
+
+def _merge_entries(records: Iterable[Mapping[str, Any]]) -> List[Mapping[str, Any]]:
+    """
+    One record per (userid, dbid, queryid). With pg_stat_statements.track = all
+    (PG14+) an entry appears twice, toplevel and nested; their calls and
+    execution time are summed, as in diff_statements and merge_statement_rows.
+    """
+    merged: Dict[StatementKey, Mapping[str, Any]] = {}
+    for record in records:
+        if record.get('queryid') is None or record.get('calls') is None:
+            continue
+        key = (record.get('userid'), record.get('dbid'), record.get('queryid'))
+        seen = merged.get(key)
+        if seen is None:
+            merged[key] = record
+            continue
+        combined = dict(seen)
+        combined['calls'] = seen['calls'] + record['calls']
+        combined['total_exec_time'] = (seen.get('total_exec_time') or 0.0) + (record.get('total_exec_time') or 0.0)
+        merged[key] = combined
+    return list(merged.values())
+
+
+def _ewma_update(ewma: array, var: array, i: int, value: float, alpha: float, first: bool) -> None:
+    """Folds one observation into an exponentially weighted mean and variance."""
+    if first:
+        ewma[i] = value
+        var[i] = 0.0
+        return
+    diff = value - ewma[i]
+    ewma[i] += alpha * diff
+    var[i] = (1.0 - alpha) * (var[i] + alpha * diff * diff)
+
+
+class StatementRegressionDetector:
+    """
+    Incremental anomaly detection over the pg_stat_statements delta stream.
+
+    Each snapshot is compared against the previous one of the same target only:
+    per statement, the interval's mean latency (delta total_time / delta calls)
+    and call rate are checked against their EWMA baselines, then folded in.
+    State lives in memory; after a restart the first snapshot of each target
+    only re-establishes the baseline.
+    """
+
+    def __init__(self):
+        self._targets: Dict[int, _TargetState] = {}
+
+    def observe(
+        self,
+        db_id: int,
+        snapshot_time: datetime,
+        statement_records: Iterable[Mapping[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Feeds one snapshot's statements and returns the regressions they show.
+        Statements missing from the snapshot (deallocated or reset) lose their state.
+        """
+        records = _merge_entries(statement_records)
+        previous = self._targets.get(db_id)
+        state = _TargetState([(r.get('userid'), r.get('dbid'), r.get('queryid')) for r in records])
+        state.snapshot_time = snapshot_time
+        self._targets[db_id] = state
+
+        elapsed = None
+        if previous is not None and previous.snapshot_time is not None:
+            elapsed = (snapshot_time - previous.snapshot_time).total_seconds()
+            if elapsed <= 0:
+                elapsed = None
+
+        alpha = settings.REGRESSION_EWMA_ALPHA
+        min_samples = settings.REGRESSION_MIN_SAMPLES
+        min_calls = settings.REGRESSION_MIN_CALLS
+        regressions: List[Dict[str, Any]] = []
+        interval_time: List[Tuple[float, int]] = []
+
+        for i, record in enumerate(records):
+            calls = float(record.get('calls') or 0)
+            total_time = float(record.get('total_exec_time') or 0.0)
+            state.last_calls[i] = calls
+            state.last_total_time[i] = total_time
+
+            j = previous.slots.get((record.get('userid'), record.get('dbid'), record.get('queryid'))) if previous else None
+            if j is None or elapsed is None:
+                continue
+            delta_calls = calls - previous.last_calls[j]
+            delta_time = total_time - previous.last_total_time[j]
+            if delta_calls < 0 or delta_time < 0:
+                continue # Counters were reset; this snapshot is the new baseline
+
+            # Carry the rolling state over to the new slot
+            samples = previous.samples[j]
+            state.latency_ewma[i] = previous.latency_ewma[j]
+            state.latency_var[i] = previous.latency_var[j]
+            state.rate_ewma[i] = previous.rate_ewma[j]
+            state.rate_var[i] = previous.rate_var[j]
+            state.samples[i] = samples
+            if delta_calls == 0:
+                continue
+            interval_time.append((delta_time, i))
+
+            latency = delta_time / delta_calls
+            rate = delta_calls / elapsed
+            if samples >= min_samples and delta_calls >= min_calls:
+                baseline = state.latency_ewma[i]
+                if baseline > 0 and latency >= settings.REGRESSION_LATENCY_FACTOR * baseline:
+                    regressions.append(self._flag(record, StatementRegressionKind.latency_regression.value, latency, baseline, delta_calls, delta_time))
+                baseline = state.rate_ewma[i]
+                if baseline > 0 and rate >= settings.REGRESSION_RATE_FACTOR * baseline:
+                    regressions.append(self._flag(record, StatementRegressionKind.call_rate_spike.value, rate, baseline, delta_calls, delta_time))
+
+            first = samples == 0
+            _ewma_update(state.latency_ewma, state.latency_var, i, latency, alpha, first)
+            _ewma_update(state.rate_ewma, state.rate_var, i, rate, alpha, first)
+            state.samples[i] = samples + 1
+
+        # New top consumer: in this interval's top N by execution time but not in the previous one's
+        interval_time.sort(reverse=True)
+        top = interval_time[:settings.REGRESSION_TOP_N]
+        state.top_consumers = frozenset(i for _, i in top)
+        if previous is not None and previous.top_consumers:
+            previous_top_keys = {key for key, j in previous.slots.items() if j in previous.top_consumers}
+            for rank, (delta_time, i) in enumerate(top, start=1):
+                record = records[i]
+                key = (record.get('userid'), record.get('dbid'), record.get('queryid'))
+                if key not in previous_top_keys and delta_time > 0:
+                    delta_calls = state.last_calls[i] - previous.last_calls[previous.slots[key]]
+                    regressions.append(self._flag(record, StatementRegressionKind.new_top_consumer.value, delta_time, None, delta_calls, delta_time, rank=rank))
+
+        if regressions:
+            logger.info(f"Detected {len(regressions)} statement regressions for database ID {db_id}.")
+        return regressions
+
+    @staticmethod
+    def _flag(
+        record: Mapping[str, Any],
+        kind: str,
+        observed: float,
+        baseline: Optional[float],
+        delta_calls: float,
+        delta_time: float,
+        rank: Optional[int] = None
+    ) -> Dict[str, Any]:
+        return {
+            "queryid": record.get('queryid'),
+            "userid": record.get('userid'),
+            "dbid": record.get('dbid'),
+            "query": record.get('query'),
+            "kind": kind,
+            "observed_value": observed,
+            "baseline_value": baseline,
+            "ratio": (observed / baseline) if baseline else None,
+            "calls_delta": int(delta_calls),
+            "time_delta": delta_time,
+            "rank": rank,
+        }
+
+    def forget_target(self, db_id: int) -> None:
+        """Drops the rolling state of one monitored database."""
+        self._targets.pop(db_id, None)
+
+
+statement_regression_detector = StatementRegressionDetector()
@@ -0,0 +1,120 @@
+# backend/app/services/statement_rollups.py
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import func, insert, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+from app.core.utils import floor_to_hour
+from app.crud import crud_monitoring
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Hours are rolled up once the next snapshot after them has most likely been taken
+ROLLUP_GRACE = timedelta(minutes=5)
+
+
+def _next_hour_to_roll(db: Session, db_id: int) -> Optional[datetime]:
+    """First hour after the last rolled up one that has statement samples (None if nothing to do)."""
+    rolled_until = crud_monitoring.get_statement_rolled_until(db, db_id)
+    after = rolled_until + timedelta(hours=1) if rolled_until is not None else None
+
+    stmt = (
+        select(func.min(models.Snapshot.snapshot_time))
+        .where(
+            models.Snapshot.database_id == db_id,
+            select(models.StatementStats.id)
+            .where(
+                models.StatementStats.snapshot_id == models.Snapshot.id,
+                # Same filter as statement_interval_deltas; rows without a queryid never roll up
+                models.StatementStats.queryid.isnot(None)
+            )
+            .exists()
+        )
+    )
+    if after is not None:
+        stmt = stmt.where(models.Snapshot.snapshot_time >= after)
+    first_sample = db.execute(stmt).scalar()
+    if first_sample is None:
+        return None
+    return floor_to_hour(first_sample)
+
+
+def rollup_statement_hour(db: Session, db_id: int, hour: datetime) -> int:
+    """
+    Writes the statement counter increases of intervals ending in [hour, hour + 1h)
+    and records the hour as rolled up, even when it produced no rows. Returns rows written.
+    """
+    deltas = crud_monitoring.statement_interval_deltas(
+        db_id,
+        count_from=hour,
+        count_to=hour + timedelta(hours=1),
+        lookback_from=hour - timedelta(minutes=settings.STATEMENT_ROLLUP_LOOKBACK_MINUTES),
+        include_end=False
+    )
+    metrics = crud_monitoring.STATEMENT_WINDOW_METRICS
+    rollup = (
+        select(
+            literal(db_id).label("database_id"),
+            literal(hour).label("bucket_start"),
+            deltas.c.userid,
+            deltas.c.dbid,
+            deltas.c.queryid,
+            func.max(deltas.c.query).label("query"),
+            *[func.sum(deltas.c[metric]).label(metric) for metric in metrics],
+            func.count().label("samples"),
+        )
+        .group_by(deltas.c.userid, deltas.c.dbid, deltas.c.queryid)
+    )
+    result = db.execute(
+        insert(models.StatementStatsHourly).from_select(
+            ["database_id", "bucket_start", "userid", "dbid", "queryid", "query", *metrics, "samples"],
+            rollup
+        )
+    )
+    progress = pg_insert(models.StatementRollupProgress).values(database_id=db_id, rolled_until=hour)
+    db.execute(progress.on_conflict_do_update(
+        index_elements=[models.StatementRollupProgress.__table__.c.database_id],
+        set_={"rolled_until": progress.excluded.rolled_until}
+    ))
+    return result.rowcount
+
+
+def rollup_pending_hours(db: Session, db_id: int, now: Optional[datetime] = None) -> int:
+    """Rolls up completed hours of one database, oldest first, at most STATEMENT_ROLLUP_MAX_HOURS_PER_RUN."""
+    now = now or datetime.now(timezone.utc)
+    hour = _next_hour_to_roll(db, db_id)
+    rolled = 0
+    while hour is not None and hour + timedelta(hours=1) + ROLLUP_GRACE <= now \
+            and rolled < settings.STATEMENT_ROLLUP_MAX_HOURS_PER_RUN:
+        rows = rollup_statement_hour(db, db_id, hour)
+        db.commit()
+        logger.debug(f"Rolled up {rows} statement rows for database ID {db_id}, hour {hour.isoformat()}")
+        rolled += 1
+        hour = _next_hour_to_roll(db, db_id)
+    return rolled
+
+
+def rollup_all_databases() -> None:
+    """Rolls up pending hours for every monitored database."""
+    with SessionLocal() as db:
+        db_ids = db.execute(select(models.Connection.id)).scalars().all()
+        for db_id in db_ids:
+            try:
+                rolled = rollup_pending_hours(db, db_id)
+                if rolled:
+                    logger.info(f"Rolled up {rolled} hour(s) of statement statistics for database ID {db_id}.")
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Statement rollup failed for database ID {db_id}: {e}", exc_info=True)
+
+
+async def run_statement_rollups():
+    """Scheduler job: runs the (synchronous, SQL-bound) rollups in a worker thread."""
+    await asyncio.to_thread(rollup_all_databases)
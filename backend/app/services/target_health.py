@@ -0,0 +1,143 @@
+# backend/app/services/target_health.py
+import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    closed = "closed" # Reachable; collected every cycle
+    open = "open" # Unreachable; skipped until the backoff expires
+    half_open = "half_open" # Backoff expired; one probe snapshot is in flight
+
+
+class _TargetCircuit:
+    def __init__(self):
+        self.state = CircuitState.closed
+        self.consecutive_failures = 0
+        self.trips = 0 # Times opened without a success in between; drives the backoff
+        self.retry_at = 0.0 # time.monotonic() when an open circuit lets a probe through
+        self.probe_deadline = 0.0 # A probe that has not reported back by then is given up on
+        self.skipped_runs = 0
+        self.last_error: Optional[str] = None
+        self.last_failure_at: Optional[datetime] = None
+        self.last_success_at: Optional[datetime] = None
+        self.opened_at: Optional[datetime] = None
+
+
+class TargetCircuitBreaker:
+    """
+    Per-target circuit breaker for collection.
+
+    A target whose connection attempts fail `failure_threshold` times in a row
+    is opened: trigger_snapshot_runs skips it (one dict lookup, no connect
+    attempt) until its backoff expires. The backoff starts at
+    `backoff_base_seconds`, doubles each time the circuit re-opens and is capped
+    at `backoff_max_seconds`, with +-10% jitter so targets that failed together
+    are not all retried in the same cycle. Once the backoff expires, one probe
+    snapshot is let through (half-open); success closes the circuit, failure
+    opens it again with the next backoff step.
+
+    Only failures to connect count; query errors on a reachable target do not.
+    State lives in memory, so a restart retries every target.
+    """
+
+    def __init__(self, failure_threshold: int, backoff_base_seconds: float, backoff_max_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self._targets: Dict[int, _TargetCircuit] = {}
+
+    def _backoff_seconds(self, trips: int) -> float:
+        backoff = min(self.backoff_base_seconds * 2 ** (trips - 1), self.backoff_max_seconds)
+        return backoff * random.uniform(0.9, 1.1)
+
+    def allow(self, db_id: int) -> bool:
+        """Whether to collect from the target this cycle. Moves an expired open circuit to half-open."""
+        circuit = self._targets.get(db_id)
+        if circuit is None or circuit.state == CircuitState.closed:
+            return True
+        now = time.monotonic()
+        if circuit.state == CircuitState.open and now >= circuit.retry_at:
+            circuit.state = CircuitState.half_open
+        elif circuit.state == CircuitState.half_open and now < circuit.probe_deadline:
+            circuit.skipped_runs += 1
+            return False
+        elif circuit.state == CircuitState.open:
+            circuit.skipped_runs += 1
+            return False
+        # Let one probe through; if it never reports back (job lost), allow another after a cycle
+        circuit.probe_deadline = now + settings.SNAPSHOT_INTERVAL_MINUTES * 60
+        logger.info(f"Probing database ID {db_id} after backoff ({circuit.consecutive_failures} consecutive failures).")
+        return True
+
+    def record_success(self, db_id: int) -> None:
+        circuit = self._targets.setdefault(db_id, _TargetCircuit())
+        if circuit.state != CircuitState.closed:
+            logger.info(f"Database ID {db_id} is reachable again; resuming collection.")
+        circuit.state = CircuitState.closed
+        circuit.consecutive_failures = 0
+        circuit.trips = 0
+        circuit.opened_at = None
+        circuit.last_success_at = datetime.now(timezone.utc)
+
+    def record_failure(self, db_id: int, error: BaseException) -> None:
+        circuit = self._targets.setdefault(db_id, _TargetCircuit())
+        circuit.consecutive_failures += 1
+        circuit.last_error = f"{type(error).__name__}: {error}"
+        circuit.last_failure_at = datetime.now(timezone.utc)
+        if circuit.state == CircuitState.half_open or circuit.consecutive_failures >= self.failure_threshold:
+            circuit.trips += 1
+            backoff = self._backoff_seconds(circuit.trips)
+            circuit.retry_at = time.monotonic() + backoff
+            if circuit.state != CircuitState.open:
+                circuit.opened_at = circuit.opened_at or circuit.last_failure_at
+            circuit.state = CircuitState.open
+            logger.warning(
+                f"Database ID {db_id} unreachable ({circuit.consecutive_failures} consecutive failures, "
+                f"last: {circuit.last_error}); skipping it for {backoff:.0f} s."
+            )
+        else:
+            logger.warning(
+                f"Could not connect to database ID {db_id} "
+                f"(failure {circuit.consecutive_failures} of {self.failure_threshold}): {circuit.last_error}"
+            )
+
+    def status(self, db_id: int) -> Dict[str, Any]:
+        """The target's circuit as a row for the connections API."""
+        circuit = self._targets.get(db_id) or _TargetCircuit()
+        retry_at = None
+        if circuit.state == CircuitState.open:
+            retry_at = datetime.now(timezone.utc) + timedelta(seconds=max(circuit.retry_at - time.monotonic(), 0.0))
+        return {
+            "db_id": db_id,
+            "state": circuit.state,
+            "consecutive_failures": circuit.consecutive_failures,
+            "trips": circuit.trips,
+            "skipped_runs": circuit.skipped_runs,
+            "last_error": circuit.last_error,
+            "last_failure_at": circuit.last_failure_at,
+            "last_success_at": circuit.last_success_at,
+            "opened_at": circuit.opened_at,
+            "retry_at": retry_at,
+        }
+
+    def statuses(self, db_ids: List[int]) -> List[Dict[str, Any]]:
+        return [self.status(db_id) for db_id in db_ids]
+
+    def forget_target(self, db_id: int) -> None:
+        """Closes the circuit (connection edited or deleted, or an operator asked for a retry)."""
+        self._targets.pop(db_id, None)
+
+
+target_circuit_breaker = TargetCircuitBreaker(
+    failure_threshold=settings.TARGET_BREAKER_FAILURE_THRESHOLD,
+    backoff_base_seconds=settings.TARGET_BREAKER_BACKOFF_BASE_SECONDS,
+    backoff_max_seconds=settings.TARGET_BREAKER_BACKOFF_MAX_SECONDS,
+)
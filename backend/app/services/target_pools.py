@@ -0,0 +1,113 @@
+# backend/app/services/target_pools.py
+import asyncio
+import logging
+from typing import Dict, Optional, Tuple
+
+import asyncpg
+
+from app.core.config import settings
+from app.core.security import decrypt
+
+logger = logging.getLogger(__name__)
+
+# Monitored database ID -> (connection parameters the pool was built with, pool)
+_pools: Dict[int, Tuple[tuple, asyncpg.Pool]] = {}
+_pools_lock = asyncio.Lock()
+
+
+async def get_pool(
+    db_id: int,
+    host: str,
+    port: int,
+    database: str,
+    user: str,
+    password: str,
+    idle_in_transaction_timeout_ms: Optional[int] = None
+) -> asyncpg.Pool:
+    """
+    Returns the shared asyncpg pool for a monitored database, creating it on first use.
+    The pool is rebuilt when the connection parameters change (e.g. after an edit).
+    Pools start empty (min_size=0), so creating one does not block on the target.
+
+    Sessions are opened with application_name TARGET_APPLICATION_NAME and an
+    idle_in_transaction_session_timeout (the target's override, else
+    COLLECTOR_IDLE_IN_TRANSACTION_TIMEOUT_MS). These are startup parameters, so
+    they survive the RESET ALL asyncpg runs when a connection is released.
+    """
+    if idle_in_transaction_timeout_ms is None:
+        idle_in_transaction_timeout_ms = settings.COLLECTOR_IDLE_IN_TRANSACTION_TIMEOUT_MS
+    params = (host, port, database, user, password, idle_in_transaction_timeout_ms)
+    entry = _pools.get(db_id)
+    if entry and entry[0] == params:
+        return entry[1]
+
+    async with _pools_lock:
+        entry = _pools.get(db_id)
+        if entry and entry[0] == params:
+            return entry[1]
+        if entry:
+            logger.info(f"Connection parameters changed for database ID {db_id}; rebuilding its pool.")
+            await _close_pool(db_id, entry[1])
+
+        pool = await asyncpg.create_pool(
+            host=host,
+            port=port,
+            database=database,
+            user=user,
+            password=password,
+            min_size=0,
+            max_size=settings.TARGET_POOL_MAX_SIZE,
+            max_inactive_connection_lifetime=settings.TARGET_POOL_MAX_IDLE_SECONDS,
+            timeout=10, # Connection timeout
+            server_settings={
+                "application_name": settings.TARGET_APPLICATION_NAME,
+                "idle_in_transaction_session_timeout": str(idle_in_transaction_timeout_ms),
+            }
+        )
+        _pools[db_id] = (params, pool)
+        logger.info(f"Created connection pool for database ID {db_id} ({database} at {host}:{port})")
+        return pool
+
+
+async def get_pool_for_connection(db_conn) -> asyncpg.Pool:
+    """Returns the pool for a `models.Connection` row, decrypting its stored password."""
+    return await get_pool(
+        db_id=db_conn.id,
+        host=db_conn.hostname,
+        port=db_conn.port,
+        database=db_conn.db_name,
+        user=db_conn.username,
+        password=decrypt(db_conn.encrypted_password),
+        idle_in_transaction_timeout_ms=db_conn.idle_in_transaction_timeout_ms
+    )
+
+
+async def _close_pool(db_id: int, pool: asyncpg.Pool) -> None:
+    try:
+        await asyncio.wait_for(pool.close(), timeout=10)
+    except Exception as e:
+        logger.warning(f"Pool for database ID {db_id} did not close cleanly, terminating: {e}")
+        pool.terminate()
+
+
+async def close_pool(db_id: int) -> None:
+    """Closes and forgets the pool of one monitored database, if any."""
+    entry = _pools.pop(db_id, None)
+    if entry:
+        await _close_pool(db_id, entry[1])
+
+
+def pool_usage() -> Dict[int, Dict[str, int]]:
+    """Connections per target pool: open (size), idle, in use and the configured maximum."""
+    usage = {}
+    for db_id, (_, pool) in _pools.items():
+        size, idle = pool.get_size(), pool.get_idle_size()
+        usage[db_id] = {"size": size, "idle": idle, "in_use": size - idle, "max_size": pool.get_max_size()}
+    return usage
+
+
+async def close_all_pools() -> None:
+    """Closes every target pool. Called on application shutdown."""
+    for db_id in list(_pools):
+        await close_pool(db_id)
+
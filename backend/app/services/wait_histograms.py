@@ -0,0 +1,73 @@
+# backend/app/services/wait_histograms.py
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Any, Iterable, Mapping
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+from app.core.utils import floor_to_interval
+
+logger = logging.getLogger(__name__)
+
+# Active sessions without a wait event are on CPU (or waiting on something not instrumented)
+CPU_WAIT = ("CPU", "CPU")
+
+
+def count_wait_events(activity_records: Iterable[Mapping[str, Any]]) -> Counter:
+    """Counts one snapshot's non-idle sessions per (wait_event_type, wait_event)."""
+    counts: Counter = Counter()
+    for record in activity_records:
+        state = record.get('state')
+        if state is None or state == 'idle':
+            continue
+        wait_event_type = record.get('wait_event_type')
+        if wait_event_type is None:
+            if state == 'active':
+                counts[CPU_WAIT] += 1
+            continue
+        counts[(wait_event_type, record.get('wait_event') or wait_event_type)] += 1
+    return counts
+
+
+def fold_wait_histogram(
+    db: Session,
+    db_id: int,
+    snapshot_time: datetime,
+    activity_records: Iterable[Mapping[str, Any]]
+) -> int:
+    """
+    Adds one snapshot's wait event counts to its WAIT_HISTOGRAM_BUCKET_MINUTES
+    bucket with a single upsert, inside the caller's transaction. Returns the
+    number of (wait_event_type, wait_event) rows touched.
+    """
+    counts = count_wait_events(activity_records)
+    if not counts:
+        return 0
+    bucket_start = floor_to_interval(snapshot_time, settings.WAIT_HISTOGRAM_BUCKET_MINUTES * 60)
+    stmt = insert(models.WaitEventHistogram).values([
+        {
+            "database_id": db_id,
+            "bucket_start": bucket_start,
+            "wait_event_type": wait_event_type,
+            "wait_event": wait_event,
+            "session_samples": sessions,
+            "max_sessions": sessions,
+            "snapshots": 1,
+        }
+        for (wait_event_type, wait_event), sessions in counts.items()
+    ])
+    table = models.WaitEventHistogram.__table__
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[table.c.database_id, table.c.bucket_start, table.c.wait_event_type, table.c.wait_event],
+        set_={
+            "session_samples": table.c.session_samples + stmt.excluded.session_samples,
+            "max_sessions": func.greatest(table.c.max_sessions, stmt.excluded.max_sessions),
+            "snapshots": table.c.snapshots + 1,
+        }
+    ))
+    return len(counts)
@@ -0,0 +1,127 @@
+# backend/app/startup.py
+"""
+Background startup. The lifespan hook only starts `run_background_startup` and
+yields, so the server binds its port right away; the scheduler (and with it the
+SQLAlchemyJobStore connection), the target pools and the application database
+are brought up afterwards, and the first collection runs as soon as the
+scheduler is up instead of one interval later.
+
+Readiness (/api/v1/health/ready) stays 503 until the scheduler is running, and
+reports the phase timings recorded here.
+"""
+import asyncio
+import importlib
+import logging
+import time
+from typing import Dict
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Phase name -> seconds, in completion order; "import" is set by main.py
+phases: Dict[str, float] = {}
+complete = False
+
+# app.scheduler once imported (it pulls in APScheduler and every scheduled service)
+_scheduler_module = None
+
+
+def record_phase(name: str, seconds: float) -> None:
+    phases[name] = seconds
+    logger.info(f"Startup phase {name} took {seconds * 1000:.0f} ms")
+
+
+def running_scheduler():
+    """The scheduler once background startup has started it, else None."""
+    if _scheduler_module is None:
+        return None
+    scheduler = _scheduler_module.scheduler
+    return scheduler if scheduler is not None and scheduler.running else None
+
+
+async def _timed(name: str, coro) -> bool:
+    """Runs one phase; failures are logged, not raised, so the other phases still run."""
+    started = time.perf_counter()
+    try:
+        await coro
+        return True
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error(f"Startup phase {name} failed: {e}", exc_info=True)
+        return False
+    finally:
+        record_phase(name, time.perf_counter() - started)
+
+
+async def _start_scheduler() -> None:
+    global _scheduler_module
+    module = await asyncio.to_thread(importlib.import_module, "app.scheduler")
+    # The job store connects and loads jobs in start(); keep that off the event loop
+    await asyncio.to_thread(module.init_scheduler, None, asyncio.get_running_loop())
+    _scheduler_module = module
+
+
+async def _warm_target_pools() -> None:
+    """Opens one connection per target pool, so the first snapshots do not pay for the connects."""
+    from app.crud.crud_connection import get_connections
+    from app.db.session import SessionLocal
+    from app.services import target_pools
+
+    def load_connections():
+        with SessionLocal() as db:
+            return get_connections(db, limit=1000)
+
+    connections = await asyncio.to_thread(load_connections)
+    slots = asyncio.Semaphore(settings.STARTUP_WARM_CONCURRENCY)
+
+    async def warm(db_conn) -> bool:
+        async with slots:
+            try:
+                pool = await target_pools.get_pool_for_connection(db_conn)
+                conn = await pool.acquire(timeout=10)
+                await pool.release(conn)
+                return True
+            except Exception as e:
+                logger.warning(f"Could not warm the pool of database ID {db_conn.id} ({db_conn.alias}): {e}")
+                return False
+
+    warmed = await asyncio.gather(*(warm(db_conn) for db_conn in connections))
+    logger.info(f"Warmed {sum(warmed)} of {len(warmed)} target pools")
+
+
+def _warm_app_database() -> None:
+    """Opens the engine's first connection and runs each target's latest-snapshot lookup once (blocking)."""
+    from sqlalchemy import select
+
+    from app import models
+    from app.crud.crud_monitoring import get_latest_snapshot
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        for db_id in db.execute(select(models.Connection.id)).scalars():
+            get_latest_snapshot(db, db_id)
+
+
+async def run_background_startup() -> None:
+    global complete
+    started = time.perf_counter()
+    tasks = [
+        _timed("scheduler", _start_scheduler()),
+        _timed("app_database", asyncio.to_thread(_warm_app_database)),
+    ]
+    if settings.STARTUP_WARM_TARGET_POOLS:
+        tasks.append(_timed("target_pools", _warm_target_pools()))
+    scheduler_started, *_ = await asyncio.gather(*tasks)
+
+    if scheduler_started and settings.STARTUP_INITIAL_SNAPSHOT:
+        await _timed("initial_snapshots", _scheduler_module.trigger_snapshot_runs())
+    record_phase("background", time.perf_counter() - started)
+    complete = True
+
+
+def shutdown() -> None:
+    """Stops the scheduler if background startup got that far."""
+    if _scheduler_module is not None:
+        _scheduler_module.shutdown_scheduler()
@@ -0,0 +1,144 @@
+"""
+Benchmark for app.services.history_analytics.
+
+    python benchmarks/bench_history_analytics.py                   # compute only, synthetic arrays
+    python benchmarks/bench_history_analytics.py --rows 5000000
+    python benchmarks/bench_history_analytics.py --database        # also load through the app DB
+
+--database writes a synthetic history (one scratch monitored database, its
+snapshots and statement_stats rows) into the application database configured
+in .env / the environment, times the columnar loaders against it, and deletes
+it again. Run it against a development database only.
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import history_analytics  # noqa: E402
+
+
+def synthetic_history(statements: int, snapshots: int, seed: int = 0) -> np.ndarray:
+    """Cumulative counters for `statements` queryids over `snapshots` one-minute snapshots, ordered by (queryid, ts)."""
+    rng = np.random.default_rng(seed)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc).timestamp()
+    history = np.empty(statements * snapshots, dtype=history_analytics.STATEMENT_DTYPE)
+    history["queryid"] = np.repeat(rng.integers(-2**62, 2**62, size=statements), snapshots)
+    history["ts"] = np.tile(start + 60.0 * np.arange(snapshots), statements)
+
+    calls = rng.poisson(rng.gamma(1.0, 50.0, size=(statements, 1)), size=(statements, snapshots)).astype("f8")
+    latency = rng.lognormal(mean=0.0, sigma=0.5, size=(statements, snapshots))
+    # A few counter resets, as after pg_stat_statements_reset()
+    resets = rng.random((statements, snapshots)) < 0.001
+    cumulative_calls = np.cumsum(calls, axis=1)
+    cumulative_time = np.cumsum(calls * latency, axis=1)
+    for cumulative in (cumulative_calls, cumulative_time):
+        cumulative[resets] = 0.0
+    history["calls"] = cumulative_calls.ravel()
+    history["total_time"] = cumulative_time.ravel()
+    history["rows"] = cumulative_calls.ravel() * 3
+    return history
+
+
+def synthetic_activity(history: np.ndarray, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed + 1)
+    ts = np.unique(history["ts"])
+    activity = np.empty(len(ts), dtype=history_analytics.ACTIVITY_DTYPE)
+    activity["ts"] = ts
+    activity["active"] = rng.poisson(20, size=len(ts))
+    activity["waiting"] = rng.poisson(2, size=len(ts))
+    activity["sessions"] = activity["active"] + rng.poisson(50, size=len(ts))
+    return activity
+
+
+def timed(label: str, func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    print(f"  {label:<40} {time.perf_counter() - started:8.3f} s")
+    return result
+
+
+def bench_compute(statements: int, snapshots: int) -> None:
+    print(f"Compute: {statements} statements x {snapshots} snapshots = {statements * snapshots:,} rows")
+    history = timed("generate synthetic history", synthetic_history, statements, snapshots)
+    activity = synthetic_activity(history)
+    intervals = timed("statement_intervals", history_analytics.statement_intervals, history)
+    timed("grouped_quantiles (p50, p95, p99)", history_analytics.grouped_quantiles,
+          intervals["queryid"], intervals["ms_per_call"], (0.5, 0.95, 0.99))
+    one = history[: snapshots]
+    timed("rate series + rolling mean (1 queryid)",
+          lambda: history_analytics.rolling_mean(history_analytics.statement_intervals(one)["ms_per_call"], 5))
+    timed("activity_statement_correlation", history_analytics.activity_statement_correlation, activity, intervals, 5)
+
+
+def bench_database(statements: int, snapshots: int) -> None:
+    from sqlalchemy import text
+
+    from app.db.session import SessionLocal
+    from app.models import Connection
+
+    print(f"Database: {statements} statements x {snapshots} snapshots = {statements * snapshots:,} rows")
+    history = synthetic_history(statements, snapshots)
+    with SessionLocal() as db:
+        scratch = Connection(alias="bench-history-analytics", hostname="bench.invalid", port=5432,
+                             db_name="bench", username="bench", encrypted_password="")
+        db.add(scratch)
+        db.commit()
+        try:
+            started = time.perf_counter()
+            ts = np.unique(history["ts"])
+            snapshot_ids = db.execute(
+                text("INSERT INTO snapshots (database_id, snapshot_time) "
+                     "SELECT :db_id, to_timestamp(t) FROM unnest(CAST(:ts AS float8[])) AS t ORDER BY t RETURNING id"),
+                {"db_id": scratch.id, "ts": ts.tolist()}
+            ).scalars().all()
+            snapshot_of = dict(zip(ts.tolist(), snapshot_ids))
+            buffer = io.StringIO()
+            ids = np.array([snapshot_of[t] for t in history["ts"].tolist()])
+            np.savetxt(buffer, np.column_stack((ids, history["queryid"], history["calls"].astype("i8"),
+                                                history["total_time"], history["rows"].astype("i8"))),
+                       fmt=["%d", "%d", "%d", "%.3f", "%d"], delimiter="\t")
+            buffer.seek(0)
+            cursor = db.connection().connection.cursor()
+            cursor.copy_expert("COPY statement_stats (snapshot_id, queryid, calls, total_time, rows) FROM STDIN", buffer)
+            db.commit()
+            db.execute(text("ANALYZE snapshots, statement_stats"))
+            print(f"  {'insert fixture (COPY + ANALYZE)':<40} {time.perf_counter() - started:8.3f} s")
+
+            start_time = datetime.fromtimestamp(ts[0], tz=timezone.utc)
+            end_time = datetime.fromtimestamp(ts[-1], tz=timezone.utc) + timedelta(seconds=1)
+            loaded = timed("load_statement_history (all)", history_analytics.load_statement_history,
+                           db, scratch.id, start_time, end_time)
+            intervals = timed("statement_intervals", history_analytics.statement_intervals, loaded)
+            timed("grouped_quantiles (p50, p95, p99)", history_analytics.grouped_quantiles,
+                  intervals["queryid"], intervals["ms_per_call"], (0.5, 0.95, 0.99))
+            timed("load_statement_history (1 queryid)", history_analytics.load_statement_history,
+                  db, scratch.id, start_time, end_time, int(loaded["queryid"][0]))
+            timed("load_activity_history", history_analytics.load_activity_history,
+                  db, scratch.id, start_time, end_time)
+        finally:
+            db.rollback()
+            db.execute(text("DELETE FROM statement_stats WHERE snapshot_id IN "
+                            "(SELECT id FROM snapshots WHERE database_id = :db_id)"), {"db_id": scratch.id})
+            db.execute(text("DELETE FROM snapshots WHERE database_id = :db_id"), {"db_id": scratch.id})
+            db.delete(scratch)
+            db.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Total statement_stats rows")
+    parser.add_argument("--snapshots", type=int, default=1440, help="Snapshots per statement (one per minute)")
+    parser.add_argument("--database", action="store_true", help="Also benchmark loading from the app database")
+    args = parser.parse_args()
+
+    statements = max(1, args.rows // args.snapshots)
+    bench_compute(statements, args.snapshots)
+    if args.database:
+        bench_database(statements, args.snapshots)
@@ -0,0 +1,124 @@
+"""
+Benchmark for snapshot ingestion (app.services.snapshot_service.ingest_snapshot).
+
+    python benchmarks/bench_ingest.py                              # 10k statements, 5k objects, 500 sessions
+    python benchmarks/bench_ingest.py --statements 50000 --snapshots 5
+    python benchmarks/bench_ingest.py --long-query-ratio 0.2       # more multi-KB query texts
+
+Feeds synthetic pg_stat_activity / pg_stat_statements / pg_locks / object size
+records (benchmarks/fixtures.py) through the same ingest path take_snapshot
+uses, against the application database configured in .env / the environment,
+and times the three phases separately: mapping records to ORM rows, flushing
+them, and committing. Peak Python memory is measured in a separate traced pass
+so tracemalloc does not skew the timings. A scratch monitored database is
+created and deleted again; run it against a development database only.
+"""
+import argparse
+import logging
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fixtures  # noqa: E402
+
+from app.db.session import SessionLocal  # noqa: E402
+from app.models import Connection  # noqa: E402
+from app.services.snapshot_service import ingest_snapshot  # noqa: E402
+
+ROW_KINDS = ("activities", "statements", "locks", "lock_summaries", "objects", "wait_events", "regressions")
+
+
+def ingest_once(db, db_id: int, snapshot: dict, snapshot_time: datetime) -> dict:
+    """One snapshot through ingest_snapshot, flush and commit; returns the phase timings and row counts."""
+    started = time.perf_counter()
+    added = ingest_snapshot(db, db_id, snapshot_time=snapshot_time, **snapshot)
+    mapped = time.perf_counter()
+    db.flush()
+    flushed = time.perf_counter()
+    db.commit()
+    committed = time.perf_counter()
+    db.expunge_all()
+    return {
+        "map": mapped - started,
+        "flush": flushed - mapped,
+        "commit": committed - flushed,
+        "rows": sum(added[kind] for kind in ROW_KINDS) + 1,
+        **{kind: added[kind] for kind in ROW_KINDS},
+    }
+
+
+def cleanup(db, db_ids: list) -> None:
+    """Deletes scratch monitored databases and everything collected for them."""
+    from sqlalchemy import text
+
+    db.rollback()
+    params = {"db_ids": list(db_ids)}
+    for table in ("session_activity", "statement_stats", "locks", "lock_summaries", "db_objects",
+                  "statement_regressions", "blocking_trees"):
+        db.execute(text(f"DELETE FROM {table} WHERE snapshot_id IN "
+                        "(SELECT id FROM snapshots WHERE database_id = ANY(:db_ids))"), params)
+    for table in ("snapshots", "wait_event_histograms", "object_growth", "statement_stats_hourly"):
+        db.execute(text(f"DELETE FROM {table} WHERE database_id = ANY(:db_ids)"), params)
+    db.execute(text("DELETE FROM monitored_databases WHERE id = ANY(:db_ids)"), params)
+    db.commit()
+
+
+def report(results: list) -> None:
+    print(f"  {'snapshot':<10}{'rows':>8}{'map s':>9}{'flush s':>9}{'commit s':>10}{'total s':>9}{'rows/s':>10}")
+    for i, result in enumerate(results, 1):
+        total = result["map"] + result["flush"] + result["commit"]
+        print(f"  {i:<10}{result['rows']:>8}{result['map']:>9.3f}{result['flush']:>9.3f}"
+              f"{result['commit']:>10.3f}{total:>9.3f}{result['rows'] / total:>10,.0f}")
+    last = results[-1]
+    print("  rows per snapshot: " + ", ".join(f"{kind}={last[kind]}" for kind in ROW_KINDS))
+
+
+def bench(args) -> None:
+    logging.getLogger("app").setLevel(logging.WARNING)
+    snapshot = fixtures.generate_snapshot(args.sessions, args.statements, args.objects,
+                                          args.long_query_ratio, args.long_query_length, seed=args.seed)
+    text_bytes = sum(len(r["query"]) for r in snapshot["statements_records"])
+    print(f"Fixture: {args.sessions} sessions, {args.statements} statements ({text_bytes / 2**20:.1f} MiB of query text), "
+          f"{len(snapshot['lock_records'])} locks, {args.objects} objects")
+
+    start_time = datetime.now(timezone.utc) - timedelta(minutes=5 * (args.snapshots + 1))
+    with SessionLocal() as db:
+        scratch = Connection(alias="bench-ingest", hostname="bench.invalid", port=5432,
+                             db_name="bench", username="bench", encrypted_password="")
+        db.add(scratch)
+        db.commit()
+        db_id = scratch.id
+        try:
+            results = []
+            for i in range(args.snapshots):
+                results.append(ingest_once(db, db_id, snapshot, start_time + timedelta(minutes=5 * i)))
+                snapshot["statements_records"] = fixtures.advance_statements(snapshot["statements_records"], seed=i)
+            print("Timed passes:")
+            report(results)
+
+            tracemalloc.start()
+            ingest_once(db, db_id, snapshot, start_time + timedelta(minutes=5 * args.snapshots))
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"  {'peak traced Python memory (1 snapshot)':<40} {peak / 2**20:8.1f} MiB")
+            print(f"  {'process max RSS':<40} {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:8.1f} MiB")
+        finally:
+            cleanup(db, [db_id])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=500, help="pg_stat_activity rows per snapshot")
+    parser.add_argument("--statements", type=int, default=10000, help="pg_stat_statements rows per snapshot")
+    parser.add_argument("--objects", type=int, default=5000, help="Object size rows per snapshot")
+    parser.add_argument("--long-query-ratio", type=float, default=0.02, help="Share of statements with long query texts")
+    parser.add_argument("--long-query-length", type=int, default=16384, help="Maximum length of a long query text")
+    parser.add_argument("--snapshots", type=int, default=3, help="Timed snapshots (counters advance between them)")
+    parser.add_argument("--seed", type=int, default=0)
+    bench(parser.parse_args())
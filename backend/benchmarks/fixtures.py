@@ -0,0 +1,248 @@
+"""
+Synthetic pg_stat_activity, pg_stat_statements, pg_locks and object size record
+sets, shaped like the rows the collector fetches (plain dicts, which
+take_snapshot/ingest_snapshot read the same way as asyncpg Records).
+
+Generators are deterministic for a given seed. `generate_snapshot` builds one
+consistent snapshot: sessions run statements from the statement set, lock rows
+belong to those sessions and reference the generated relations, and a few
+sessions wait on others.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+Record = Dict[str, Any]
+
+DATABASE_OID = 16385
+DATABASE_NAME = "bench"
+ROLE_OIDS = {10: "postgres", 16390: "app", 16391: "reporting", 16392: "etl"}
+SCHEMAS = ("public", "billing", "inventory", "audit", "analytics")
+
+_COLUMNS = ("id", "account_id", "created_at", "updated_at", "status", "amount", "sku", "quantity", "region", "note")
+_STATEMENT_TEMPLATES = (
+    "SELECT {cols} FROM {table} WHERE id = $1",
+    "SELECT {cols} FROM {table} WHERE account_id = $1 AND status = $2 ORDER BY created_at DESC LIMIT $3",
+    "UPDATE {table} SET status = $1, updated_at = now() WHERE id = $2",
+    "INSERT INTO {table} ({cols}) VALUES ({params})",
+    "DELETE FROM {table} WHERE created_at < $1",
+    "SELECT count(*) FROM {table} t JOIN {other} o ON o.id = t.account_id WHERE t.region = $1",
+    "WITH recent AS (SELECT * FROM {table} WHERE created_at > now() - interval '1 day') "
+    "SELECT region, sum(amount) FROM recent GROUP BY region",
+)
+
+
+def _table_names(count: int, rng: random.Random) -> List[str]:
+    return [f"{rng.choice(SCHEMAS)}.t_{i:05d}" for i in range(count)]
+
+
+def _long_query(rng: random.Random, table: str, length: int) -> str:
+    """A statement of roughly `length` characters: ORM-style column lists, CTEs and long IN lists."""
+    alias = table.split(".")[-1]
+    parts = ["SELECT " + ", ".join(f"{table}.{c} AS {alias}_{c}" for c in _COLUMNS) + f" FROM {table}"]
+    i = 0
+    while sum(len(p) for p in parts) < length:
+        kind = rng.random()
+        if kind < 0.4:
+            parts.append(f" LEFT JOIN {table} j{i} ON j{i}.id = {table}.account_id AND j{i}.status = ${i + 1}")
+        elif kind < 0.8:
+            parts.append(f" AND {table}.{rng.choice(_COLUMNS)} IN ({', '.join(f'${n}' for n in range(i + 1, i + 40))})")
+        else:
+            parts.append(f" /* {rng.choice(('reporting', 'batch', 'api'))} request {rng.getrandbits(64):x} */")
+        i += 40
+    return "".join(parts)[:length]
+
+
+def generate_statements(
+    count: int = 10000,
+    tables: Optional[List[str]] = None,
+    long_query_ratio: float = 0.02,
+    long_query_length: int = 16384,
+    seed: int = 0
+) -> List[Record]:
+    """pg_stat_statements rows (all columns the collector selects) with skewed, cumulative counters."""
+    rng = random.Random(seed)
+    tables = tables or _table_names(500, rng)
+    records = []
+    for i in range(count):
+        table = rng.choice(tables)
+        if rng.random() < long_query_ratio:
+            query = _long_query(rng, table, rng.randint(long_query_length // 2, long_query_length))
+        else:
+            cols = ", ".join(rng.sample(_COLUMNS, rng.randint(1, len(_COLUMNS))))
+            query = rng.choice(_STATEMENT_TEMPLATES).format(
+                cols=cols, table=table, other=rng.choice(tables),
+                params=", ".join(f"${n + 1}" for n in range(cols.count(",") + 1))
+            )
+        calls = int(rng.paretovariate(1.2) * 10)
+        mean = rng.lognormvariate(0.0, 1.5)
+        total = calls * mean
+        rows = calls * rng.randint(0, 50)
+        hit = calls * rng.randint(1, 200)
+        read = int(hit * rng.random() * 0.1)
+        records.append({
+            "userid": rng.choice(list(ROLE_OIDS)), "dbid": DATABASE_OID, "queryid": rng.getrandbits(63) - 2**62,
+            "query": query, "calls": calls, "total_exec_time": total,
+            "min_exec_time": mean * 0.2, "max_exec_time": mean * 20, "mean_exec_time": mean,
+            "stddev_exec_time": mean * 0.5, "rows": rows,
+            "shared_blks_hit": hit, "shared_blks_read": read, "shared_blks_dirtied": read // 10,
+            "shared_blks_written": read // 20, "local_blks_hit": 0, "local_blks_read": 0,
+            "local_blks_dirtied": 0, "local_blks_written": 0,
+            "temp_blks_read": 0 if rng.random() < 0.9 else rng.randint(1, 10000),
+            "temp_blks_written": 0 if rng.random() < 0.9 else rng.randint(1, 10000),
+            "blk_read_time": read * 0.01, "blk_write_time": 0.0,
+            "toplevel": True, "plans": 0, "total_plan_time": 0.0, "min_plan_time": 0.0, "max_plan_time": 0.0,
+            "mean_plan_time": 0.0, "stddev_plan_time": 0.0, "wal_records": rows, "wal_fpi": 0, "wal_bytes": rows * 100,
+            "jit_functions": 0, "jit_generation_time": 0.0, "jit_inlining_count": 0, "jit_inlining_time": 0.0,
+            "jit_optimization_count": 0, "jit_optimization_time": 0.0, "jit_emission_count": 0, "jit_emission_time": 0.0,
+        })
+    return records
+
+
+def advance_statements(statements: List[Record], interval_seconds: float = 300.0, seed: int = 0) -> List[Record]:
+    """The same statements one snapshot later: counters grown by a random number of calls."""
+    rng = random.Random(seed)
+    advanced = []
+    for record in statements:
+        record = dict(record)
+        calls = int(rng.expovariate(1.0) * interval_seconds * 0.1)
+        record["calls"] += calls
+        record["total_exec_time"] += calls * record["mean_exec_time"] * rng.uniform(0.8, 1.2)
+        record["rows"] += calls * 5
+        record["shared_blks_hit"] += calls * 10
+        advanced.append(record)
+    return advanced
+
+
+def generate_activity(
+    count: int = 500,
+    statements: Optional[List[Record]] = None,
+    blocked_ratio: float = 0.02,
+    now: Optional[datetime] = None,
+    seed: int = 0
+) -> List[Record]:
+    """pg_stat_activity rows for client backends: mostly idle, some active, waiting or idle in transaction."""
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    statements = statements or generate_statements(200, seed=seed)
+    records = []
+    for i in range(count):
+        pid = 10000 + i
+        state = rng.choices(("idle", "active", "idle in transaction"), weights=(60, 30, 10))[0]
+        wait_event_type, wait_event = None, None
+        if state == "idle" or state == "idle in transaction":
+            wait_event_type, wait_event = "Client", "ClientRead"
+        elif rng.random() < 0.4:
+            wait_event_type, wait_event = rng.choice((("IO", "DataFileRead"), ("LWLock", "BufferMapping"),
+                                                      ("IO", "WALSync"), ("IPC", "BufferIO")))
+        backend_start = now - timedelta(seconds=rng.randint(10, 86400))
+        query_start = now - timedelta(milliseconds=rng.randint(1, 60000))
+        userid = rng.choice(list(ROLE_OIDS))
+        records.append({
+            "datid": DATABASE_OID, "datname": DATABASE_NAME, "pid": pid,
+            "usesysid": userid, "usename": ROLE_OIDS[userid],
+            "application_name": rng.choice(("api", "worker", "psql", "report-runner", "")),
+            "client_addr": f"10.0.{rng.randint(0, 255)}.{rng.randint(1, 254)}", "client_hostname": None,
+            "client_port": rng.randint(30000, 65000), "backend_start": backend_start,
+            "xact_start": query_start if state != "idle" else None, "state": state,
+            "wait_event_type": wait_event_type, "wait_event": wait_event,
+            "query_start": query_start, "state_change": query_start,
+            "backend_xid": rng.randint(1000, 10**9) if state != "idle" and rng.random() < 0.3 else None,
+            "backend_xmin": rng.randint(1000, 10**9) if state != "idle" else None,
+            "query_id": None, "query": rng.choice(statements)["query"].replace("$1", "42"),
+            "backend_type": "client backend", "blocking_pids": None,
+        })
+
+    # A few lock waits on the active sessions, some of them in chains
+    active = [r for r in records if r["state"] == "active"]
+    blocked = rng.sample(active, min(max(len(active) - 1, 0), int(count * blocked_ratio)))
+    for record in blocked:
+        blocker = rng.choice([r for r in active if r is not record])
+        record.update(wait_event_type="Lock", wait_event=rng.choice(("transactionid", "tuple", "relation")),
+                      blocking_pids=[blocker["pid"]])
+    return records
+
+
+def generate_objects(count: int = 5000, seed: int = 0) -> List[Record]:
+    """Object size rows: tables with TOAST and indexes, plus sequences and views, sizes heavy-tailed."""
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        object_type = rng.choices(("table", "index", "sequence", "view", "materialized view"), weights=(40, 50, 5, 4, 1))[0]
+        table_size = 0 if object_type == "view" else int(8192 * rng.paretovariate(0.8))
+        index_size = int(table_size * rng.uniform(0.1, 0.8)) if object_type in ("table", "materialized view") else 0
+        toast = int(table_size * rng.random() * 0.2) if object_type == "table" else 0
+        records.append({
+            "schema_name": rng.choice(SCHEMAS), "object_name": f"{object_type.split()[0][:3]}_{i:05d}",
+            "object_type": object_type, "owner": rng.choice(list(ROLE_OIDS.values())),
+            "total_size_bytes": table_size + index_size + toast, "table_size_bytes": table_size,
+            "index_size_bytes": index_size,
+            "estimated_row_count": table_size // 100 if object_type in ("table", "materialized view") else None,
+        })
+    records.sort(key=lambda r: r["total_size_bytes"], reverse=True)
+    return records
+
+
+def generate_locks(activity: List[Record], relation_oids: List[int], locks_per_session: int = 4, seed: int = 0) -> List[Record]:
+    """pg_locks rows for the non-idle sessions: virtualxid and relation locks, plus the waits of blocked sessions."""
+    rng = random.Random(seed)
+    records = []
+    for session in activity:
+        if session["state"] == "idle":
+            continue
+        pid = session["pid"]
+        vxid = f"{rng.randint(1, 64)}/{rng.randint(1, 10**6)}"
+        base = {"database": None, "relation": None, "page": None, "tuple": None, "virtualxid": None,
+                "transactionid": None, "classid": None, "objid": None, "objsubid": None,
+                "virtualtransaction": vxid, "pid": pid, "fastpath": False, "waitstart": None}
+        records.append({**base, "locktype": "virtualxid", "virtualxid": vxid, "mode": "ExclusiveLock",
+                        "granted": True, "fastpath": True})
+        for _ in range(rng.randint(1, locks_per_session)):
+            records.append({**base, "locktype": "relation", "database": DATABASE_OID,
+                            "relation": rng.choice(relation_oids), "granted": True, "fastpath": rng.random() < 0.8,
+                            "mode": rng.choice(("AccessShareLock", "RowShareLock", "RowExclusiveLock"))})
+        if session.get("blocking_pids"):
+            records.append({**base, "locktype": "transactionid", "transactionid": rng.randint(1000, 10**9),
+                            "mode": "ShareLock", "granted": False,
+                            "waitstart": session["query_start"]})
+    return records
+
+
+def summarize_locks(locks: List[Record]) -> List[Record]:
+    """pg_locks counts per (locktype, mode, granted), as LOCK_SUMMARY_QUERY returns them."""
+    groups: Dict[tuple, Record] = {}
+    for lock in locks:
+        key = (lock["locktype"], lock["mode"], lock["granted"])
+        group = groups.setdefault(key, {"locktype": key[0], "mode": key[1], "granted": key[2], "lock_count": 0, "fastpath_count": 0})
+        group["lock_count"] += 1
+        group["fastpath_count"] += 1 if lock["fastpath"] else 0
+    return list(groups.values())
+
+
+def generate_snapshot(
+    sessions: int = 500,
+    statements: int = 10000,
+    objects: int = 5000,
+    long_query_ratio: float = 0.02,
+    long_query_length: int = 16384,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """One consistent snapshot: the keyword arguments of ingest_snapshot (records and OID names)."""
+    object_records = generate_objects(objects, seed=seed)
+    tables = [f"{r['schema_name']}.{r['object_name']}" for r in object_records if r["object_type"] == "table"] or ["public.t"]
+    statement_records = generate_statements(statements, tables, long_query_ratio, long_query_length, seed=seed)
+    activity_records = generate_activity(sessions, statement_records, seed=seed)
+    relation_oids = [20000 + i for i in range(len(tables))]
+    lock_records = generate_locks(activity_records, relation_oids, seed=seed)
+    return {
+        "activity_records": activity_records,
+        "statements_records": statement_records,
+        "lock_records": lock_records,
+        "lock_summary_records": summarize_locks(lock_records),
+        "object_records": object_records,
+        "names": {
+            "relation": dict(zip(relation_oids, tables)),
+            "role": dict(ROLE_OIDS),
+            "database": {DATABASE_OID: DATABASE_NAME},
+        },
+    }
@@ -0,0 +1,319 @@
+"""
+Fleet-scale collection load simulator.
+
+    python benchmarks/simulate_fleet.py                            # 100, 500 and 1000 targets, 3 cycles each
+    python benchmarks/simulate_fleet.py --targets 2000 --interval 30 --cycles 5
+    python benchmarks/simulate_fleet.py --down-ratio 0.05 --hang-ratio 0.01 --query-error-rate 0.01
+
+Runs the real collection path end to end - init_scheduler (with an in-memory
+job store), trigger_snapshot_runs, one take_snapshot job per target and the
+ingest into the application database - against simulated targets. Each target
+is a fake asyncpg pool (installed in app.services.target_pools, so take_snapshot
+picks it up unchanged) that answers the collector queries with records from
+benchmarks/fixtures.py after a configurable latency. Targets can be made to
+refuse connections (--down-ratio), hang until the acquire timeout
+(--hang-ratio) or fail individual queries with a statement timeout
+(--query-error-rate).
+
+For each fleet size it reports, per collection cycle: jobs submitted and
+finished, snapshots stored within the cycle's window, cycle completion time (trigger to last snapshot),
+snapshot latency percentiles, overruns (snapshots still running when the next
+cycle fires, max_instances skips, missed runs), event-loop lag and the
+monitoring-DB write rate.
+
+Scratch monitored databases (alias sim-fleet-*) are created and deleted again.
+Other monitored databases in the application database are collected as well,
+so run it against a development database with no real targets.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import asyncpg  # noqa: E402
+import numpy as np  # noqa: E402
+from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED, EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED  # noqa: E402
+from apscheduler.jobstores.memory import MemoryJobStore  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+import fixtures  # noqa: E402
+from bench_ingest import cleanup  # noqa: E402
+
+from app import scheduler as app_scheduler  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.security import encrypt  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.services import collection_throttle, snapshot_service, target_pools  # noqa: E402
+from app.services.oid_name_cache import NAME_QUERIES  # noqa: E402
+
+SIM_PASSWORD = "sim"
+
+
+class FakeConnection:
+    """Answers the collector's queries from one target's fixture records."""
+
+    def __init__(self, target: "FakeTarget"):
+        self.target = target
+
+    async def _respond(self, rows: list) -> list:
+        target = self.target
+        latency = target.latency_ms * random.uniform(1 - target.jitter, 1 + target.jitter) + len(rows) * target.row_us / 1000
+        await asyncio.sleep(latency / 1000)
+        if random.random() < target.query_error_rate:
+            raise asyncpg.exceptions.QueryCanceledError("canceling statement due to statement timeout")
+        return rows
+
+    async def fetch(self, query: str, *args) -> list:
+        snapshot = self.target.snapshot
+        if query in NAME_QUERIES.values():
+            kind = next(kind for kind, name_query in NAME_QUERIES.items() if name_query == query)
+            known = snapshot["names"][kind]
+            return await self._respond([{"oid": oid, "name": known[oid]} for oid in args[0] if oid in known])
+        if query == snapshot_service.LOCK_SUMMARY_QUERY:
+            return await self._respond(snapshot["lock_summary_records"])
+        if query in (snapshot_service.LOCKS_FULL_QUERY, snapshot_service.LOCKS_CONTENTION_QUERY):
+            return await self._respond(snapshot["lock_records"])
+        if query == collection_throttle.PRESSURE_QUERY:
+            activity = snapshot["activity_records"]
+            active = sum(1 for r in activity if r["state"] == "active")
+            return await self._respond([{"backends": len(activity), "active": active, "max_connections": max(len(activity) * 2, 100)}])
+        if "FROM pg_stat_activity" in query:
+            return await self._respond(snapshot["activity_records"])
+        if "FROM pg_stat_statements" in query:
+            return await self._respond(snapshot["statements_records"])
+        if "pg_total_relation_size" in query:
+            return await self._respond(snapshot["object_records"])
+        raise asyncpg.exceptions.UndefinedFunctionError(f"Query not simulated: {query.strip()[:80]}")
+
+    async def execute(self, query: str, *args) -> str:
+        await self._respond([])
+        return "SET"
+
+    async def fetchval(self, query: str, *args):
+        rows = await self._respond([1] if "pg_stat_statements" in query else [])
+        return rows[0] if rows else None
+
+
+class FakeTarget:
+    """A simulated monitored database: its behaviour and the records it currently returns."""
+
+    def __init__(self, snapshot: dict, behaviour: str = "healthy", latency_ms: float = 5.0, jitter: float = 0.5,
+                 row_us: float = 2.0, connect_ms: float = 20.0, query_error_rate: float = 0.0):
+        self.snapshot = snapshot
+        self.behaviour = behaviour
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.row_us = row_us
+        self.connect_ms = connect_ms
+        self.query_error_rate = query_error_rate
+
+
+class FakePool:
+    """The parts of asyncpg.Pool take_snapshot and target_pools use."""
+
+    def __init__(self, target: FakeTarget, max_size: int):
+        self.target = target
+        self._max_size = max_size
+        self._slots = asyncio.Semaphore(max_size)
+        self._size = 0
+        self._idle: List[FakeConnection] = []
+
+    async def acquire(self, timeout: Optional[float] = None) -> FakeConnection:
+        if self.target.behaviour == "down":
+            await asyncio.sleep(self.target.connect_ms / 1000)
+            raise ConnectionRefusedError(111, "Connect call failed (simulated)")
+        if self.target.behaviour == "hang":
+            await asyncio.sleep(timeout or 60)
+            raise asyncio.TimeoutError()
+        await asyncio.wait_for(self._slots.acquire(), timeout)
+        if self._idle:
+            return self._idle.pop()
+        await asyncio.sleep(self.target.connect_ms / 1000)
+        self._size += 1
+        return FakeConnection(self.target)
+
+    async def release(self, conn: FakeConnection) -> None:
+        self._idle.append(conn)
+        self._slots.release()
+
+    def get_size(self) -> int:
+        return self._size
+
+    def get_idle_size(self) -> int:
+        return len(self._idle)
+
+    def get_max_size(self) -> int:
+        return self._max_size
+
+    async def close(self) -> None:
+        self._idle.clear()
+        self._size = 0
+
+    def terminate(self) -> None:
+        self._idle.clear()
+        self._size = 0
+
+
+async def watch_event_loop(samples: list, interval: float = 0.05) -> None:
+    """Records (time, lag) for every tick: how late the loop woke up a sleeping task."""
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append((time.time(), time.perf_counter() - started - interval))
+
+
+def create_targets(count: int) -> Dict[int, tuple]:
+    """Inserts scratch monitored databases; returns db_id -> pool parameters (as target_pools keys them)."""
+    encrypted = encrypt(SIM_PASSWORD)
+    with SessionLocal() as db:
+        ids = db.execute(
+            text("INSERT INTO monitored_databases (alias, hostname, port, db_name, username, encrypted_password) "
+                 "SELECT 'sim-fleet-' || i, 'sim-' || i || '.invalid', 5432, 'sim', 'sim', :password "
+                 "FROM generate_series(1, :count) AS i ORDER BY i RETURNING id"),
+            {"count": count, "password": encrypted}
+        ).scalars().all()
+        db.commit()
+    return {db_id: (f"sim-{i}.invalid", 5432, "sim", "sim", SIM_PASSWORD) for i, db_id in enumerate(ids, 1)}
+
+
+def percentile(values: list, q: float) -> float:
+    return float(np.percentile(values, q)) if values else float("nan")
+
+
+async def simulate(count: int, args, variants: List[dict]) -> None:
+    targets = create_targets(count)
+    db_ids = list(targets)
+    rng = random.Random(args.seed)
+    behaviours = {"down": 0, "hang": 0}
+    for i, (db_id, params) in enumerate(targets.items()):
+        roll = rng.random()
+        behaviour = "down" if roll < args.down_ratio else "hang" if roll < args.down_ratio + args.hang_ratio else "healthy"
+        behaviours[behaviour] = behaviours.get(behaviour, 0) + 1
+        target = FakeTarget(variants[i % len(variants)], behaviour, args.latency_ms, args.jitter, args.row_us,
+                            args.connect_ms, args.query_error_rate)
+        # Same key get_pool builds, so take_snapshot finds the fake pool instead of connecting
+        pool_params = params + (settings.COLLECTOR_IDLE_IN_TRANSACTION_TIMEOUT_MS,)
+        target_pools._pools[db_id] = (pool_params, FakePool(target, settings.TARGET_POOL_MAX_SIZE))
+
+    # Job outcomes by scheduled run time, so overlapping cycles can be told apart
+    finished: List[tuple] = []
+    skipped = {"max_instances": 0, "missed": 0}
+
+    def on_job_event(event) -> None:
+        if not event.job_id.startswith("snapshot_db_"):
+            return
+        if event.code in (EVENT_JOB_EXECUTED, EVENT_JOB_ERROR):
+            finished.append((event.scheduled_run_time.timestamp(), time.time()))
+        elif event.code == EVENT_JOB_MAX_INSTANCES:
+            skipped["max_instances"] += 1
+        elif event.code == EVENT_JOB_MISSED:
+            skipped["missed"] += 1
+
+    interval_minutes = settings.SNAPSHOT_INTERVAL_MINUTES
+    settings.SNAPSHOT_INTERVAL_MINUTES = args.interval / 60  # overrun threshold of take_snapshot
+    lag_samples: list = []
+    watcher = asyncio.create_task(watch_event_loop(lag_samples))
+    app_scheduler.init_scheduler(MemoryJobStore())
+    sched = app_scheduler.get_scheduler()
+    sched.remove_job("trigger_all_snapshots_interval")  # cycles are driven below
+    sched.add_listener(on_job_event, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MAX_INSTANCES | EVENT_JOB_MISSED)
+
+    cycle_starts: List[float] = []
+    still_running: List[int] = []
+    skipped_per_cycle: List[dict] = []
+    try:
+        for cycle in range(args.cycles):
+            still_running.append(snapshot_service.snapshots_in_flight())
+            before = dict(skipped)
+            cycle_starts.append(time.time())
+            await app_scheduler.trigger_snapshot_runs()
+            await asyncio.sleep(max(0.0, cycle_starts[-1] + args.interval - time.time()))
+            skipped_per_cycle.append({key: skipped[key] - before[key] for key in skipped})
+            for variant in variants:
+                variant["statements_records"] = fixtures.advance_statements(variant["statements_records"], seed=cycle)
+        # Let the last cycles drain
+        deadline = time.time() + args.interval * args.cycles + 60
+        while snapshot_service.snapshots_in_flight() and time.time() < deadline:
+            await asyncio.sleep(0.1)
+    finally:
+        watcher.cancel()
+        app_scheduler.shutdown_scheduler()
+        settings.SNAPSHOT_INTERVAL_MINUTES = interval_minutes
+        for db_id in db_ids:
+            target_pools._pools.pop(db_id, None)
+
+    with SessionLocal() as db:
+        stored = db.execute(
+            text("SELECT extract(epoch FROM snapshot_time), "
+                 "(SELECT count(*) FROM session_activity a WHERE a.snapshot_id = s.id) "
+                 "+ (SELECT count(*) FROM statement_stats t WHERE t.snapshot_id = s.id) "
+                 "+ (SELECT count(*) FROM locks l WHERE l.snapshot_id = s.id) "
+                 "+ (SELECT count(*) FROM lock_summaries m WHERE m.snapshot_id = s.id) "
+                 "+ (SELECT count(*) FROM db_objects o WHERE o.snapshot_id = s.id) + 1 "
+                 "FROM snapshots s WHERE s.database_id = ANY(:db_ids)"),
+            {"db_ids": db_ids}
+        ).all()
+        cleanup(db, db_ids)
+
+    print(f"\n{count} targets ({behaviours['down']} down, {behaviours['hang']} hanging), "
+          f"interval {args.interval:g} s, pool max {settings.TARGET_POOL_MAX_SIZE}")
+    print(f"  {'cycle':<6}{'jobs':>7}{'stored':>8}{'complete s':>12}{'p50 s':>8}{'p95 s':>8}{'running':>9}"
+          f"{'skipped':>9}{'missed':>8}{'lag p99 ms':>12}{'lag max ms':>12}{'rows/s':>10}")
+    for cycle, start in enumerate(cycle_starts):
+        end = cycle_starts[cycle + 1] if cycle + 1 < len(cycle_starts) else float("inf")
+        durations = [done - start for scheduled, done in finished if start <= scheduled < end]
+        snapshots = [rows for ts, rows in stored if start <= float(ts) < end]
+        complete = max(durations) if durations else float("nan")
+        lags = [lag * 1000 for ts, lag in lag_samples if start <= ts < end]
+        rows_per_second = sum(snapshots) / complete if durations and complete > 0 else 0.0
+        print(f"  {cycle + 1:<6}{len(durations):>7}{len(snapshots):>8}{complete:>12.2f}"
+              f"{percentile(durations, 50):>8.2f}{percentile(durations, 95):>8.2f}{still_running[cycle]:>9}"
+              f"{skipped_per_cycle[cycle]['max_instances']:>9}{skipped_per_cycle[cycle]['missed']:>8}"
+              f"{percentile(lags, 99):>12.1f}{max(lags, default=float('nan')):>12.1f}{rows_per_second:>10,.0f}")
+
+
+async def main(args) -> None:
+    # Injected failures make take_snapshot log an error per target and cycle
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("app").setLevel(args.log_level)
+    logging.getLogger("apscheduler").setLevel(logging.ERROR)
+    variants = [
+        fixtures.generate_snapshot(args.sessions, args.statements, args.objects, seed=seed)
+        for seed in range(args.variants)
+    ]
+    print(f"Per target: {args.sessions} sessions, {args.statements} statements, {args.objects} objects; "
+          f"query latency {args.latency_ms:g} ms +/- {args.jitter:.0%} + {args.row_us:g} us/row, "
+          f"connect {args.connect_ms:g} ms, query error rate {args.query_error_rate:g}")
+    print(f"Started {datetime.now(timezone.utc):%Y-%m-%d %H:%M:%S} UTC")
+    for count in args.targets:
+        await simulate(count, args, variants)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--targets", type=lambda v: [int(n) for n in v.split(",")], default=[100, 500, 1000],
+                        help="Comma-separated fleet sizes to simulate in turn")
+    parser.add_argument("--cycles", type=int, default=3, help="Collection cycles per fleet size")
+    parser.add_argument("--interval", type=float, default=30.0, help="Seconds between cycles")
+    parser.add_argument("--sessions", type=int, default=20, help="pg_stat_activity rows per target")
+    parser.add_argument("--statements", type=int, default=200, help="pg_stat_statements rows per target")
+    parser.add_argument("--objects", type=int, default=100, help="Object size rows per target")
+    parser.add_argument("--variants", type=int, default=8, help="Distinct fixture record sets shared by the targets")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Base latency of each collector query")
+    parser.add_argument("--jitter", type=float, default=0.5, help="Relative latency jitter")
+    parser.add_argument("--row-us", type=float, default=2.0, help="Extra latency per returned row, microseconds")
+    parser.add_argument("--connect-ms", type=float, default=20.0, help="Latency of opening a target connection")
+    parser.add_argument("--down-ratio", type=float, default=0.0, help="Share of targets refusing connections")
+    parser.add_argument("--hang-ratio", type=float, default=0.0, help="Share of targets hanging until the acquire timeout")
+    parser.add_argument("--query-error-rate", type=float, default=0.0, help="Chance of a query failing with a statement timeout")
+    parser.add_argument("--log-level", default="CRITICAL", help="Log level of the app loggers")
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
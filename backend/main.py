@@ -1,14 +1,25 @@
+import time
+_import_started = time.perf_counter()
+
+import asyncio
 import uvicorn
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 import logging
 import sys
 import asyncpg # Added for version logging
 
 from app.core.config import settings # Keep settings import if needed
-from app.scheduler import init_scheduler, shutdown_scheduler
+from app import startup
 from app.api.api import api_router # Import the main API router
+from app.api.endpoints import metrics as metrics_endpoint
+from app.api.middleware import (
+    ProfilingMiddleware, RequestMetricsMiddleware, ServerTimingMiddleware, instrument_engine, instrument_routes
+)
+from app.db.session import engine
+from app.services.target_pools import close_all_pools
 
 # Early logging setup or basic config if needed before full app setup
 logging.basicConfig(level=logging.INFO)
@@ -31,11 +42,15 @@ logger.addHandler(console_handler)
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting up application...")
-    init_scheduler()
+    # Scheduler, pools and caches come up in the background; requests are served meanwhile
+    background_startup = asyncio.create_task(startup.run_background_startup())
     yield
     # Shutdown
     logger.info("Shutting down application...")
-    shutdown_scheduler()
+    background_startup.cancel()
+    await asyncio.gather(background_startup, return_exceptions=True)
+    startup.shutdown()
+    await close_all_pools()
 
 # Create the FastAPI app instance here with the lifespan manager
 app = FastAPI(
@@ -49,6 +64,11 @@ origins = [
     "*", # Allow all origins for development
 ]
 
+# Server-Timing phases (db, serialize, app) per request; on-demand profiles for holders of PROFILING_TOKEN
+instrument_engine(engine)
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(ProfilingMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -57,9 +77,23 @@ app.add_middleware(
     allow_headers=["*"], # Allow all headers
 )
 
+# Compress large list responses (object/session lists with query texts)
+app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
+
+# Per-route request latency for /metrics (outermost, so it includes compression)
+app.add_middleware(RequestMetricsMiddleware)
+
 # Include the main API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+# Prometheus scrape endpoint, at the root as scrapers expect
+app.include_router(metrics_endpoint.router)
+
+# After all routers are included: lets ServerTimingMiddleware separate serialization from the endpoint
+instrument_routes(app)
+
+startup.record_phase("import", time.perf_counter() - _import_started)
+
 
 if __name__ == "__main__":
     logger.info("Starting Uvicorn server...")
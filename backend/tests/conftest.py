@@ -0,0 +1,10 @@
+# backend/tests/conftest.py
+import os
+import sys
+
+# Settings need database credentials to load; the unit tests never connect
+os.environ.setdefault("POSTGRES_USER", "postgres")
+os.environ.setdefault("POSTGRES_PASSWORD", "postgres")
+os.environ.setdefault("POSTGRES_DB", "pgmon")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
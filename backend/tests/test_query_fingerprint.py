@@ -0,0 +1,32 @@
+import pytest
+
+from app.core.query_fingerprint import fingerprint_query, normalize_query
+
+
+@pytest.mark.parametrize(
+    "activity, statement",
+    [
+        ("SELECT * FROM t WHERE id = -1", "SELECT * FROM t WHERE id = $1"),
+        ("SELECT * FROM t WHERE id=-1.5e3", "SELECT * FROM t WHERE id=$1"),
+        ("SELECT f(-1, - 2)", "SELECT f($1, $2)"),
+        ("SELECT * FROM t WHERE a BETWEEN -5 AND -1", "SELECT * FROM t WHERE a BETWEEN $1 AND $2"),
+        ("SELECT -1", "SELECT $1"),
+        ("SELECT * FROM t WHERE x IN (-1, -2, 3)", "SELECT * FROM t WHERE x IN ($1, $2, $3)"),
+    ],
+)
+def test_negative_literal_matches_its_parameter(activity, statement):
+    assert normalize_query(activity) == normalize_query(statement)
+    assert fingerprint_query(activity) == fingerprint_query(statement)
+
+
+@pytest.mark.parametrize(
+    "activity, statement",
+    [
+        ("SELECT a - 1 FROM t", "SELECT a - $1 FROM t"),
+        ("SELECT (a) -1 FROM t", "SELECT (a) - $1 FROM t"),
+        ("SELECT 2 - 1", "SELECT $1 - $2"),
+    ],
+)
+def test_subtraction_keeps_its_operator(activity, statement):
+    assert normalize_query(activity) == normalize_query(statement)
+    assert "-" in normalize_query(activity)
@@ -0,0 +1,47 @@
+# backend/tests/test_statement_regressions.py
+from datetime import datetime, timedelta, timezone
+
+from app.services.statement_regressions import StatementRegressionDetector
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def statement(calls, total_exec_time, toplevel=True, queryid=42):
+    return {"userid": 10, "dbid": 5, "queryid": queryid, "query": "SELECT $1", "toplevel": toplevel,
+            "calls": calls, "total_exec_time": total_exec_time}
+
+
+def feed(detector, snapshots):
+    """Observes one list of records per minute and returns the regressions of each."""
+    return [detector.observe(1, START + timedelta(minutes=i), records) for i, records in enumerate(snapshots)]
+
+
+def test_toplevel_and_nested_entries_are_one_statement():
+    # Toplevel and nested rows grow steadily at 1 ms/call; neither should look like a reset or a spike
+    snapshots = [
+        [statement(100 * k, 100.0 * k, toplevel=True), statement(1000 * k, 1000.0 * k, toplevel=False)]
+        for k in range(1, 12)
+    ]
+    detector = StatementRegressionDetector()
+    flagged = feed(detector, snapshots)
+
+    assert all(not regressions for regressions in flagged)
+    state = detector._targets[1]
+    assert list(state.slots) == [(10, 5, 42)]
+    assert state.last_calls[0] == 1100 * 11
+    assert state.samples[0] == 10 # Every interval folded in: no baseline lost to a fake reset
+    assert abs(state.latency_ewma[0] - 1.0) < 1e-9
+
+
+def test_merged_entry_still_flags_a_real_latency_regression():
+    snapshots = [
+        [statement(100 * k, 100.0 * k, toplevel=True), statement(100 * k, 100.0 * k, toplevel=False)]
+        for k in range(1, 12)
+    ]
+    # Next interval: 200 more calls taking 20 ms each
+    snapshots.append([statement(1200, 1100.0 + 2000.0, toplevel=True), statement(1200, 1100.0 + 2000.0, toplevel=False)])
+    flagged = feed(StatementRegressionDetector(), snapshots)
+
+    kinds = [r["kind"] for r in flagged[-1]]
+    assert "latency_regression" in kinds
+    assert all(r["calls_delta"] == 200 for r in flagged[-1] if r["kind"] == "latency_regression")